@@ -0,0 +1,113 @@
+"""Realistic grammars used by the benchmarks."""
+
+from __future__ import annotations
+
+from functools import reduce
+from typing import Any, Callable
+
+from dine.charclass import WHITESPACE
+from dine.parser import Operator, Parser
+
+
+def _fold(pair: tuple[Any, list[tuple[str, Any]]]) -> Any:
+    first, rest = pair
+    return reduce(lambda acc, op_val: _OPS[op_val[0]](acc, op_val[1]), rest, first)
+
+
+_OPS: dict[str, Callable[[float, float], float]] = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+}
+
+
+# JSON
+_WS = Parser.take_while(WHITESPACE)
+
+
+def _token(parser: Parser) -> Parser:
+    return parser.succeeded_by(_WS)
+
+
+JSON_VALUE: Parser = Parser.forward("json value")
+_COMMA = _token(Parser.char(","))
+_JSON_STRING = _token(Parser.regex(r'"((?:[^"\\]|\\.)*)"', group=1))
+_JSON_NUMBER = _token(
+    Parser.regex(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?").map(float)
+)
+_JSON_ARRAY = (
+    JSON_VALUE.many0_sep_by(_COMMA)
+    .optional()
+    .map(lambda vals: vals[0] if vals else [])
+    .surrounded_by(_token(Parser.char("[")), _token(Parser.char("]")))
+)
+_JSON_MEMBER = _JSON_STRING.succeeded_by(_token(Parser.char(":"))).and_then(JSON_VALUE)
+_JSON_OBJECT = (
+    _JSON_MEMBER.many0_sep_by(_COMMA)
+    .optional()
+    .map(lambda members: dict(members[0]) if members else {})
+    .surrounded_by(_token(Parser.char("{")), _token(Parser.char("}")))
+)
+JSON_VALUE.define(
+    Parser.choice(
+        [
+            _JSON_OBJECT,
+            _JSON_ARRAY,
+            _JSON_STRING,
+            _JSON_NUMBER,
+            _token(Parser.string("true")).map(lambda _: True),
+            _token(Parser.string("false")).map(lambda _: False),
+            _token(Parser.string("null")).map(lambda _: None),
+        ]
+    )
+)
+JSON_DOCUMENT = JSON_VALUE.preceded_by(_WS)
+
+
+# CSV
+_CSV_FIELD = Parser.regex(r'"((?:[^"]|"")*)"', group=1).map(
+    lambda field: field.replace('""', '"')
+) | Parser.regex(r"[^,\n]*")
+_CSV_ROW = _CSV_FIELD.many1_sep_by(Parser.char(","))
+CSV_FILE = _CSV_ROW.many1_sep_by(Parser.char("\n")).set_label("csv")
+
+
+# Arithmetic expressions
+ARITH_EXPR: Parser = Parser.forward("expression")
+_NUMBER = _token(Parser.regex(r"\d+(?:\.\d+)?").map(float))
+_FACTOR = _NUMBER | ARITH_EXPR.surrounded_by(
+    _token(Parser.char("(")), _token(Parser.char(")"))
+)
+_MUL_OPS = _token(Parser.char_class("*/")).and_then(_FACTOR).many0()
+_TERM = _FACTOR.and_then(_MUL_OPS).map(_fold)
+_ADD_OPS = _token(Parser.char_class("+-")).and_then(_TERM).many0()
+ARITH_EXPR.define(_TERM.and_then(_ADD_OPS).map(_fold))
+
+
+# Arithmetic expressions, parsed by precedence climbing
+PRATT_EXPR: Parser = Parser.forward("expression")
+PRATT_EXPR.define(
+    Parser.expression(
+        _NUMBER
+        | PRATT_EXPR.surrounded_by(_token(Parser.char("(")), _token(Parser.char(")"))),
+        [
+            Operator(_token(Parser.char(op)), 1 if op in "+-" else 2, fn)
+            for op, fn in _OPS.items()
+        ],
+    )
+)
+
+
+# S := 'a' S 'b' (see tests/parse/principled/test_type2_grammar.py)
+TYPE2 = (
+    Parser.char("a")
+    .many1()
+    .map("".join)
+    .bind(
+        lambda a_seq: Parser.char("b")
+        .times(len(a_seq))
+        .map("".join)
+        .map(lambda b_seq: a_seq + b_seq)
+    )
+)
@@ -0,0 +1,127 @@
+"""Synthetic inputs of a given size for the benchmarks."""
+
+from __future__ import annotations
+
+import json
+import random
+from typing import Callable
+
+SEED = 4403
+
+
+def _repeat(unit: str, size: int) -> str:
+    return unit * max(1, size // len(unit))
+
+
+def _join_until(make: Callable[[random.Random], str], sep: str, size: int) -> str:
+    rng = random.Random(SEED)
+    parts = []
+    total = 0
+    while total < size:
+        part = make(rng)
+        parts.append(part)
+        total += len(part) + len(sep)
+    return sep.join(parts)
+
+
+def letters(size: int) -> str:
+    return _repeat("a", size)
+
+
+def words(size: int) -> str:
+    return _repeat("hello", size)
+
+
+def digits(size: int) -> str:
+    return _repeat("1234567890", size)
+
+
+def digit_list(size: int) -> str:
+    return _join_until(lambda rng: str(rng.randrange(10)), ",", size)
+
+
+def abc(size: int) -> str:
+    return _repeat("abc", size)
+
+
+KEYWORDS = [
+    "and",
+    "as",
+    "assert",
+    "break",
+    "class",
+    "continue",
+    "def",
+    "del",
+    "elif",
+    "else",
+    "except",
+    "finally",
+    "for",
+    "from",
+    "global",
+    "if",
+    "import",
+    "in",
+    "is",
+    "lambda",
+    "nonlocal",
+    "not",
+    "or",
+    "pass",
+    "raise",
+    "return",
+    "try",
+    "while",
+    "with",
+    "yield",
+]
+
+
+def keywords(size: int) -> str:
+    return _join_until(lambda rng: rng.choice(KEYWORDS), "", size)
+
+
+def _json_item(rng: random.Random) -> str:
+    return json.dumps(
+        {
+            "id": rng.randrange(1_000_000),
+            "name": "".join(rng.choice("abcdefgh") for _ in range(8)),
+            "score": round(rng.random() * 100, 3),
+            "tags": [rng.choice(["x", "y", "z"]) for _ in range(rng.randrange(4))],
+            "active": rng.random() < 0.5,
+            "parent": None,
+        }
+    )
+
+
+def json_document(size: int) -> str:
+    return "[" + _join_until(_json_item, ",\n", size) + "]"
+
+
+def _csv_row(rng: random.Random) -> str:
+    return ",".join(
+        [
+            str(rng.randrange(1_000_000)),
+            "".join(rng.choice("abcdefgh") for _ in range(8)),
+            '"quoted, ""field"""',
+            f"{rng.random():.6f}",
+        ]
+    )
+
+
+def csv_file(size: int) -> str:
+    return _join_until(_csv_row, "\n", size)
+
+
+def _arith_term(rng: random.Random) -> str:
+    return f"({rng.randrange(1, 100)} * {rng.randrange(1, 100)} - {rng.randrange(100)})"
+
+
+def arithmetic(size: int) -> str:
+    return _join_until(_arith_term, " + ", size)
+
+
+def type2(size: int) -> str:
+    half = max(1, size // 2)
+    return "a" * half + "b" * half
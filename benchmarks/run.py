@@ -0,0 +1,160 @@
+"""
+Benchmarks for dine combinators and grammars.
+
+Run from the root of the repository, e.g.::
+
+    $ poetry run python -m benchmarks.run --sizes 1KB 1MB --output results.json
+
+Each benchmark parses a synthetic input of every requested size and records the
+best wall-clock time over a number of repeats. Results are written as JSON so
+that runs can be compared to track regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+
+from dine.codegen import compile_parser
+from dine.parser import Parser
+from dine.result import ParseSuccess
+
+from . import grammars, inputs
+
+
+class Case(NamedTuple):
+    """A benchmark: a parser and a generator of inputs of a given size."""
+
+    parser: Callable[[int], Parser]
+    make_input: Callable[[int], str]
+
+
+CASES: dict[str, Case] = {
+    "satisfy": Case(
+        lambda _: Parser.satisfy(str.isalpha).many0(),
+        inputs.letters,
+    ),
+    "char": Case(lambda _: Parser.char("a").many0(), inputs.letters),
+    "string": Case(lambda _: Parser.string("hello").many0(), inputs.words),
+    "regex": Case(lambda _: Parser.regex(r"[a-z]+"), inputs.letters),
+    "take_while": Case(lambda _: Parser.take_while("a"), inputs.letters),
+    "many0": Case(lambda _: Parser.digit().many0(), inputs.digits),
+    "many1": Case(lambda _: Parser.digit().many1(), inputs.digits),
+    "many1_sep_by": Case(
+        lambda _: Parser.digit().many1_sep_by(Parser.char(",")),
+        inputs.digit_list,
+    ),
+    "times": Case(lambda n: Parser.char("a").times(n), inputs.letters),
+    "choice": Case(
+        # Longest keywords first, so that e.g. "assert" is not parsed as "as".
+        lambda _: Parser.choice(
+            map(Parser.string, sorted(inputs.KEYWORDS, key=len, reverse=True))
+        ).many0(),
+        inputs.keywords,
+    ),
+    "sequence": Case(
+        lambda _: Parser.sequence(map(Parser.char, "abc")).many0(),
+        inputs.abc,
+    ),
+    "json": Case(lambda _: grammars.JSON_DOCUMENT, inputs.json_document),
+    "csv": Case(lambda _: grammars.CSV_FILE, inputs.csv_file),
+    "arithmetic": Case(lambda _: grammars.ARITH_EXPR, inputs.arithmetic),
+    "expression": Case(lambda _: grammars.PRATT_EXPR, inputs.arithmetic),
+    "type2": Case(lambda _: grammars.TYPE2, inputs.type2),
+}
+
+UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+def parse_size(size: str) -> int:
+    """Parse a size such as ``1KB`` or ``100MB`` into a number of bytes."""
+    m = re.fullmatch(r"(\d+)\s*([KMG]?B)", size.strip().upper())
+    if m is None:
+        raise argparse.ArgumentTypeError(f"invalid size {size!r}")
+    return int(m.group(1)) * UNITS[m.group(2)]
+
+
+def run_case(
+    name: str, case: Case, size: int, repeat: int, compiled: bool = False
+) -> dict:
+    """Run a benchmark and return its result record."""
+    text = case.make_input(size)
+    parser = case.parser(len(text))
+    if compiled:
+        parser = compile_parser(parser)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parser(text)
+        timings.append(time.perf_counter() - start)
+        if not isinstance(result, ParseSuccess) or result.rs != "":
+            raise RuntimeError(f"benchmark {name!r} did not parse its whole input")
+    best = min(timings)
+    return {
+        "name": name,
+        "size": size,
+        "chars": len(text),
+        "repeat": repeat,
+        "compiled": compiled,
+        "best_s": best,
+        "mean_s": sum(timings) / len(timings),
+        "chars_per_s": len(text) / best if best > 0 else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the benchmark runner."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=parse_size,
+        default=[parse_size("1KB"), parse_size("1MB")],
+        help="input sizes, e.g. 1KB 1MB 100MB (default: 1KB 1MB)",
+    )
+    arg_parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=sorted(CASES),
+        help="benchmarks to run (default: all)",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument(
+        "--compiled",
+        action="store_true",
+        help="run the parsers compiled by dine.codegen",
+    )
+    arg_parser.add_argument(
+        "--output", default="benchmark-results.json", help="JSON file to write"
+    )
+    args = arg_parser.parse_args(argv)
+
+    records = []
+    for name in args.only or CASES:
+        for size in args.sizes:
+            record = run_case(name, CASES[name], size, args.repeat, args.compiled)
+            records.append(record)
+            print(
+                f"{name:>14} {size:>11}B {record['best_s']:10.4f}s "
+                f"{record['chars_per_s'] or 0:14,.0f} chars/s"
+            )
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": records,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
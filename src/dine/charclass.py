@@ -0,0 +1,170 @@
+"""Character classes."""
+
+from __future__ import annotations
+
+import re
+import string
+from typing import Any, Iterable
+
+
+class CharClass:
+    """
+    Set of characters, possibly negated.
+
+    Membership is tested against a frozenset. The class also compiles to a regular
+    expression so that a whole span of members can be scanned in a single call.
+
+    A class also applies to bytes: the byte of value `n` is a member if the
+    character `chr(n)` is, i.e. bytes are read as latin-1 characters.
+    """
+
+    def __init__(self, chars: Iterable[str] = (), *, negated: bool = False) -> None:
+        self.chars: frozenset[str] = frozenset(chars)
+        self.negated: bool = negated
+        # Characters and byte values of the class, for lookups in both str and bytes.
+        self.members: frozenset[str | int] = self.chars | {
+            ord(c) for c in self.chars if ord(c) < 256
+        }
+        self._span: re.Pattern[str] | None = None
+        self._span_bytes: re.Pattern[bytes] | None = None
+
+    @staticmethod
+    def of(chars: Iterable[str]) -> CharClass:
+        """
+        Class of the given characters
+
+        Parameters
+        ----------
+        chars : Iterable[str]
+            the characters
+
+        Returns
+        -------
+        CharClass
+        """
+        return CharClass(chars)
+
+    @staticmethod
+    def range(first: str, last: str) -> CharClass:
+        """
+        Class of the characters between two characters (inclusive)
+
+        Parameters
+        ----------
+        first : str
+            the first character of the range
+        last : str
+            the last character of the range
+
+        Returns
+        -------
+        CharClass
+        """
+        return CharClass(map(chr, range(ord(first), ord(last) + 1)))
+
+    def __contains__(self, c: object) -> bool:
+        return (c in self.members) is not self.negated
+
+    def __or__(self, other: CharClass) -> CharClass:
+        match (self.negated, other.negated):
+            case (False, False):
+                return CharClass(self.chars | other.chars)
+            case (True, True):
+                return CharClass(self.chars & other.chars, negated=True)
+            case (True, False):
+                return CharClass(self.chars - other.chars, negated=True)
+            case _:
+                return CharClass(other.chars - self.chars, negated=True)
+
+    def __invert__(self) -> CharClass:
+        return CharClass(self.chars, negated=not self.negated)
+
+    def __eq__(self, other: object) -> bool:
+        match other:
+            case CharClass():
+                return self.chars == other.chars and self.negated == other.negated
+            case _:
+                return False
+
+    def __hash__(self) -> int:
+        return hash((self.chars, self.negated))
+
+    def __repr__(self):
+        chars = "".join(sorted(self.chars))
+        return f"CharClass({chars!r}, negated={self.negated})"
+
+    def pattern(self) -> str:
+        """
+        Regular expression matching one character of the class
+
+        Returns
+        -------
+        str
+        """
+        return _pattern(sorted(map(ord, self.chars)), self.negated)
+
+    def pattern_bytes(self) -> bytes:
+        """
+        Regular expression matching one byte of the class
+
+        Returns
+        -------
+        bytes
+        """
+        codes = sorted(code for code in map(ord, self.chars) if code < 256)
+        return _pattern(codes, self.negated).encode("latin-1")
+
+    def span(self, buf: Any, begin: int = 0) -> int:
+        """
+        End of the run of class members starting at an offset
+
+        Parameters
+        ----------
+        buf : Any
+            the buffer to scan, a string or a bytes-like object
+        begin : int
+            the offset to start scanning from
+
+        Returns
+        -------
+        int
+            the offset of the first character after `begin` that is not a member
+            of the class, or the length of the buffer
+        """
+        m: re.Match | None
+        if isinstance(buf, str):
+            if self._span is None:
+                self._span = re.compile(f"{self.pattern()}*")
+            m = self._span.match(buf, begin)
+        else:
+            if self._span_bytes is None:
+                self._span_bytes = re.compile(self.pattern_bytes() + b"*")
+            m = self._span_bytes.match(buf, begin)
+        return m.end() if m is not None else begin
+
+
+def _pattern(codes: list[int], negated: bool) -> str:
+    """Regular expression character set of sorted character codes."""
+    if not codes:
+        return r"[\s\S]" if negated else "(?!)"
+    ranges = []
+    first = last = codes[0]
+    for code in codes[1:]:
+        if code != last + 1:
+            ranges.append((first, last))
+            first = code
+        last = code
+    ranges.append((first, last))
+    items = "".join(
+        re.escape(chr(a)) if a == b else f"{re.escape(chr(a))}-{re.escape(chr(b))}"
+        for a, b in ranges
+    )
+    return f"[^{items}]" if negated else f"[{items}]"
+
+
+DIGITS = CharClass.of(string.digits)
+DIGITS_NONZERO = CharClass.range("1", "9")
+ASCII_LOWERCASE = CharClass.of(string.ascii_lowercase)
+ASCII_UPPERCASE = CharClass.of(string.ascii_uppercase)
+ASCII_LETTERS = ASCII_LOWERCASE | ASCII_UPPERCASE
+WHITESPACE = CharClass.of(string.whitespace)
@@ -0,0 +1,659 @@
+"""
+Compilation of parsers to specialized Python code.
+
+A parser is a graph of closures calling each other through `Parser._parse`, which
+costs a few Python calls per character. `compile_parser` walks that graph (using
+the recipes parsers are made with, see `Parser.__reduce__`) and generates a
+Python module where the combinators are inlined into loops and index arithmetic
+on the buffer of the stream.
+
+The generated code has fast paths only: whenever a primitive parser fails, or
+needs more input than is buffered, the original parser is run instead, so the
+results are the same as the ones of the original parser.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import inspect
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, TypeVar
+
+from dine.charclass import (
+    ASCII_LETTERS,
+    ASCII_LOWERCASE,
+    ASCII_UPPERCASE,
+    DIGITS,
+    DIGITS_NONZERO,
+    CharClass,
+)
+from dine.parser import REGEX_LOOKAHEAD, Parser, RawResult, _union_first
+from dine.stream import Stream
+
+A = TypeVar("A")
+
+# Character classes of the primitive parsers made of one.
+_CHAR_CLASSES: dict[str, CharClass] = {
+    "digit": DIGITS,
+    "digit_nonzero": DIGITS_NONZERO,
+    "ascii_lowercase": ASCII_LOWERCASE,
+    "ascii_uppercase": ASCII_UPPERCASE,
+    "ascii": ASCII_LETTERS,
+}
+
+# Primitive parsers, which are always inlined.
+_LEAVES = {
+    "char_class",
+    "char",
+    *_CHAR_CLASSES,
+    "satisfy",
+    "string",
+    "take_while",
+    "regex",
+    "just",
+}
+
+# Indentation depth past which parsers are generated as separate functions, to
+# stay within the nesting limits of Python.
+MAX_INLINE_DEPTH = 16
+
+
+def compile_parser(
+    parser: Parser[A], *, cache_dir: str | os.PathLike | None = None
+) -> Parser[A]:
+    """
+    Compile a parser to specialized Python code
+
+    The compiled parser returns the same results as the original one. The
+    parsers the compiler does not know (e.g. made with ``bind`` or from a
+    function) are called as they are from the generated code.
+
+    On a memoized stream (e.g. under ``packrat`` or in an incremental parse),
+    the original parser is run instead, so that its sub-parsers are memoized.
+    The same goes for the parsers being profiled or traced.
+
+    Parameters
+    ----------
+    parser : Parser[A]
+        the parser to compile
+    cache_dir : str | os.PathLike | None
+        directory where the generated module is written. Python caches the
+        bytecode of the module there, so a grammar compiled again, e.g. at the
+        next startup, is loaded without compiling the module again.
+
+    Returns
+    -------
+    Parser[A]
+    """
+    source, constants = generate(parser)
+    if cache_dir is None:
+        namespace = dict(constants)
+        # The source is generated from the parser alone, never from the input.
+        # pylint: disable-next=exec-used
+        exec(compile(source, "<dine compiled parser>", "exec"), namespace)
+        parse = namespace["parse"]
+    else:
+        parse = _load(source, constants, Path(cache_dir))
+    interpreted = parser._run  # pylint: disable=protected-access
+
+    def run(s: Stream, pos: int) -> RawResult:
+        if not s.plain:
+            return interpreted(s, pos)
+        return parse(s, pos)
+
+    # pylint: disable=protected-access
+    compiled = Parser._from_run(run, label=parser._label, first=parser._first)
+    compiled._recipe = (compile_parser, (parser,), {})
+    return compiled
+
+
+def generate(parser: Parser) -> tuple[str, dict[str, Any]]:
+    """
+    Generate the Python module of a compiled parser
+
+    Parameters
+    ----------
+    parser : Parser
+        the parser to compile
+
+    Returns
+    -------
+    tuple[str, dict[str, Any]]
+        the source of the module, and the constants (functions, character
+        classes, ...) to define in the module before running it. The module
+        defines a ``parse(s, pos)`` function following the internal protocol
+        of the parsers.
+    """
+    return _Generator(parser).module()
+
+
+def _load(source: str, constants: dict[str, Any], cache_dir: Path) -> Any:
+    """Load a generated module from the cache, writing it first if needed."""
+    digest = hashlib.sha256(source.encode()).hexdigest()[:24]
+    path = cache_dir / f"dine_{digest}.py"
+    if not path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(source, encoding="utf-8")
+        os.replace(tmp, path)
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    module.__dict__.update(constants)
+    spec.loader.exec_module(module)
+    return module.parse
+
+
+class _Node:
+    """A parser of the graph, with the arguments of its recipe."""
+
+    def __init__(self, parser: Parser) -> None:
+        self.parser = parser
+        recipe = parser._recipe  # pylint: disable=protected-access
+        self.kind: str | None = None
+        self.args: dict[str, Any] = {}
+        if recipe is not None and recipe[0] is not Parser:
+            factory, args, kwargs = recipe
+            bound = inspect.signature(factory).bind(*args, **kwargs)
+            bound.apply_defaults()
+            self.kind = factory.__name__
+            self.args = bound.arguments
+        if self.kind == "forward":
+            self.args["target"] = parser._target  # pylint: disable=protected-access
+
+    def children(self) -> list[Parser]:
+        """The parsers this parser is made of."""
+        children = []
+        for arg in self.args.values():
+            match arg:
+                case Parser():
+                    children.append(arg)
+                case list() | tuple():
+                    children.extend(a for a in arg if isinstance(a, Parser))
+        return children
+
+
+class _Generator:
+    """Generator of the module of a compiled parser."""
+
+    def __init__(self, root: Parser) -> None:
+        self.root = root
+        self.nodes: dict[Parser, _Node] = {}
+        self.refs: Counter[Parser] = Counter()
+        # Names and values of the constants of the module, by the ids of the values.
+        self.constants: dict[int, tuple[str, Any]] = {}
+        self.functions: dict[Parser, str] = {}
+        # Parsers whose functions are named but not generated yet.
+        self.pending: list[Parser] = []
+        self.counter = 0
+        self._walk(root)
+
+    def _walk(self, root: Parser) -> None:
+        stack = [root]
+        while stack:
+            parser = stack.pop()
+            self.refs[parser] += 1
+            if parser in self.nodes:
+                continue
+            node = self.nodes[parser] = _Node(parser)
+            if node.kind in _KINDS:
+                stack.extend(node.children())
+
+    def module(self) -> tuple[str, dict[str, Any]]:
+        """The source of the module and its constants."""
+        root = self.function(self.root)
+        lines = [
+            "# Generated by dine.codegen, do not edit.",
+            "",
+        ]
+        # The functions are generated one after another rather than recursively,
+        # since deeply nested grammars would exceed the recursion limit.
+        while self.pending:
+            lines.extend(self.define(self.pending.pop()))
+            lines.append("")
+        lines.append(f"parse = {root}")
+        return "\n".join(lines) + "\n", dict(self.constants.values())
+
+    def constant(self, value: Any) -> str:
+        """Name of a constant of the module."""
+        entry = self.constants.get(id(value))
+        if entry is None:
+            entry = self.constants[id(value)] = (f"K{len(self.constants)}", value)
+        return entry[0]
+
+    def fresh(self) -> int:
+        """Number making the names of new variables unique."""
+        self.counter += 1
+        return self.counter
+
+    def function(self, parser: Parser) -> str:
+        """Name of the function of a parser, to be generated if needed."""
+        name = self.functions.get(parser)
+        if name is None:
+            name = self.functions[parser] = f"parse_{len(self.functions)}"
+            self.pending.append(parser)
+        return name
+
+    def define(self, parser: Parser) -> list[str]:
+        """Generate the function of a parser."""
+        name = self.functions[parser]
+        body = _Code([f"def {name}(s, pos):", "    buf = s.buf"], 1)
+        ok, val, end = self.inline(parser, "pos", body)
+        body.emit(f"return ({ok}, {val}, {end})")
+        return body.lines
+
+    def block(self, parser: Parser, pos: str, out: _Code) -> tuple[str, str, str]:
+        """
+        Generate the code running a parser
+
+        The code parses from the offset in the variable `pos`, and is appended to
+        `out`. The names of the variables holding the `(ok, value, offset)` result
+        are returned. The code keeps the variable `buf` equal to `s.buf`.
+        """
+        kind = self.nodes[parser].kind
+        if kind in _KINDS and kind not in _LEAVES and kind != "forward":
+            if out.depth > MAX_INLINE_DEPTH or self.refs[parser] > 1:
+                return self.call(self.function(parser), pos, out)
+        return self.inline(parser, pos, out)
+
+    def inline(self, parser: Parser, pos: str, out: _Code) -> tuple[str, str, str]:
+        """Generate the code running a parser, inlining it."""
+        node = self.nodes[parser]
+        if node.kind is None or node.kind not in _KINDS:
+            # pylint: disable-next=protected-access
+            return self.call(self.constant(parser._parse), pos, out)
+        return _KINDS[node.kind](self, node, pos, out)
+
+    def call(self, function: str, pos: str, out: _Code) -> tuple[str, str, str]:
+        """Generate the code calling the function of a parser."""
+        n = self.fresh()
+        ok, val, end = f"ok{n}", f"v{n}", f"e{n}"
+        out.emit(f"{ok}, {val}, {end} = {function}(s, {pos})", "buf = s.buf")
+        return ok, val, end
+
+    def leaf(
+        self, node: _Node, fast_path: tuple[str, str, str], pos: str, out: _Code
+    ) -> tuple[str, str, str]:
+        """
+        Generate the code of a primitive parser, from the condition under which it
+        succeeds without help and its value and end offset in that case.
+        """
+        fast, val, end = fast_path
+        n = self.fresh()
+        ok, v, e = f"ok{n}", f"v{n}", f"e{n}"
+        run = self.constant(node.parser._run)  # pylint: disable=protected-access
+        out.emit(
+            f"if {fast}:",
+            f"    {ok}, {v}, {e} = True, {val}, {end}",
+            "else:",
+            f"    {ok}, {v}, {e} = {run}(s, {pos})",
+            "    buf = s.buf",
+        )
+        return ok, v, e
+
+
+class _Code:
+    """Lines of generated code, written at an indentation depth."""
+
+    def __init__(self, lines: list[str], depth: int) -> None:
+        self.lines = lines
+        self.depth = depth
+
+    def emit(self, *lines: str) -> None:
+        """Append lines at the indentation depth."""
+        indent = "    " * self.depth
+        self.lines.extend(indent + line for line in lines)
+
+    def nested(self, levels: int) -> _Code:
+        """The same lines, written more indented."""
+        return _Code(self.lines, self.depth + levels)
+
+
+def _char_class(gen: _Generator, node: _Node, pos: str, out: _Code):
+    match node.kind:
+        case "char_class":
+            chars = node.args["chars"]
+            chars = CharClass.of(chars) if isinstance(chars, str) else chars
+        case "char":
+            chars = CharClass.of(node.args["char"])
+        case str(kind):
+            chars = _CHAR_CLASSES[kind]
+    members = gen.constant(chars.members)
+    op = "not in" if chars.negated else "in"
+    fast = f"{pos} < len(buf) and (c := buf[{pos}]) {op} {members}"
+    return gen.leaf(node, (fast, "c", f"{pos} + 1"), pos, out)
+
+
+def _satisfy(gen: _Generator, node: _Node, pos: str, out: _Code):
+    predicate = gen.constant(node.args["predicate"])
+    fast = f"{pos} < len(buf) and {predicate}(c := buf[{pos}])"
+    return gen.leaf(node, (fast, "c", f"{pos} + 1"), pos, out)
+
+
+def _string(gen: _Generator, node: _Node, pos: str, out: _Code):
+    literal = node.args["literal"]
+    name = gen.constant(literal)
+    end = f"{pos} + {len(literal)}"
+    if isinstance(literal, str):
+        fast = f"buf.startswith({name}, {pos})"
+    else:
+        fast = f"buf[{pos} : {end}] == {name}"
+    return gen.leaf(node, (fast, name, end), pos, out)
+
+
+def _take_while(gen: _Generator, node: _Node, pos: str, out: _Code):
+    chars = node.args["chars"]
+    chars = CharClass.of(chars) if isinstance(chars, str) else chars
+    span = gen.constant(chars.span)
+    min_count = node.args["min_count"]
+    n = gen.fresh()
+    out.emit(f"t{n} = {span}(buf, {pos})")
+    fast = f"t{n} < len(buf) and t{n} - {pos} >= {min_count}"
+    return gen.leaf(node, (fast, f"buf[{pos} : t{n}]", f"t{n}"), pos, out)
+
+
+def _regex(gen: _Generator, node: _Node, pos: str, out: _Code):
+    # The parser of `node` compiled the pattern with the flags already.
+    pattern = node.args["pattern"]
+    compiled = gen.constant(re.compile(pattern, node.args["flags"]))
+    group = node.args["group"]
+    n = gen.fresh()
+    fetch = gen.constant(Stream.fetch)
+    # Plain streams hold all of their data, so a match is final. Streams reading
+    # their input incrementally need the lookahead of the original parser, which
+    # also reads more data to retry failures.
+    fast = (
+        f"(type(s).fetch is {fetch} or len(buf) >= {pos} + {REGEX_LOOKAHEAD})"
+        f" and (m{n} := {compiled}.match(buf, {pos})) is not None"
+        f" and m{n}.end() < len(buf)"
+    )
+    if isinstance(group, tuple):
+        # A tuple display, so that a single group still gives a tuple.
+        val = "(" + "".join(f"m{n}.group({gen.constant(g)}), " for g in group) + ")"
+    else:
+        val = f"m{n}.group({gen.constant(group)})"
+    return gen.leaf(node, (fast, val, f"m{n}.end()"), pos, out)
+
+
+def _just(gen: _Generator, node: _Node, pos: str, _out: _Code):
+    return ("True", gen.constant(node.args["a"]), pos)
+
+
+def _sequence(
+    gen: _Generator,
+    parsers: list[Parser],
+    value: str,
+    pos: str,
+    out: _Code,
+) -> tuple[str, str, str]:
+    """
+    Generate the code of parsers run one after another, failing with the first
+    failure. The value is a format string of the values of the parsers.
+    """
+    n = gen.fresh()
+    ok, v, e = f"ok{n}", f"v{n}", f"e{n}"
+    out.emit("while True:")
+    vals = []
+    for parser in parsers:
+        child_ok, child_val, pos = gen.block(parser, pos, out.nested(1))
+        out.nested(1).emit(
+            f"if not {child_ok}:",
+            f"    {ok}, {v}, {e} = {child_ok}, {child_val}, {pos}",
+            "    break",
+        )
+        vals.append(child_val)
+    out.nested(1).emit(f"{ok}, {v}, {e} = True, {value.format(*vals)}, {pos}", "break")
+    return ok, v, e
+
+
+def _and_then(gen: _Generator, node: _Node, pos: str, out: _Code):
+    parsers = [node.args["self"], node.args["other"]]
+    return _sequence(gen, parsers, "({}, {})", pos, out)
+
+
+def _preceded_by(gen: _Generator, node: _Node, pos: str, out: _Code):
+    parsers = [node.args["other"], node.args["self"]]
+    return _sequence(gen, parsers, "{1}", pos, out)
+
+
+def _succeeded_by(gen: _Generator, node: _Node, pos: str, out: _Code):
+    parsers = [node.args["self"], node.args["other"]]
+    return _sequence(gen, parsers, "{0}", pos, out)
+
+
+def _surrounded_by(gen: _Generator, node: _Node, pos: str, out: _Code):
+    args = node.args
+    parsers = [args["lparser"], args["self"], args["rparser"]]
+    return _sequence(gen, parsers, "{1}", pos, out)
+
+
+def _sequence_of(gen: _Generator, node: _Node, pos: str, out: _Code):
+    parsers = node.args["parsers"]
+    value = "[" + ", ".join(f"{{{i}}}" for i in range(len(parsers))) + "]"
+    return _sequence(gen, parsers, value, pos, out)
+
+
+def _alternatives(
+    gen: _Generator, parsers: list[Parser], pos: str, out: _Code
+) -> tuple[str, str, str]:
+    """
+    Generate the code of the first successful parser, or of the last failure.
+    A committed failure ends the alternatives.
+    """
+    n = gen.fresh()
+    ok, v, e = f"ok{n}", f"v{n}", f"e{n}"
+    out.emit("while True:")
+    for parser in parsers:
+        child = gen.block(parser, pos, out.nested(1))
+        out.nested(1).emit(f"{ok}, {v}, {e} = {', '.join(child)}")
+        if parser is not parsers[-1]:
+            out.nested(1).emit(f"if {ok} is not False:", "    break")
+    out.nested(1).emit("break")
+    return ok, v, e
+
+
+def _or_else(gen: _Generator, node: _Node, pos: str, out: _Code):
+    parsers = [node.args["self"], node.args["other"]]
+    return _alternatives(gen, parsers, pos, out)
+
+
+def _choice(gen: _Generator, node: _Node, pos: str, out: _Code):
+    parsers = node.args["parsers"]
+    if _union_first(parsers) is None:
+        return _alternatives(gen, parsers, pos, out)
+    # Group the characters by the alternatives that can start with them, in order.
+    groups: dict[tuple[int, ...], set] = {}
+    table: dict[Any, list[int]] = {}
+    for i, parser in enumerate(parsers):
+        for c in parser._first or ():  # pylint: disable=protected-access
+            table.setdefault(c, []).append(i)
+    for c, alternatives in table.items():
+        groups.setdefault(tuple(alternatives), set()).add(c)
+    n = gen.fresh()
+    ok, v, e = f"ok{n}", f"v{n}", f"e{n}"
+    out.emit(f"if {pos} < len(buf):", f"    c{n} = buf[{pos}]")
+    keyword = "if"
+    for indices, chars in groups.items():
+        out.nested(1).emit(f"{keyword} c{n} in {gen.constant(frozenset(chars))}:")
+        child = _alternatives(gen, [parsers[i] for i in indices], pos, out.nested(2))
+        out.nested(2).emit(f"{ok}, {v}, {e} = {', '.join(child)}")
+        keyword = "elif"
+    run = gen.constant(node.parser._run)  # pylint: disable=protected-access
+    if groups:
+        out.nested(1).emit("else:", f"    {ok}, {v}, {e} = {run}(s, {pos})")
+    else:
+        out.nested(1).emit(f"{ok}, {v}, {e} = {run}(s, {pos})")
+    out.emit("else:", f"    {ok}, {v}, {e} = {run}(s, {pos})", "    buf = s.buf")
+    return ok, v, e
+
+
+def _forward(gen: _Generator, node: _Node, pos: str, out: _Code):
+    # The definition is generated as a function, which recursive parsers call.
+    target = node.args["target"]
+    if target is None:
+        # pylint: disable-next=protected-access
+        return gen.call(gen.constant(node.parser._parse), pos, out)
+    return gen.call(gen.function(target), pos, out)
+
+
+def _apply(
+    gen: _Generator, node: _Node, f: str, pos: str, out: _Code
+) -> tuple[str, str, str]:
+    """Generate the code of a parser whose value is passed to a function."""
+    ok, val, end = gen.block(node.args["self"], pos, out)
+    n = gen.fresh()
+    out.emit(
+        f"if {ok}:",
+        f"    v{n} = {f.format(val)}",
+        "else:",
+        f"    v{n} = {val}",
+    )
+    return ok, f"v{n}", end
+
+
+def _map(gen: _Generator, node: _Node, pos: str, out: _Code):
+    f = gen.constant(node.args["f"])
+    return _apply(gen, node, f + "({})", pos, out)
+
+
+def _decode(gen: _Generator, node: _Node, pos: str, out: _Code):
+    encoding = gen.constant(node.args["encoding"])
+    errors = gen.constant(node.args["errors"])
+    return _apply(gen, node, f"str({{}}, {encoding}, {errors})", pos, out)
+
+
+def _optional(gen: _Generator, node: _Node, pos: str, out: _Code):
+    ok, val, end = gen.block(node.args["self"], pos, out)
+    default = node.args["default"]
+    absent = "[]" if default is None else f"[{gen.constant(default)}]"
+    n = gen.fresh()
+    out.emit(
+        f"if {ok}:",
+        f"    ok{n}, v{n}, e{n} = True, [{val}], {end}",
+        f"elif {ok} is None:",
+        f"    ok{n}, v{n}, e{n} = None, {val}, {end}",
+        "else:",
+        f"    ok{n}, v{n}, e{n} = True, {absent}, {pos}",
+    )
+    return f"ok{n}", f"v{n}", f"e{n}"
+
+
+def _many0(gen: _Generator, node: _Node, pos: str, out: _Code):
+    n = gen.fresh()
+    out.emit(f"ok{n}, v{n}, e{n} = True, [], {pos}", "while True:")
+    ok, val, end = gen.block(node.args["self"], f"e{n}", out.nested(1))
+    out.nested(1).emit(
+        # Stop on empty matches instead of looping forever.
+        f"if not {ok} or {end} == e{n}:",
+        f"    if {ok} is None:",
+        f"        ok{n}, v{n}, e{n} = None, {val}, {end}",
+        "    break",
+        f"v{n}.append({val})",
+        f"e{n} = {end}",
+    )
+    return f"ok{n}", f"v{n}", f"e{n}"
+
+
+def _many1(gen: _Generator, node: _Node, pos: str, out: _Code):
+    return _many1_sep_by(gen, node, pos, out)
+
+
+def _many1_sep_by(gen: _Generator, node: _Node, pos: str, out: _Code):
+    # The first value is parsed by the same loop as the others, so that the parser
+    # is only generated once.
+    sep = node.args.get("sep_parser")
+    n = gen.fresh()
+    ok, vals, end = f"ok{n}", f"v{n}", f"e{n}"
+    out.emit(
+        f"{ok}, {vals}, {end} = True, [], {pos}",
+        "while True:",
+        f"    q{n} = {end}",
+    )
+    if sep is not None:
+        out.nested(1).emit(f"if {vals}:")
+        sep_ok, sep_val, sep_end = gen.block(sep, f"q{n}", out.nested(2))
+        out.nested(2).emit(
+            f"if not {sep_ok}:",
+            f"    if {sep_ok} is None:",
+            f"        {ok}, {vals}, {end} = None, {sep_val}, {sep_end}",
+            "    break",
+            f"q{n} = {sep_end}",
+        )
+    child_ok, val, child_end = gen.block(node.args["self"], f"q{n}", out.nested(1))
+    out.nested(1).emit(
+        f"if not {child_ok}:",
+        f"    if not {vals} or {child_ok} is None:",
+        f"        {ok}, {vals}, {end} = {child_ok}, {val}, {child_end}",
+        "    break",
+        # Stop on empty matches instead of looping forever.
+        f"if {vals} and {child_end} == {end}:",
+        "    break",
+        f"{vals}.append({val})",
+        f"{end} = {child_end}",
+    )
+    return ok, vals, end
+
+
+def _repeat(gen: _Generator, node: _Node, pos: str, out: _Code):
+    if node.kind == "times":
+        min_count = max_count = node.args["n"]
+    else:
+        min_count, max_count = node.args["min_count"], node.args["max_count"]
+    n = gen.fresh()
+    ok, vals, end = f"ok{n}", f"v{n}", f"e{n}"
+    loop = "while True:" if max_count is None else f"while len({vals}) < {max_count}:"
+    out.emit(f"{ok}, {vals}, {end} = True, [], {pos}", loop)
+    child_ok, val, child_end = gen.block(node.args["self"], end, out.nested(1))
+    out.nested(1).emit(
+        f"if not {child_ok}:",
+        f"    if len({vals}) < {min_count} or {child_ok} is None:",
+        f"        {ok}, {vals}, {end} = {child_ok}, {val}, {child_end}",
+        "    break",
+        # Stop on empty matches instead of looping forever.
+        f"if {child_end} == {end} and len({vals}) >= {min_count}:",
+        "    break",
+        f"{vals}.append({val})",
+        f"{end} = {child_end}",
+    )
+    return ok, vals, end
+
+
+def _commit(gen: _Generator, node: _Node, pos: str, out: _Code):
+    ok, val, end = gen.block(node.args["self"], pos, out)
+    n = gen.fresh()
+    out.emit(f"ok{n} = None if {ok} is False else {ok}")
+    return f"ok{n}", val, end
+
+
+_KINDS = {
+    "char_class": _char_class,
+    "char": _char_class,
+    **{kind: _char_class for kind in _CHAR_CLASSES},
+    "satisfy": _satisfy,
+    "string": _string,
+    "take_while": _take_while,
+    "regex": _regex,
+    "just": _just,
+    "and_then": _and_then,
+    "preceded_by": _preceded_by,
+    "succeeded_by": _succeeded_by,
+    "surrounded_by": _surrounded_by,
+    "sequence": _sequence_of,
+    "or_else": _or_else,
+    "choice": _choice,
+    "forward": _forward,
+    "map": _map,
+    "decode": _decode,
+    "optional": _optional,
+    "commit": _commit,
+    "many0": _many0,
+    "many1": _many1,
+    "many1_sep_by": _many1_sep_by,
+    "many0_sep_by": _many1_sep_by,
+    "times": _repeat,
+    "repeat": _repeat,
+}
@@ -0,0 +1,100 @@
+"""Incremental parsing of edited texts."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Generic, NamedTuple, TypeVar
+
+from dine.memo import MemoTable
+from dine.result import ParseResult
+from dine.stream import Stream
+
+if TYPE_CHECKING:  # pragma: no cover
+    from dine.parser import Parser
+
+A = TypeVar("A")
+
+
+class Edit(NamedTuple):
+    """Replacement of `deleted` characters at `offset` by the `inserted` text."""
+
+    offset: int
+    deleted: int
+    inserted: str
+
+    def apply(self, text: str) -> str:
+        """
+        The text after the edit
+
+        Parameters
+        ----------
+        text : str
+            the text before the edit
+
+        Returns
+        -------
+        str
+        """
+        if not 0 <= self.offset <= self.offset + self.deleted <= len(text):
+            raise ValueError(f"{self} is out of the text")
+        return text[: self.offset] + self.inserted + text[self.offset + self.deleted :]
+
+
+class IncrementalParse(Generic[A]):
+    """
+    Parse of a text that keeps the results of every parser it ran.
+
+    Editing the text with `edit` parses the new text again, reusing the results
+    of the previous parse that did not look at the edited characters. The cost
+    of a re-parse thus depends on the size of the edit and of the parsers
+    enclosing it, rather than on the size of the whole text. In exchange, the
+    first parse is slower than a plain one, since every result is cached.
+
+    Parsers are assumed to only look at the characters after their offset, up
+    to one character past where they stop. Regular expressions may look further
+    ahead (e.g. when trying alternatives), so their results are only reused if
+    the rest of the text is unchanged, unless they are simple enough to know how
+    far they look. Parsers looking behind their offset (e.g. regular expressions
+    with lookbehind assertions or ``\b``) may keep stale results.
+    """
+
+    def __init__(
+        self, parser: Parser[A], text: str, memo: MemoTable | None = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        parser : Parser[A]
+            the parser
+        text : str
+            the text to parse
+        memo : MemoTable | None
+            the results to reuse, valid for `text`
+        """
+        self.parser: Parser[A] = parser
+        self.text: str = text
+        self.memo: MemoTable = MemoTable() if memo is None else memo
+        self.result: ParseResult[A] = parser(
+            Stream(text)._with_memo(self.memo)  # pylint: disable=protected-access
+        )
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> IncrementalParse[A]:
+        """
+        Parse the text after an edit
+
+        Parameters
+        ----------
+        offset : int
+            offset of the edit
+        deleted : int
+            number of characters deleted at `offset`
+        inserted : str
+            text inserted at `offset`
+
+        Returns
+        -------
+        IncrementalParse[A]
+            the parse of the edited text. The current parse is left unchanged.
+        """
+        text = Edit(offset, deleted, inserted).apply(self.text)
+        memo = self.memo.edited(offset, deleted, len(inserted))
+        return IncrementalParse(self.parser, text, memo)
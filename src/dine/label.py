@@ -0,0 +1,58 @@
+"""Labels of parsers, rendered lazily."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class Label:
+    """
+    Label made of text and of the labels of other parsers.
+
+    Combinators label their parsers after the labels of their sub-parsers. Making
+    those labels eagerly would copy the labels of the sub-parsers into every
+    enclosing parser, so a label is kept as a tree instead, and only rendered
+    when read, e.g. when a `ParseFailure` is shown.
+
+    Sub-parsers are rendered with their label at that time. A label containing
+    itself, as in recursive grammars, is rendered as ``...`` where it recurs.
+    """
+
+    __slots__ = ("parts",)
+
+    def __init__(self, *parts: Any) -> None:
+        """
+        Parameters
+        ----------
+        *parts : Any
+            the text (``str``), labels, and parsers whose labels make the label,
+            in order
+        """
+        self.parts: tuple = parts
+
+    def __str__(self) -> str:
+        out: list[str] = []
+        # Labels being rendered, and the markers after their parts (their ids)
+        # which end their rendering. The tree is walked with a stack rather than
+        # recursively, since grammars may be nested deeper than the recursion
+        # limit.
+        active: set[int] = set()
+        stack: list[Any] = [self]
+        while stack:
+            item = stack.pop()
+            if not isinstance(item, (str, int, Label)):
+                item = item._label  # pylint: disable=protected-access
+            if isinstance(item, str):
+                out.append(item)
+            elif isinstance(item, int):
+                active.discard(item)
+            elif id(item) in active:
+                out.append("...")
+            else:
+                active.add(id(item))
+                stack.append(id(item))
+                stack.extend(reversed(item.parts))
+        return "".join(out)
+
+    def __repr__(self) -> str:
+        return f"Label({str(self)!r})"
@@ -0,0 +1,232 @@
+"""Memoization table for packrat parsing."""
+
+from __future__ import annotations
+
+import sys
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:  # pragma: no cover
+    from dine.parser import Parser, RawResult
+    from dine.stream import Failure
+
+    # Key of a cached result: the parser and the offset it ran from.
+    MemoKey = tuple[Parser, int]
+    # A cached result, with its reach and the farthest failure of its run.
+    MemoEntry = tuple[RawResult, int, Failure | None]
+
+
+class MemoStats:
+    """Cache statistics of a packrat parse."""
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the lookups that were answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self):
+        return (
+            f"MemoStats(hits={self.hits},misses={self.misses},"
+            f"evictions={self.evictions})"
+        )
+
+
+class MemoTable:
+    """
+    Cache of parse results keyed by (parser, stream offset).
+
+    When a size bound is given, the least recently used entries are evicted
+    once the table grows past it.
+
+    Each result is cached along with its reach: the offset past the last
+    character the parser looked at to produce it, and with the farthest failure
+    of the parsers run to produce it, if any. A result stays valid as long as
+    the characters between its offset and its reach are unchanged.
+
+    A table made for an edited text by `edited` shares the results of the
+    original table, called the base, instead of copying them. The base results
+    are moved to the offsets of the edited text on lookup, through the segments
+    of the text left unchanged by the edits.
+    """
+
+    def __init__(self, max_size: int | None = None) -> None:
+        if max_size is not None and max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size: int | None = max_size
+        self.stats: MemoStats = MemoStats()
+        self.entries: OrderedDict[MemoKey, MemoEntry] = OrderedDict()
+        # Reach of the parse in progress, see `Parser._memo_parse`.
+        self.reach: int = 0
+        self.base: dict[MemoKey, MemoEntry] | None = None
+        # Unchanged segments of the text, as `(start, stop, delta)` triples sorted
+        # by `start`: the results of the base between `start - delta` and
+        # `stop - delta` are valid between `start` and `stop`.
+        self.segments: list[tuple[int, int, int]] = []
+        self.starts: list[int] = []
+
+    def get(self, key: MemoKey) -> MemoEntry | None:
+        """
+        Look up a cached result
+
+        Parameters
+        ----------
+        key : MemoKey
+            the (parser, offset) key
+
+        Returns
+        -------
+        MemoEntry | None
+            the cached `(result, reach, failure)` entry, or `None` if there is none
+        """
+        result = self.entries.get(key)
+        if result is not None:
+            if self.max_size is not None:
+                self.entries.move_to_end(key)
+        elif self.base is not None:
+            result = self._get_base(key)
+        if result is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return result
+
+    def _get_base(self, key: MemoKey) -> MemoEntry | None:
+        assert self.base is not None
+        parser, pos = key
+        i = bisect_right(self.starts, pos) - 1
+        if i < 0:
+            return None
+        _, stop, delta = self.segments[i]
+        if pos >= stop:
+            return None
+        entry = self.base.get((parser, pos - delta))
+        if entry is None or entry[1] + delta > stop:
+            return None
+        return _shift(entry, delta)
+
+    def put(self, key: MemoKey, result: MemoEntry) -> None:
+        """
+        Cache a result
+
+        Parameters
+        ----------
+        key : MemoKey
+            the (parser, offset) key
+        result : MemoEntry
+            the `(result, reach, failure)` entry to cache
+        """
+        self.entries[key] = result
+        if self.max_size is not None and len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def edited(self, offset: int, deleted: int, inserted: int) -> MemoTable:
+        """
+        Table of the results still valid after an edit of the text
+
+        The results that only looked at characters before the edit are kept as
+        they are, the results starting after the edit are moved by the change of
+        length of the text, and the others are dropped. The table itself is left
+        unchanged.
+
+        The results cached since the base was made are moved eagerly, the base
+        itself is shared. Once they outnumber half of the base, all the results are
+        merged into a new base, so the cost of the edits stays proportional to the
+        number of results computed again.
+
+        Parameters
+        ----------
+        offset : int
+            offset of the edit
+        deleted : int
+            number of characters deleted at `offset`
+        inserted : int
+            number of characters inserted at `offset`
+
+        Returns
+        -------
+        MemoTable
+        """
+        table = MemoTable(self.max_size)
+        if self.base is None:
+            table.base = self.entries
+            segments = [(0, _UNBOUNDED, 0)]
+        elif 2 * len(self.entries) > len(self.base):
+            table.base = dict(self._items())
+            segments = [(0, _UNBOUNDED, 0)]
+        else:
+            table.base = self.base
+            segments = self.segments
+            end = offset + deleted
+            delta = inserted - deleted
+            for key, entry in self.entries.items():
+                parser, pos = key
+                if entry[1] <= offset:
+                    table.entries[key] = entry
+                elif pos >= end:
+                    table.entries[(parser, pos + delta)] = _shift(entry, delta)
+        table.segments = _edit_segments(segments, offset, deleted, inserted)
+        table.starts = [start for start, _, _ in table.segments]
+        return table
+
+    def _items(self) -> Iterator[tuple[MemoKey, MemoEntry]]:
+        """The valid results of the table, base included."""
+        if self.base is not None:
+            # Base offsets of the segments, to find the segment of a base result.
+            base_starts = [start - delta for start, _, delta in self.segments]
+            for (parser, pos), entry in self.base.items():
+                i = bisect_right(base_starts, pos) - 1
+                if i < 0:
+                    continue
+                _, stop, delta = self.segments[i]
+                if entry[1] + delta <= stop:
+                    yield ((parser, pos + delta), _shift(entry, delta))
+        yield from self.entries.items()
+
+    def __len__(self) -> int:
+        return len(self.entries) + (len(self.base) if self.base is not None else 0)
+
+
+# Stop of the last segment of a text.
+_UNBOUNDED = sys.maxsize
+
+
+def _shift(entry: MemoEntry, delta: int) -> MemoEntry:
+    """A cached `(result, reach, failure)` entry moved by `delta` characters."""
+    if delta == 0:
+        return entry
+    (ok, val, pos), reach, failure = entry
+    if failure is not None:
+        failure = (failure[0] + delta, failure[1])
+    return ((ok, val, pos + delta), reach + delta, failure)
+
+
+def _edit_segments(
+    segments: list[tuple[int, int, int]], offset: int, deleted: int, inserted: int
+) -> list[tuple[int, int, int]]:
+    """The unchanged segments of a text after an edit."""
+    end = offset + deleted
+    delta = inserted - deleted
+    edited = []
+    for start, stop, shift in segments:
+        if start < offset:
+            edited.append((start, min(stop, offset), shift))
+        if stop > end:
+            edited.append(
+                (
+                    max(start, end) + delta,
+                    stop if stop == _UNBOUNDED else stop + delta,
+                    shift + delta,
+                )
+            )
+    return edited
+
+
+StatsHook = Callable[[MemoStats], None]
@@ -0,0 +1,147 @@
+"""Parallel parsing of inputs made of delimited records."""
+
+from __future__ import annotations
+
+import mmap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from dine.parser import Parser, RawResult, _failure, _to_stream
+from dine.result import ParseResult, ParseSuccess
+
+A = TypeVar("A")
+
+Text = str | bytes | bytearray | mmap.mmap
+
+# Parser and input of a worker process, set by `_init_worker`. The input is only
+# known by forked processes.
+_worker: tuple[Parser, Text | None] | None = None
+
+
+def parse_parallel(
+    record: Parser[A],
+    text: Text,
+    sep: str | bytes = "\n",
+    *,
+    chunk_size: int = 1 << 20,
+    max_workers: int | None = None,
+) -> ParseResult[list[A]]:
+    """
+    Parse records separated by a delimiter in parallel
+
+    The input is split into chunks of about `chunk_size` characters at
+    occurrences of the separator, the chunks are parsed in a pool of processes,
+    and their values are merged in order. The result is the same as the one of
+    ``record.many1_sep_by(Parser.string(sep))(text)``, including the locations,
+    which are those in the whole input.
+
+    A record must be parsed the same way whether it is followed by the rest of
+    the input or by the end of its chunk. Chunks that are not parsed until their
+    end (e.g. because of a parse failure, or a record containing the
+    separator) are parsed again sequentially, with the rest of the input.
+
+    Forked processes share the input with the calling process. On platforms that
+    cannot fork processes, the parser is pickled, so the functions it is made
+    with must be defined at the top level of a module, and each process is sent
+    the chunks it parses rather than the whole input, which cannot be pickled
+    when it is memory-mapped.
+
+    Parameters
+    ----------
+    record : Parser[A]
+        the parser of a record. Its values must be picklable.
+    text : Text
+        the input, text or bytes
+    sep : str | bytes
+        the separator of the records, bytes if the input is bytes
+    chunk_size : int
+        the minimum size of the chunks parsed by a process
+    max_workers : int | None
+        the number of processes, the number of CPUs by default
+
+    Returns
+    -------
+    ParseResult[list[A]]
+    """
+    if not sep:
+        raise ValueError("the separator must not be empty")
+    parser = record.many1_sep_by(Parser.string(sep))
+    pieces = _split(text, sep, chunk_size)
+    if len(pieces) == 1 or max_workers == 1:
+        return parser(text)
+
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    with ProcessPoolExecutor(
+        max_workers,
+        # Forked processes inherit the parser and the input instead of unpickling
+        # them.
+        mp_context=multiprocessing.get_context("fork") if fork else None,
+        initializer=_init_worker,
+        initargs=(parser, text if fork else None),
+    ) as executor:
+        if fork:
+            starts = [start for start, _ in pieces]
+            ends = [end for _, end in pieces]
+            results = executor.map(_parse_piece, starts, ends)
+        else:
+            chunks = (text[start:end] for start, end in pieces)
+            results = executor.map(_parse_chunk, chunks)
+        # The stream of the whole input, and its line index, are only needed once
+        # the chunks are parsed, so they are made while the processes parse.
+        stream = _to_stream(text)
+
+        vals: list[A] = []
+        for i, (start, end) in enumerate(pieces):
+            ok, val, pos = next(results)
+            if ok and start + pos == end:
+                vals.extend(val)
+                continue
+            executor.shutdown(wait=False, cancel_futures=True)
+            # pylint: disable-next=protected-access
+            ok, val, pos = parser._parse(stream, start)
+            if ok:
+                vals.extend(val)
+            elif i == 0 or ok is None:
+                # A committed failure is not backtracked by the repetition.
+                # pylint: disable-next=protected-access
+                return _failure(stream, pos, val, parser._label)
+            else:
+                # The record after the previous separator failed, so the
+                # repetition stops before the separator.
+                pos = pieces[i - 1][1]
+            return ParseSuccess(stream.location(stream.begin), vals, stream.at(pos))
+    return ParseSuccess(stream.location(stream.begin), vals, stream.at(len(text)))
+
+
+def _split(text: Text, sep: Any, chunk_size: int) -> list[tuple[int, int]]:
+    """Offsets of the chunks of the input, split after separators."""
+    pieces = []
+    start = 0
+    while True:
+        cut = text.find(sep, start + max(chunk_size, 1))
+        if cut == -1:
+            pieces.append((start, len(text)))
+            return pieces
+        pieces.append((start, cut))
+        start = cut + len(sep)
+
+
+def _init_worker(parser: Parser, text: Text | None) -> None:
+    global _worker  # pylint: disable=global-statement
+    _worker = (parser, text)
+
+
+def _parse_piece(start: int, end: int) -> RawResult:
+    """Parse a chunk of the input inherited by a forked process."""
+    assert _worker is not None
+    text = _worker[1]
+    assert text is not None
+    return _parse_chunk(text[start:end])
+
+
+def _parse_chunk(chunk: Text) -> RawResult:
+    """Parse a chunk of the input."""
+    assert _worker is not None
+    stream = _to_stream(chunk)
+    return _worker[0]._parse(stream, 0)  # pylint: disable=protected-access
@@ -1,13 +1,39 @@
 from __future__ import annotations
 
-import string
-from functools import reduce
-from itertools import chain
-from typing import Callable, Generic, Iterable, ParamSpec, TypeVar
-
-from dine.errors import InternalError
+import functools
+import importlib
+import mmap
+import re
+import sys
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Literal,
+    NamedTuple,
+    ParamSpec,
+    Protocol,
+    TypeVar,
+)
+
+from dine.charclass import (
+    ASCII_LETTERS,
+    ASCII_LOWERCASE,
+    ASCII_UPPERCASE,
+    DIGITS,
+    DIGITS_NONZERO,
+    CharClass,
+)
+from dine.errors import InternalError, ParseError
+from dine.incremental import IncrementalParse
+from dine.label import Label
+from dine.memo import MemoTable, StatsHook
+from dine.profile import Profiler
 from dine.result import ParseFailure, ParseResult, ParseSuccess
-from dine.stream import Location, Stream
+from dine.stream import ByteStream, ChunkedStream, Stream
+from dine.trace import Hook
 
 # Type Variables
 A = TypeVar("A")
@@ -15,33 +41,391 @@ B = TypeVar("B")
 P = ParamSpec("P")
 ParseFunc = Callable[[Stream], ParseResult[A]]
 
+# Internally, parsers do not build `ParseResult` objects. They take the stream and
+# the offset to parse from, and return a `(ok, value, offset)` tuple:
+# - `(True, val, end)` on success, where `end` is the offset after the parsed value,
+# - `(False, msg, offset)` on failure, where `offset` is where the parser failed.
+#   Primitive parsers fail with a `None` message, meaning that the input at
+#   `offset` is unexpected, and record their failure in the `FarthestFailure` of
+#   the stream. The message is only formatted for the failure of a whole parse.
+# - `(None, msg, offset)` on a committed failure (see `Parser.commit`), which the
+#   parsers trying alternatives or repetitions return as it is, instead of
+#   backtracking. Other parsers return failures unchanged, keeping them committed.
+# The public `ParseResult` objects are only built in `Parser.__call__`.
+RawResult = tuple[bool | None, Any, int]
+RunFunc = Callable[[Stream, int], RawResult]
+
+
+class Instrument(Protocol):
+    """
+    Object notified of the parsers run on a stream, e.g. a `Profiler`.
+    """
+
+    def enter(self, parser: Parser, pos: int) -> None:
+        """Called when a parser starts parsing at an offset."""
+
+    def exit(self, parser: Parser, pos: int, result: RawResult | None) -> None:
+        """
+        Called when the parser returns, with its result, or `None` if it raised an
+        exception.
+        """
 
-class Parser(Generic[A]):
-    """The Parser class."""
 
-    def __init__(self: Parser[A], parse_fn: ParseFunc[A], *, label: str | None):
-        self.parse_fn: ParseFunc[A] = parse_fn
-        self.label: str = label or str(id(self))
-
-    def __call__(self: Parser[A], s: Stream | str) -> ParseResult[A]:
-        match s:
-            case str():
-                stream = Stream(s)
-            case Stream():
-                stream = s
-            case _:
-                raise InternalError()
-        result = self.parse_fn(stream)
+class _Instruments:
+    """Instruments notified one after another, as one instrument."""
+
+    __slots__ = ("instruments",)
+
+    def __init__(self, instruments: Iterable[Instrument]) -> None:
+        self.instruments: tuple[Instrument, ...] = tuple(instruments)
+
+    def enter(self, parser: Parser, pos: int) -> None:
+        """Notify the instruments, in order, that a parser is run."""
+        for instrument in self.instruments:
+            instrument.enter(parser, pos)
+
+    def exit(self, parser: Parser, pos: int, result: RawResult | None) -> None:
+        """Notify the instruments, in reverse order, that a parser returned."""
+        for instrument in reversed(self.instruments):
+            instrument.exit(parser, pos, result)
+
+
+# Number of characters buffered ahead of a regular expression match on streams
+# reading their input incrementally. A match ending within them is final, while a
+# match reaching the end of the buffered data, or a failure that may be a match
+# cut off by it, is tried again with more data.
+REGEX_LOOKAHEAD = 1 << 12
+
+# Number of characters parsed by `Parser.iter_many` before the data buffered by a
+# `ChunkedStream` may be released.
+RELEASE_THRESHOLD = 1 << 16
+
+Input = Stream | str | bytes | bytearray | memoryview | mmap.mmap
+
+
+def _adapt(parse_fn: ParseFunc) -> RunFunc:
+    """Wrap a function returning a `ParseResult` into the internal protocol."""
+
+    def run(s: Stream, pos: int) -> RawResult:
+        result = parse_fn(s.at(pos))
         match result:
-            case ParseSuccess():
-                return result
-            case ParseFailure(loc=loc, label=label, msg=msg):
-                if self.label is not None:
-                    label = self.label
-                return ParseFailure(loc, label, msg)
+            case ParseSuccess(val=val, rs=rs):
+                return (True, val, rs.begin)
+            case ParseFailure(loc=loc, msg=msg):
+                offset = s.offset(loc)
+                # pylint: disable-next=protected-access
+                for label in result._expected:
+                    s.failures.expect(offset, label)
+                return (False, msg, offset)
             case _:
                 raise InternalError()
 
+    return run
+
+
+def _unexpected(c: str | int) -> str:
+    """Failure message for an unexpected character, or byte on byte streams."""
+    if isinstance(c, int):
+        return f"unexpected byte {bytes((c,))!r}"
+    return f"unexpected character '{c}'"
+
+
+def _failed(s: Stream, pos: int, parser: Parser) -> RawResult:
+    """Failure of a primitive parser on unexpected input."""
+    failures = s.failures
+    if pos >= failures.pos:
+        failures.expect(pos, parser)
+    return (False, None, pos)
+
+
+def _failure(s: Stream, pos: int, msg: str | None, label: str | Label) -> ParseFailure:
+    """
+    The failure of a parse, reported at the farthest failure of its parsers.
+    """
+    failures = s.failures
+    if failures.pos > pos or failures.pos == pos and msg is None:
+        pos, msg = failures.pos, None
+    expected = failures.expected if failures.pos == pos else ()
+    if msg is None:
+        if pos < len(s.buf) or s.fetch(pos + 1):
+            msg = _unexpected(s.buf[pos])
+        else:
+            msg = "input stream exhausted"
+    return ParseFailure(s.location(pos), label, msg, expected)
+
+
+# Parser of regular expressions of the `re` module, to analyze patterns.
+_sre_parse: Any = importlib.import_module(
+    "re._parser" if sys.version_info >= (3, 11) else "sre_parse"
+)
+
+
+def _regex_width(compiled: re.Pattern) -> int | None:
+    """
+    Number of characters a regular expression looks at from its offset when it
+    fails, or `None` if unknown.
+
+    The regular expressions made of single characters (e.g. literals or classes),
+    and at most one repetition of a single character at their end, never
+    backtrack: they fail within their fixed width and the minimum count of their
+    repetition, and succeed looking at one character past their match at most.
+    Others, e.g. with alternatives or lookahead assertions, may look at any
+    character of the input.
+    """
+    units = (_sre_parse.LITERAL, _sre_parse.NOT_LITERAL, _sre_parse.IN, _sre_parse.ANY)
+    items = list(_sre_parse.parse(compiled.pattern, compiled.flags).data)
+    width = 0
+    while items:
+        op, av = items.pop(0)
+        if op is _sre_parse.SUBPATTERN:
+            items[:0] = av[3].data
+        elif op in units:
+            width += 1
+        elif (
+            op is _sre_parse.MAX_REPEAT
+            and not items
+            and len(av[2].data) == 1
+            and av[2].data[0][0] in units
+        ):
+            width += av[0]
+        else:
+            return None
+    return width
+
+
+def _to_stream(s: Input) -> Stream:
+    """The stream to parse an input."""
+    match s:
+        case str():
+            return Stream(s)
+        case bytes() | bytearray() | memoryview() | mmap.mmap():
+            return ByteStream(s)
+        case Stream():
+            return s
+        case _:
+            raise InternalError()
+
+
+def _recorded(factory: Callable[P, Parser]) -> Callable[P, Parser]:
+    """
+    Record how the parsers made by a factory are made, so they can be pickled.
+
+    The parsers hold closures, which cannot be pickled. They are pickled as the
+    factory and its arguments instead, and made again when unpickled.
+    """
+
+    @functools.wraps(factory)
+    def make(*args: Any, **kwargs: Any) -> Parser:
+        # Iterators (e.g. `map` objects) can neither be pickled nor be read twice.
+        args = tuple(list(a) if isinstance(a, Iterator) else a for a in args)
+        parser = factory(*args, **kwargs)  # type: ignore
+        parser._recipe = (make, args, kwargs)  # pylint: disable=protected-access
+        return parser
+
+    return make  # type: ignore
+
+
+def _make(factory: Callable[..., Parser], args: tuple, kwargs: dict) -> Parser:
+    """Make a parser again from its recipe, when unpickled."""
+    return factory(*args, **kwargs)
+
+
+def _joined(parsers: list[Parser]) -> list[Parser | str]:
+    """Parts of a label listing the labels of some parsers."""
+    parts: list[Parser | str] = []
+    for parser in parsers:
+        if parts:
+            parts.append(", ")
+        parts.append(parser)
+    return parts
+
+
+def _union_first(parsers: list[Parser]) -> frozenset[str | int] | None:
+    """Union of the first sets of some parsers, or `None` if one is unknown."""
+    first: frozenset[str | int] = frozenset()
+    for parser in parsers:
+        if parser._first is None:  # pylint: disable=protected-access
+            return None
+        first |= parser._first  # pylint: disable=protected-access
+    return first
+
+
+class Operator(NamedTuple):
+    """
+    An operator of `Parser.expression`.
+
+    Binary operators (``"left"`` or ``"right"`` associative) combine the values of
+    their operands with ``fn(left, right)``, prefix operators combine the value of
+    their operand with ``fn(operand)``. Operators with a higher precedence bind
+    tighter. The value parsed by `parser` is discarded.
+    """
+
+    parser: Parser
+    precedence: int
+    fn: Callable[..., Any]
+    assoc: Literal["left", "right", "prefix"] = "left"
+
+
+class Parser(Generic[A]):
+    """
+    The Parser class.
+
+    Parsers can be pickled, e.g. to be sent to worker processes, as long as the
+    functions and values they are made with can be.
+    """
+
+    def __init__(self: Parser[A], parse_fn: ParseFunc[A], *, label: str | None):
+        self._parse_fn: ParseFunc[A] | None = parse_fn
+        self._label: str | Label = label or str(id(self))
+        self._run: RunFunc = _adapt(parse_fn)
+        self._first: frozenset[str | int] | None = None
+        # Factory and arguments the parser is made with, see `_recorded`.
+        self._recipe: tuple[Callable[..., Parser], tuple, dict] | None = (
+            Parser,
+            (parse_fn,),
+            {"label": label},
+        )
+        # Definition of a parser made with `forward`.
+        self._target: Parser | None = None
+
+    @staticmethod
+    def _from_run(
+        run: RunFunc,
+        *,
+        label: str | Label | None,
+        first: frozenset[str | int] | None = None,
+    ) -> Parser:
+        """
+        Create a parser from a function following the internal protocol.
+
+        `first` is the set of characters (or byte values) a successful parse can
+        start with, if known. A parser with a known first set never succeeds without
+        consuming at least one character.
+        """
+        # pylint: disable=protected-access
+        parser: Parser = Parser.__new__(Parser)
+        parser._parse_fn = None
+        parser._label = label or str(id(parser))
+        parser._run = run
+        parser._first = first
+        parser._recipe = None
+        parser._target = None
+        return parser
+
+    def __reduce__(self) -> tuple:
+        if self._recipe is None:
+            raise TypeError(f"parser {self.label!r} cannot be pickled")
+        state: dict[str, Any] = {"_label": self._label}
+        if self._is_forward():
+            # The definition is pickled as part of the state rather than of the
+            # recipe, so that pickle can handle the cycles of recursive grammars.
+            state["_target"] = self._target
+        return (_make, self._recipe, state)
+
+    def __setstate__(self, state: dict) -> None:
+        target = state.pop("_target", None)
+        self.__dict__.update(state)
+        if target is not None:
+            self.define(target)
+
+    @property
+    def parse_fn(self: Parser[A]) -> ParseFunc[A]:
+        """
+        The function parsing a stream with this parser
+
+        Parsers run each other with an internal protocol rather than with their
+        parse functions. Only the parsers made from a function return it, the
+        others return a function parsing a stream as ``parser(stream)`` does.
+
+        Returns
+        -------
+        ParseFunc[A]
+        """
+        if self._parse_fn is not None:
+            return self._parse_fn
+        return self.__call__
+
+    def __call__(self: Parser[A], s: Input) -> ParseResult[A]:
+        stream = _to_stream(s)._with_failures()  # pylint: disable=protected-access
+        ok, val, pos = self._parse(stream, stream.begin)
+        if ok:
+            return ParseSuccess(stream.location(stream.begin), val, stream.at(pos))
+        return _failure(stream, pos, val, self._label)
+
+    def _parse(self: Parser[A], s: Stream, pos: int) -> RawResult:
+        # Most parses neither memoize nor instrument the parsers, and only pay for
+        # this check.
+        if s.plain:
+            return self._run(s, pos)
+        instrument = s.instrument
+        if instrument is None:
+            return self._memo_parse(s, pos)
+        instrument.enter(self, pos)
+        try:
+            result = self._memo_parse(s, pos)
+        except BaseException:
+            instrument.exit(self, pos, None)
+            raise
+        instrument.exit(self, pos, result)
+        return result
+
+    def _memo_parse(self: Parser[A], s: Stream, pos: int) -> RawResult:
+        """`_parse`, reusing the results in the memoization table of the stream"""
+        memo = s.memo
+        if memo is None:
+            return self._run(s, pos)
+        key = (self, pos)
+        entry = memo.get(key)
+        if entry is not None:
+            result, reach, failure = entry
+            if reach > memo.reach:
+                memo.reach = reach
+            if failure is not None:
+                s.failures.merge(failure)
+            return result
+        # Track the farthest offset looked at while running the parser, so that an
+        # incremental re-parse knows which edits invalidate the result.
+        outer = memo.reach
+        memo.reach = pos
+        # Also keep the farthest failure of the run, to record it again when the
+        # result is reused, e.g. in another parse of an incremental parse.
+        saved = s.failures.save()
+        result = self._run(s, pos)
+        failure = s.failures.restore(saved)
+        # The parser looked at least at the character where it stopped.
+        reach = max(memo.reach, result[2] + 1)
+        memo.put(key, (result, reach, failure))
+        memo.reach = max(outer, reach)
+        return result
+
+    def _instrumented(self: Parser[A], instrument: Instrument) -> Parser[A]:
+        """
+        The parser, notifying an instrument of the parsers it runs, along with the
+        instrument of the stream if any.
+        """
+
+        def run(s: Stream, pos: int) -> RawResult:
+            outer = s.instrument
+            instruments: Instrument
+            if outer is not None:
+                instruments = _Instruments((outer, instrument))
+            else:
+                instruments = instrument
+            # pylint: disable-next=protected-access
+            stream = s._with_instrument(instruments)
+            return self._parse(stream, pos)
+
+        return Parser._from_run(run, label=self._label, first=self._first)
+
+    @property
+    def label(self) -> str:
+        """The label of the parser, shown when it fails"""
+        return str(self._label)
+
+    @label.setter
+    def label(self, label: str) -> None:
+        self._label = label
+
     def set_label(self: Parser[A], label: str) -> Parser[A]:
         """Set the label of the parser.
 
@@ -56,6 +440,159 @@ class Parser(Generic[A]):
         self.label = label
         return self
 
+    def _is_forward(self) -> bool:
+        return self._recipe is not None and self._recipe[0] is Parser.forward
+
+    def define(self: Parser[A], parser: Parser[A]) -> None:
+        """
+        Define a parser made with `forward`
+
+        Parameters
+        ----------
+        parser : Parser[A]
+            the parser the forward parser stands for
+        """
+        if not self._is_forward():
+            raise TypeError(f"parser {self.label!r} is not a forward parser")
+        if self._target is not None:
+            raise ValueError(f"forward parser {self.label!r} is already defined")
+        self._target = parser
+        # Run the parser directly, without going through an extra call. A forward
+        # parser defined by another one that is not defined yet has to look it up
+        # when it runs.
+        # pylint: disable=protected-access
+        self._run = parser._parse if parser._is_forward() else parser._run
+        self._first = parser._first
+        if self._label == str(id(self)):
+            self._label = parser._label
+
+    @_recorded
+    def packrat(
+        self: Parser[A],
+        max_size: int | None = None,
+        *,
+        on_stats: StatsHook | None = None,
+    ) -> Parser[A]:
+        """
+        Memoize the results of every parser reached from this one
+
+        During a call of the returned parser, the result of each (parser, stream
+        offset) pair is cached, so backtracking into the same alternative at the
+        same offset does not parse it again. The cache is dropped when the call
+        returns.
+
+        If the stream is already memoized (e.g. in an incremental parse, or under
+        another packrat parser), its cache is used instead.
+
+        Parameters
+        ----------
+        max_size : int | None
+            maximum number of cached results, the least recently used ones are
+            evicted first. The cache is unbounded if `None`.
+        on_stats : StatsHook | None
+            function called with the cache statistics after each call
+
+        Returns
+        -------
+        Parser[A]
+        """
+
+        def run(s: Stream, pos: int) -> RawResult:
+            if s.memo is not None:
+                return self._parse(s, pos)
+            memo = MemoTable(max_size)
+            memo_stream = s._with_memo(memo)  # pylint: disable=protected-access
+            result = self._parse(memo_stream, pos)
+            if on_stats is not None:
+                on_stats(memo.stats)
+            return result
+
+        return Parser._from_run(run, label=self._label, first=self._first)
+
+    @_recorded
+    def profiled(self: Parser[A], profiler: Profiler) -> Parser[A]:
+        """
+        Profile the parsers reached from this one
+
+        During a call of the returned parser, the calls of every parser it runs
+        are recorded by the profiler, which reports their counts, outcomes and
+        times by label, e.g.::
+
+            >>> profiler = Profiler()
+            >>> grammar.profiled(profiler)(text)
+            >>> print(profiler.report())
+
+        Profiling only slows down the parses being profiled. Compiled parsers are
+        run as the original parsers while profiled, to profile their sub-parsers.
+
+        Parameters
+        ----------
+        profiler : Profiler
+            the profiler recording the calls, over all the calls of the returned
+            parser
+
+        Returns
+        -------
+        Parser[A]
+        """
+        return self._instrumented(profiler)
+
+    @_recorded
+    def traced(self: Parser[A], *hooks: Hook) -> Parser[A]:
+        """
+        Trace the parsers reached from this one
+
+        During a call of the returned parser, the hooks are notified of the calls
+        of every parser it runs: when it starts, succeeds or fails, and returns.
+        The exporters of `dine.trace` write these events to a file as they happen,
+        or keep the last ones in a ring buffer, e.g.::
+
+            >>> events = RingBuffer(1000)
+            >>> grammar.traced(events)(text)
+            >>> events.dump(sys.stdout)
+
+        Tracing only slows down the parses being traced. As when profiled,
+        compiled parsers are run as the original parsers while traced.
+
+        Parameters
+        ----------
+        *hooks : Hook
+            the hooks notified of the parser calls, in order
+
+        Returns
+        -------
+        Parser[A]
+        """
+        if not hooks:
+            raise ValueError("traced needs at least one hook")
+        instrument: Instrument = hooks[0]
+        if len(hooks) > 1:
+            instrument = _Instruments(hooks)
+        return self._instrumented(instrument)
+
+    def parse_incremental(self: Parser[A], text: str) -> IncrementalParse[A]:
+        """
+        Parse a text, keeping the results of every parser to re-parse it once edited
+
+        The result of the parse is the `result` attribute of the returned object,
+        and the edited text is parsed with its `edit` method, e.g.::
+
+            >>> doc = parser.parse_incremental("x = 1;")
+            >>> doc = doc.edit(4, 1, "42")  # parses "x = 42;"
+            >>> doc.result
+
+        Parameters
+        ----------
+        text : str
+            the text to parse
+
+        Returns
+        -------
+        IncrementalParse[A]
+        """
+        return IncrementalParse(self, text)
+
+    @_recorded
     def and_then(self: Parser[A], other: Parser[B]) -> Parser[tuple[A, B]]:
         """Parses A and then B.
 
@@ -69,26 +606,22 @@ class Parser(Generic[A]):
         Parser[Tuple[A, B]]
         """
 
-        def parse(s: Stream) -> ParseResult[tuple[A, B]]:
-            result_a: ParseResult[A] = self(s)
-            match result_a:
-                case ParseFailure():
-                    return result_a
-                case ParseSuccess(loc=loc_a, val=a, rs=rs_a):
-                    result_b: ParseResult[B] = other(rs_a)
-                    match result_b:
-                        case ParseFailure():
-                            return result_b
-                        case ParseSuccess(loc=_, val=b, rs=rs_b):
-                            return ParseSuccess(loc=loc_a, val=(a, b), rs=rs_b)
-            raise InternalError()
+        def run(s: Stream, pos: int) -> RawResult:
+            ok, a, pos = self._parse(s, pos)
+            if not ok:
+                return (ok, a, pos)
+            ok, b, pos = other._parse(s, pos)  # pylint: disable=protected-access
+            if not ok:
+                return (ok, b, pos)
+            return (True, (a, b), pos)
 
-        label = f"{self.label} and then {other.label}"
-        return Parser(parse, label=label)
+        label = Label(self, " and then ", other)
+        return Parser._from_run(run, label=label, first=self._first)
 
     def __and__(self: Parser[A], other: Parser[B]) -> Parser[tuple[A, B]]:
         return self.and_then(other)
 
+    @_recorded
     def or_else(self: Parser[A], other: Parser[B]) -> Parser[A | B]:
         """Create a parser that parses ``A`` or ``B``.
 
@@ -102,22 +635,14 @@ class Parser(Generic[A]):
         Parser[Union[A, B]]
         """
 
-        def parse_fn(s: Stream) -> ParseResult[A | B]:
-            res_a = self(s)
-            match res_a:
-                case ParseSuccess(loc=loc_a, val=a, rs=rs_a):
-                    return ParseSuccess(loc_a, a, rs_a)
-                case ParseFailure():
-                    res_b = other(s)
-                    match res_b:
-                        case ParseSuccess(loc=loc_b, val=b, rs=rs_b):
-                            return ParseSuccess(loc_b, b, rs_b)
-                        case ParseFailure():
-                            return res_b
-            raise InternalError()
+        def run(s: Stream, pos: int) -> RawResult:
+            result = self._parse(s, pos)
+            if result[0] is not False:
+                return result
+            return other._parse(s, pos)  # pylint: disable=protected-access
 
-        label = f"{self.label} or else {other.label}"
-        return Parser(parse_fn, label=label)
+        label = Label(self, " or else ", other)
+        return Parser._from_run(run, label=label, first=_union_first([self, other]))
 
     def __or__(self: Parser[A], other: Parser[B]) -> Parser[A | B]:
         """Create a parser that parses ``A`` or ``B``.
@@ -133,6 +658,39 @@ class Parser(Generic[A]):
         """
         return self.or_else(other)  # type: ignore
 
+    @_recorded
+    def commit(self: Parser[A]) -> Parser[A]:
+        """
+        Parser that cannot be backtracked once it runs
+
+        When the parser fails, its failure is committed: the enclosing ``or_else``
+        and ``choice`` do not try their other alternatives, and the enclosing
+        ``optional`` and repetitions fail instead of parsing fewer values. The
+        whole parse thus fails at once, at the committed failure.
+
+        Committing to the rest of a construct after the prefix identifying it,
+        e.g. a keyword, saves parsing a malformed construct again with every
+        other alternative::
+
+            >>> statement = Parser.choice([
+            ...     Parser.string("if ") & condition.commit(),
+            ...     assignment,
+            ... ])
+
+        Returns
+        -------
+        Parser[A]
+        """
+
+        def run(s: Stream, pos: int) -> RawResult:
+            result = self._parse(s, pos)
+            if result[0] is False:
+                return (None, result[1], result[2])
+            return result
+
+        return Parser._from_run(run, label=self._label, first=self._first)
+
+    @_recorded
     def map(self: Parser[A], f: Callable[[A], B]) -> Parser[B]:
         """
         If the parser parses successfully, pass the result to a function
@@ -148,17 +706,35 @@ class Parser(Generic[A]):
         Parser[B]
         """
 
-        def parse_fn(s: Stream) -> ParseResult[B]:
-            result: ParseResult[A] = self(s)
-            match result:
-                case ParseSuccess(loc=loc, val=val, rs=rs):
-                    return ParseSuccess(loc, f(val), rs)
-                case ParseFailure():
-                    return result
-            raise InternalError()
+        def run(s: Stream, pos: int) -> RawResult:
+            ok, val, pos = self._parse(s, pos)
+            if not ok:
+                return (ok, val, pos)
+            return (True, f(val), pos)
+
+        return Parser._from_run(run, label=self._label, first=self._first)
+
+    @_recorded
+    def decode(
+        self: Parser[Any], encoding: str = "utf-8", errors: str = "strict"
+    ) -> Parser[str]:
+        """
+        Decode the bytes parsed by the parser into text
+
+        Parameters
+        ----------
+        encoding : str
+            the encoding of the bytes
+        errors : str
+            the error handling scheme, as in `bytes.decode`
 
-        return Parser(parse_fn, label=self.label)
+        Returns
+        -------
+        Parser[str]
+        """
+        return self.map(lambda val: str(val, encoding, errors))
 
+    @_recorded
     def bind(self: Parser[A], f: Callable[[A], Parser[B]]) -> Parser[B]:
         """
         This method may be used to put a parser after the current parser, with the
@@ -183,32 +759,16 @@ class Parser(Generic[A]):
             A parser for ``B``.
         """
 
-        label = ""
-
-        def parse_fn(s: Stream) -> ParseResult[B]:
-            nonlocal label
-            result_a = self(s)
-
-            match result_a:
-                case ParseFailure(label=label_a):
-                    label = label_a
-                    return result_a
-                case ParseSuccess(loc=loc_a, val=a, rs=rs_a):
-                    parser_b: Parser[B] = f(a)
-                    result_b = parser_b(rs_a)
-                    match result_b:
-                        case ParseFailure(label=label_b):
-                            label = label_b
-                            return result_b
-                        case ParseSuccess(loc=_, val=b, rs=rs_b):
-                            return ParseSuccess(loc_a, b, rs_b)
-                        case _:  # pragma: no cover
-                            raise InternalError()
-                case _:  # pragma: no cover
-                    raise InternalError()
-
-        return Parser(parse_fn, label=label)
+        def run(s: Stream, pos: int) -> RawResult:
+            ok, a, pos = self._parse(s, pos)
+            if not ok:
+                return (ok, a, pos)
+            parser_b: Parser[B] = f(a)
+            return parser_b._parse(s, pos)  # pylint: disable=protected-access
+
+        return Parser._from_run(run, label=None, first=self._first)
 
+    @_recorded
     def apply(self: Parser[A], f_parser: Parser[Callable[[A], B]]) -> Parser[B]:
         """
         Functional apply function for parsers.
@@ -230,6 +790,7 @@ class Parser(Generic[A]):
 
         return f_parser.and_then(self).map(lambda fn_and_a: fn_and_a[0](fn_and_a[1]))
 
+    @_recorded
     def optional(self: Parser[A], default: A | None = None) -> Parser[list[A]]:
         """
         Parse 0 or 1 time.
@@ -240,33 +801,30 @@ class Parser(Generic[A]):
             Parser that parses A 0 or 1 time.
         """
 
-        def parse_fn(s: Stream) -> ParseResult[list[A]]:
-            result = self(s)
-            match result:
-                case ParseSuccess(loc=loc, val=val, rs=rs):
-                    return ParseSuccess(loc=loc, val=[val], rs=rs)
-                case ParseFailure(loc=loc):
-                    return ParseSuccess(
-                        loc, [default] if default is not None else [], s
-                    )
-                case _:  # pragma: no cover
-                    raise InternalError()
-
-        return Parser(parse_fn, label=f"optional {self.label}")
-
-    def _many0_recur(self: Parser[A], s: Stream) -> tuple[list, Stream]:
-        first_result = self(s)
-        match first_result:
-            case ParseFailure():
-                return ([], s)
-            case ParseSuccess(val=first_val, rs=first_rs):
-                (  # pylint: disable=unpacking-non-sequence
-                    follow_vals,
-                    rs,
-                ) = self._many0_recur(first_rs)
-                return ([first_val] + list(follow_vals), rs)
-        raise InternalError()
-
+        def run(s: Stream, pos: int) -> RawResult:
+            ok, val, end = self._parse(s, pos)
+            if ok:
+                return (True, [val], end)
+            if ok is None:
+                return (ok, val, end)
+            return (True, [default] if default is not None else [], pos)
+
+        return Parser._from_run(run, label=Label("optional ", self))
+
+    def _many0_loop(self: Parser[A], s: Stream, pos: int) -> RawResult:
+        vals: list[A] = []
+        parse = self._parse
+        while True:
+            ok, val, end = parse(s, pos)
+            # Stop on empty matches instead of looping forever.
+            if not ok or end == pos:
+                if ok is None:
+                    return (ok, val, end)
+                return (True, vals, pos)
+            vals.append(val)
+            pos = end
+
+    @_recorded
     def many0(self) -> Parser[list]:
         """
         Parses 0 or more times
@@ -277,23 +835,12 @@ class Parser(Generic[A]):
             Parser that parses A 0 or more times
         """
 
-        def parse_fn(s: Stream) -> ParseResult[list]:
-            val, rs = self._many0_recur(s)  # pylint: disable=unpacking-non-sequence
-            match s.head():
-                case (_, Location(line=line, col=col)):
-                    return ParseSuccess(Location(line=line, col=col), val, rs)
-                case _:
-                    return ParseFailure(
-                        loc=s.loc[-1],
-                        label=f"zero or more {self.label}",
-                        msg="stream exhausted",
-                    )
-
-        return Parser(
-            parse_fn,
-            label=f"zero or more {self.label}",
-        )
+        def run(s: Stream, pos: int) -> RawResult:
+            return self._many0_loop(s, pos)
 
+        return Parser._from_run(run, label=Label("zero or more ", self))
+
+    @_recorded
     def many1(self) -> Parser[list]:
         """
         Parses 1 or more times
@@ -303,24 +850,60 @@ class Parser(Generic[A]):
         Parser[list]
         """
 
-        def parse_fn(s: Stream) -> ParseResult[list]:
-            first_result = self(s)
-            match first_result:
-                case ParseFailure():
-                    return first_result
-                case ParseSuccess(loc=loc_first, val=first_val, rs=first_rs):
-                    (  # pylint: disable=unpacking-non-sequence
-                        follow_vals,
-                        rs,
-                    ) = self._many0_recur(first_rs)
-                    return ParseSuccess(
-                        loc=loc_first, val=[first_val] + list(follow_vals), rs=rs
-                    )
-                case _:  # pragma: no cover
-                    raise InternalError()
-
-        return Parser(parse_fn, label=f"one or more {self.label}")
+        def run(s: Stream, pos: int) -> RawResult:
+            ok, first_val, pos = self._parse(s, pos)
+            if not ok:
+                return (ok, first_val, pos)
+            result = self._many0_loop(s, pos)
+            if result[0]:
+                result[1].insert(0, first_val)
+            return result
+
+        return Parser._from_run(
+            run, label=Label("one or more ", self), first=self._first
+        )
+
+    def iter_many(
+        self: Parser[A],
+        s: Input,
+        *,
+        sep: Parser | None = None,
+        min_count: int = 0,
+    ) -> ParseIterator[A]:
+        """
+        Parse repeatedly, yielding each value as soon as it is parsed
+
+        Unlike ``many0``, the values are not collected into a list, so a long
+        repetition is parsed in constant memory. On a `ChunkedStream`, the data
+        before the last parsed value is also released from time to time, unless the
+        stream is memoized.
+
+        Once the iteration is over, the `result` attribute of the iterator holds
+        the outcome of the whole repetition: a `ParseSuccess` whose value is the
+        number of values parsed and whose remaining stream follows the last value,
+        or a `ParseFailure` if fewer than `min_count` values were parsed.
+
+        ``list(p.iter_many(s))`` parses the same values as ``p.many0()(s)``,
+        ``p.iter_many(s, min_count=1)`` as ``p.many1()(s)`` and
+        ``p.iter_many(s, sep=sep, min_count=1)`` as ``p.many1_sep_by(sep)(s)``.
+
+        Parameters
+        ----------
+        s : Input
+            the input to parse
+        sep : Parser | None
+            parser for a separator between each pair of values, if any
+        min_count : int
+            the minimum number of values to parse
+
+        Returns
+        -------
+        ParseIterator[A]
+        """
+        stream = _to_stream(s)._with_failures()  # pylint: disable=protected-access
+        return ParseIterator(self, stream, sep, min_count)
 
+    @_recorded
     def many1_sep_by(self: Parser[A], sep_parser: Parser) -> Parser[list[A]]:
         """
         Parses 1 or more times with separator
@@ -329,8 +912,6 @@ class Parser(Generic[A]):
 
         Parameters
         ----------
-        val_parser : Parser[A]
-            parser for the value
         sep_parser : Parser
             parser for the separator
 
@@ -338,17 +919,32 @@ class Parser(Generic[A]):
         -------
         Parser[list[A]]
         """
-        sep_and_val_parser = sep_parser.bind(lambda _: self)
-        follow_parser = sep_and_val_parser.many0()
-        parser = self.bind(
-            lambda first_val: follow_parser.map(
-                lambda follow_vals: [first_val] + follow_vals
-            )
-        )
-        return parser.set_label(
-            f"one or more {self.label} separated by {sep_parser.label}"
+
+        def run(s: Stream, pos: int) -> RawResult:
+            ok, val, pos = self._parse(s, pos)
+            if not ok:
+                return (ok, val, pos)
+            vals = [val]
+            while True:
+                # pylint: disable-next=protected-access
+                ok, val, end = sep_parser._parse(s, pos)
+                if ok:
+                    ok, val, end = self._parse(s, end)
+                if not ok or end == pos:
+                    if ok is None:
+                        return (ok, val, end)
+                    break
+                vals.append(val)
+                pos = end
+            return (True, vals, pos)
+
+        return Parser._from_run(
+            run,
+            label=Label("one or more ", self, " separated by ", sep_parser),
+            first=self._first,
         )
 
+    @_recorded
     def many0_sep_by(self: Parser[A], sep_parser: Parser) -> Parser[list[A]]:
         """
         Parses 0 or more times with separator
@@ -364,12 +960,12 @@ class Parser(Generic[A]):
         -------
         Parser[list[A]]
         """
-        return (
-            self.many1_sep_by(sep_parser)
-            .or_else(self.map(lambda a: [a]))
-            .set_label(f"zero or more {self.label} separated by {sep_parser.label}")
-        )
+        parser = self.many1_sep_by(sep_parser)
+        # pylint: disable-next=protected-access
+        parser._label = Label("zero or more ", self, " separated by ", sep_parser)
+        return parser
 
+    @_recorded
     def preceded_by(self: Parser[A], other: Parser) -> Parser[A]:
         """
         Parses A preceded by something
@@ -385,6 +981,7 @@ class Parser(Generic[A]):
         """
         return (other & self).map(lambda pair: pair[1])
 
+    @_recorded
     def succeeded_by(self: Parser[A], other: Parser) -> Parser[A]:
         """
         Parses A preceded by something
@@ -400,6 +997,7 @@ class Parser(Generic[A]):
         """
         return (self & other).map(lambda pair: pair[0])
 
+    @_recorded
     def surrounded_by(self: Parser[A], lparser: Parser, rparser: Parser) -> Parser[A]:
         """
         Parses A surrounded by two other things
@@ -418,49 +1016,89 @@ class Parser(Generic[A]):
         """
         return self.preceded_by(lparser).succeeded_by(rparser)
 
+    @_recorded
     def times(self: Parser[A], n: int) -> Parser[list[A]]:
         """
         Parses A exactly `n` times
 
+        The parser stops after the `n`-th occurrence, even if more follow.
+
         Parameters
         ----------
         n : int
-            return
+            the number of occurrences
 
         Returns
         -------
-        Parser[A]
+        Parser[list[A]]
+        """
+        parser = self.repeat(n, n)
+        # pylint: disable-next=protected-access
+        parser._label = Label("(", self, f") {n} times")
+        return parser
+
+    @_recorded
+    def repeat(
+        self: Parser[A], min_count: int, max_count: int | None = None
+    ) -> Parser[list[A]]:
+        """
+        Parses A between `min_count` and `max_count` times
+
+        The parser stops after the `max_count`-th occurrence, even if more follow.
+        Once `min_count` occurrences are parsed, it also stops on an empty match.
+
+        Parameters
+        ----------
+        min_count : int
+            the minimum number of occurrences
+        max_count : int | None
+            the maximum number of occurrences, unbounded by default
+
+        Returns
+        -------
+        Parser[list[A]]
         """
-        label = f"({self.label}) {n} times"
-
-        def parse_fn(s: Stream) -> ParseResult[list]:
-            parse_many1_result = self.many1()(s)
-            match parse_many1_result:
-                case ParseSuccess(loc=loc, val=la, rs=rs):
-                    if len(la) == n:
-                        return ParseSuccess(loc=loc, val=la, rs=rs)
-                    else:
-                        head = s.head()
-                        if head is not None:
-                            _, loc = head
-                            return ParseFailure(loc=loc, label=self.label, msg="")
-                        else:
-                            raise InternalError()
-                case ParseFailure():
-                    failure: ParseFailure = parse_many1_result
-                    return ParseFailure(loc=failure.loc, label=label, msg=failure.msg)
-                case _:  # pragma: no cover
-                    raise InternalError()
-
-        return Parser(parse_fn, label=label)
+        if min_count < 0 or max_count is not None and max_count < min_count:
+            raise ValueError(f"invalid repetition count {min_count}..{max_count}")
+        limit = sys.maxsize if max_count is None else max_count
+
+        def run(s: Stream, pos: int) -> RawResult:
+            vals: list[A] = []
+            parse = self._parse
+            append = vals.append
+            for _ in range(min_count):
+                ok, val, pos = parse(s, pos)
+                if not ok:
+                    return (ok, val, pos)
+                append(val)
+            for _ in range(limit - min_count):
+                ok, val, end = parse(s, pos)
+                # Stop on empty matches instead of looping forever.
+                if not ok or end == pos:
+                    if ok is None:
+                        return (ok, val, end)
+                    break
+                append(val)
+                pos = end
+            return (True, vals, pos)
+
+        if max_count is None:
+            label = Label(f"at least {min_count} ", self)
+        else:
+            label = Label(f"between {min_count} and {max_count} ", self)
+        first = self._first if min_count > 0 else None
+        return Parser._from_run(run, label=label, first=first)
 
     @staticmethod
+    @_recorded
     def satisfy(
         predicate: Callable[[str], bool], *, label: str = "satisfy"
     ) -> Parser[str]:
         """
         Parser that parses the next character if the predicate is `True`
 
+        On a byte stream, the predicate is given the next byte as an integer.
+
         Parameters
         ----------
         predicate : Callable[[str], bool]
@@ -473,28 +1111,171 @@ class Parser(Generic[A]):
         Parser[str]
         """
 
-        def parse_fn(s: Stream) -> ParseResult[str]:
-            head = s.head()
-            if head is not None:
-                c, loc = head
-                if predicate(c):
-                    return ParseSuccess(loc=loc, val=c, rs=s.tail())
-                else:
-                    return ParseFailure(
-                        loc=loc,
-                        label=label,
-                        msg=f"unexpected character '{c}'",
-                    )
-            else:
-                return ParseFailure(
-                    loc=s.loc[-1],
-                    label=label,
-                    msg="input stream exhausted",
-                )
+        def run(s: Stream, pos: int) -> RawResult:
+            if (pos < len(s.buf) or s.fetch(pos + 1)) and predicate(s.buf[pos]):
+                return (True, s.buf[pos], pos + 1)
+            return _failed(s, pos, parser)
+
+        parser = Parser._from_run(run, label=label)
+        return parser
+
+    @staticmethod
+    @_recorded
+    def char_class(chars: CharClass | str, *, label: str | None = None) -> Parser[str]:
+        """
+        Parser that parses a character of a character class
+
+        Parameters
+        ----------
+        chars : CharClass | str
+            the character class, or a string of the characters of the class
+        label : str | None
+            the label of the parser
+
+        Returns
+        -------
+        Parser[str]
+        """
+        if isinstance(chars, str):
+            chars = CharClass.of(chars)
+        label = label or repr(chars)
+        members = chars.members
+        negated = chars.negated
+
+        def run(s: Stream, pos: int) -> RawResult:
+            if pos < len(s.buf) or s.fetch(pos + 1):
+                c = s.buf[pos]
+                if (c in members) is not negated:
+                    return (True, c, pos + 1)
+            return _failed(s, pos, parser)
+
+        first = None if negated else members
+        parser = Parser._from_run(run, label=label, first=first)
+        return parser
+
+    @staticmethod
+    @_recorded
+    def take_while(
+        chars: CharClass | str, *, min_count: int = 0, label: str | None = None
+    ) -> Parser[str]:
+        """
+        Parser that parses the longest run of characters of a character class
+
+        The run is scanned in a single call instead of one parser call per
+        character, which makes this much faster than
+        ``Parser.char_class(chars).many0().map("".join)``.
+
+        Parameters
+        ----------
+        chars : CharClass | str
+            the character class, or a string of the characters of the class
+        min_count : int
+            the minimum number of characters to parse
+        label : str | None
+            the label of the parser
+
+        Returns
+        -------
+        Parser[str]
+        """
+        char_class = CharClass.of(chars) if isinstance(chars, str) else chars
+        label = label or f"run of {char_class!r}"
+        span = char_class.span
+
+        def run(s: Stream, pos: int) -> RawResult:
+            end = span(s.buf, pos)
+            while end == len(s.buf) and s.fetch(end + 1):
+                end = span(s.buf, end)
+            if end - pos >= min_count:
+                return (True, s.buf[pos:end], end)
+            return _failed(s, end, parser)
+
+        first = None if char_class.negated or min_count <= 0 else char_class.members
+        parser = Parser._from_run(run, label=label, first=first)
+        return parser
+
+    @staticmethod
+    @_recorded
+    def regex(
+        pattern: str | bytes | re.Pattern,
+        flags: int = 0,
+        *,
+        group: int | str | tuple[int | str, ...] = 0,
+        label: str | None = None,
+    ) -> Parser:
+        """
+        Parser that parses the match of a regular expression
+
+        The expression is matched at the head of the stream, and the whole match is
+        consumed in one step.
+
+        On streams reading their input incrementally, a failure is only final once
+        the expression fails on the rest of the input, which is read for it.
+        Expressions made of single characters (e.g. literals or classes), with at
+        most one repetition of a single character at their end, fail within their
+        minimum width instead.
+
+        Parameters
+        ----------
+        pattern : str | bytes | re.Pattern
+            the regular expression, or an already compiled one. Byte streams are
+            matched with bytes patterns.
+        flags : int
+            flags used to compile `pattern` if it is a string
+        group : int | str | tuple[int | str, ...]
+            the group to return, the whole match by default. If a tuple of groups is
+            given, a tuple of their values is returned.
+        label : str | None
+            the label of the parser
 
-        return Parser(parse_fn, label=label)
+        Returns
+        -------
+        Parser
+        """
+        # Matched against text or bytes buffers, depending on the pattern.
+        compiled: re.Pattern = re.compile(pattern, flags)
+        if label is None:
+            source = compiled.pattern
+            label = (
+                f"regex {source}" if isinstance(source, str) else f"regex {source!r}"
+            )
+        # The group of the value, or the groups of a tuple value.
+        index = 0 if isinstance(group, tuple) else group
+        groups = group if isinstance(group, tuple) else None
+        width = _regex_width(compiled)
+
+        def run(s: Stream, pos: int) -> RawResult:
+            if len(s.buf) < pos + REGEX_LOOKAHEAD:
+                s.fetch(pos + REGEX_LOOKAHEAD)
+            m = compiled.match(s.buf, pos)
+            # A match reaching the end of the buffered data may go on further, and
+            # a failure may need more data to match. The buffer at least doubles on
+            # each fetch, so the input is matched again a logarithmic number of
+            # times.
+            while (
+                m.end() == len(s.buf)
+                if m is not None
+                else width is None or pos + width > len(s.buf)
+            ) and s.fetch(len(s.buf) + 1):
+                m = compiled.match(s.buf, pos)
+            memo = s.memo
+            if memo is not None and (width is None or m is None):
+                # Record how far the match looked, beyond where it stopped, for
+                # incremental re-parses (see `Parser._memo_parse`).
+                reach = len(s.buf) + 1 if width is None else pos + width
+                if reach > memo.reach:
+                    memo.reach = reach
+            if m is not None:
+                if groups is None:
+                    return (True, m.group(index), m.end())
+                return (True, tuple(m.group(g) for g in groups), m.end())
+            return _failed(s, pos, parser)
+
+        parser = Parser._from_run(run, label=label)
+        return parser
 
     @staticmethod
+    @_recorded
     def char(char: str) -> Parser[str]:
         """
         Parser for a single character
@@ -508,9 +1289,12 @@ class Parser(Generic[A]):
         -------
         Parser[str]
         """
-        return Parser.satisfy(lambda c: c == char, label=f"char '{char}'")
+        if len(char) != 1:
+            raise ValueError(f"expected a single character, got {char!r}")
+        return Parser.char_class(CharClass.of(char), label=f"char '{char}'")
 
     @staticmethod
+    @_recorded
     def until(predicate: Callable[[str], bool], label: str = "until") -> Parser[str]:
         """
         Parser that parses until a predicate is true
@@ -526,14 +1310,21 @@ class Parser(Generic[A]):
         -------
         Parser[str]
         """
-        return (
-            Parser.satisfy(lambda c: not predicate(c))
-            .many0()
-            .map("".join)
-            .set_label(label)
-        )
+
+        def run(s: Stream, pos: int) -> RawResult:
+            end = pos
+            while end < len(s.buf) or s.fetch(end + 1):
+                buf = s.buf
+                while end < len(buf) and not predicate(buf[end]):
+                    end += 1
+                if end < len(buf):
+                    break
+            return (True, s.buf[pos:end], end)
+
+        return Parser._from_run(run, label=label)
 
     @staticmethod
+    @_recorded
     def sequence(parsers: Iterable[Parser]) -> Parser[list]:
         """
         Parser for a sequence of things
@@ -547,66 +1338,247 @@ class Parser(Generic[A]):
         -------
         Parser[list]
         """
+        parser_list = list(parsers)
+
+        def run(s: Stream, pos: int) -> RawResult:
+            vals = []
+            for parser in parser_list:
+                ok, val, pos = parser._parse(s, pos)  # pylint: disable=protected-access
+                if not ok:
+                    return (ok, val, pos)
+                vals.append(val)
+            return (True, vals, pos)
+
+        # pylint: disable-next=protected-access
+        first = parser_list[0]._first if parser_list else None
+        label = Label("sequence of (", *_joined(parser_list), ")")
+        return Parser._from_run(run, label=label, first=first)
+
+    @staticmethod
+    @_recorded
+    def choice(parsers: Iterable[Parser]) -> Parser:
+        """
+        Parser that parses the first matching alternative
+
+        Parser for a list of alternatives. The first matching alternative is parsed.
+        If the first set of every alternative is known (e.g. they are all built from
+        characters and string literals), the alternatives that cannot match are
+        skipped by looking up the next character in a table.
 
-        def chain_list_parsers(
-            seq_a_parser: Parser[list],
-            seq_b_parser: Parser[list],
-        ) -> Parser[list]:
-            """
-            Chain two iterable parsers together to form a single iterable parser
-            """
-            parser = seq_a_parser.and_then(seq_b_parser)
-
-            def parse(s: Stream) -> ParseResult[list]:
-                result = parser(s)
-                match result:
-                    case ParseSuccess(loc=loc, val=(seq_a, seq_b), rs=rs):
-                        return ParseSuccess(
-                            loc=loc,
-                            val=list(chain(seq_a, seq_b)),
-                            rs=rs,
-                        )
-                    case ParseFailure():
+        Parameters
+        ----------
+        parsers : Iterable[Parser]
+            A sequence of parsers for the alternatives
+
+        Returns
+        -------
+        Parser
+        """
+        parser_list = list(parsers)
+        if not parser_list:
+            raise ValueError("choice needs at least one alternative")
+        label = Label("choice of (", *_joined(parser_list), ")")
+        first = _union_first(parser_list)
+
+        if first is None:
+
+            def run(s: Stream, pos: int) -> RawResult:
+                for parser in parser_list:
+                    result = parser._parse(s, pos)  # pylint: disable=protected-access
+                    if result[0] is not False:
                         return result
-                    case _:  # pragma: no cover
-                        raise InternalError()
+                return result
+
+            return Parser._from_run(run, label=label)
+
+        # Characters, or byte values on byte streams, to the alternatives starting
+        # with them.
+        table: dict[str | int, list[Parser]] = {}
+        for parser in parser_list:
+            for c in parser._first or ():  # pylint: disable=protected-access
+                table.setdefault(c, []).append(parser)
+
+        def dispatch(s: Stream, pos: int) -> RawResult:
+            candidates = None
+            if pos < len(s.buf) or s.fetch(pos + 1):
+                candidates = table.get(s.buf[pos])
+            if candidates is None:
+                # None of the alternatives can start here.
+                failures = s.failures
+                if pos >= failures.pos:
+                    for parser in parser_list:
+                        failures.expect(pos, parser)
+                return (False, None, pos)
+            for parser in candidates:
+                result = parser._parse(s, pos)  # pylint: disable=protected-access
+                if result[0] is not False:
+                    return result
+            return result
+
+        return Parser._from_run(dispatch, label=label, first=first)
+
+    @staticmethod
+    @_recorded
+    def expression(operand: Parser[A], operators: Iterable[Operator]) -> Parser[A]:
+        """
+        Parser for expressions of operands and operators with precedences
+
+        Expressions are parsed in one pass by precedence climbing, keeping the
+        operators waiting for their right operand on a stack instead of recursing
+        into one parser per precedence level. Long chains of operators are thus
+        parsed in linear time, with no extra recursion.
+
+        As with `many0`, an operator that is not followed by an operand is not
+        parsed, and the expression ends before it.
 
-            return Parser(parse, label=f"{seq_a_parser}, {seq_b_parser}")
+        Parameters
+        ----------
+        operand : Parser[A]
+            parser for the operands, e.g. numbers and parenthesized expressions
+        operators : Iterable[Operator]
+            the operators, tried in order when several match at the same place
 
-        list_singleton_parsers: Iterable[Parser] = map(
-            lambda parser: parser.map(lambda obj: [obj]), parsers
+        Returns
+        -------
+        Parser[A]
+            parser for an expression, whose value is built by the functions of the
+            operators
+        """
+        operator_list = list(operators)
+        for op in operator_list:
+            if op.assoc not in ("left", "right", "prefix"):
+                raise ValueError(f"invalid associativity {op.assoc!r}")
+
+        # An operator on the stack is applied before the next operator if its right
+        # binding power is at least the left binding power of the next one.
+        OpEntry = tuple[int, int, Callable, bool]
+
+        def lookup(ops: list[Operator]) -> Callable[[Stream, int], tuple] | None:
+            """Function matching one of the operators at an offset."""
+            if not ops:
+                return None
+            entries: list[tuple[Parser, OpEntry]] = [
+                (
+                    op.parser,
+                    (
+                        2 * op.precedence + (op.assoc == "right"),
+                        2 * op.precedence + (op.assoc == "prefix"),
+                        op.fn,
+                        op.assoc == "prefix",
+                    ),
+                )
+                for op in ops
+            ]
+            # As in `choice`, operators are looked up by their first character.
+            table: dict[str | int, list[tuple[Parser, OpEntry]]] | None = None
+            if _union_first([parser for parser, _ in entries]) is not None:
+                table = {}
+                for parser, entry in entries:
+                    for c in parser._first or ():  # pylint: disable=protected-access
+                        table.setdefault(c, []).append((parser, entry))
+
+            def match(s: Stream, pos: int) -> tuple:
+                candidates = entries
+                if table is not None:
+                    if pos >= len(s.buf) and not s.fetch(pos + 1):
+                        return (None, pos)
+                    candidates = table.get(s.buf[pos], [])
+                for parser, entry in candidates:
+                    # pylint: disable-next=protected-access
+                    ok, _, end = parser._parse(s, pos)
+                    if ok:
+                        return (entry, end)
+                return (None, pos)
+
+            return match
+
+        binary = lookup([op for op in operator_list if op.assoc != "prefix"])
+        prefix = lookup([op for op in operator_list if op.assoc == "prefix"])
+
+        def run(s: Stream, pos: int) -> RawResult:
+            vals: list = []
+            # Operators waiting for their right operand, as (right power, function,
+            # is prefix) tuples.
+            stack: list[tuple[int, Callable, bool]] = []
+            mark = 0
+            end = pos
+            while True:
+                while prefix is not None:
+                    op, prefix_end = prefix(s, end)
+                    if op is None or prefix_end == end:
+                        break
+                    stack.append(op[1:])
+                    end = prefix_end
+                # pylint: disable-next=protected-access
+                ok, val, end = operand._parse(s, end)
+                # Stop on empty matches instead of looping forever.
+                if not ok or vals and end == pos:
+                    if not vals or ok is None:
+                        return (ok, val, end)
+                    # Backtrack before the operator missing its operand.
+                    del stack[mark:]
+                    break
+                pos = end
+                if binary is None:
+                    vals.append(val)
+                    break
+                op, end = binary(s, pos)
+                if op is None:
+                    vals.append(val)
+                    break
+                left_power = op[0]
+                while stack and stack[-1][0] >= left_power:
+                    _, fn, unary = stack.pop()
+                    val = fn(val) if unary else fn(vals.pop(), val)
+                vals.append(val)
+                mark = len(stack)
+                stack.append(op[1:])
+            val = vals.pop()
+            while stack:
+                _, fn, unary = stack.pop()
+                val = fn(val) if unary else fn(vals.pop(), val)
+            return (True, val, pos)
+
+        first = _union_first(
+            [operand] + [op.parser for op in operator_list if op.assoc == "prefix"]
         )
-        parser: Parser[list] = reduce(
-            chain_list_parsers,
-            list_singleton_parsers,
+        return Parser._from_run(
+            run, label=Label("expression of ", operand), first=first
         )
-        return parser.set_label(f"sequence of ({parser.label})")
 
     @staticmethod
-    def choice(parsers: Iterable[Parser]) -> Parser:
+    @_recorded
+    def forward(label: str | None = None) -> Parser:
         """
-        Parser that parses the first matching alternative
+        Placeholder for a parser defined later with `define`
 
-        Parser for a list of alternatives. The first matching alternative is parsed.
+        Forward parsers are used to write recursive grammars, whose parsers are
+        then built once and reused by every parse.
+
+        >>> value = Parser.forward()
+        >>> array = value.many1_sep_by(Parser.char(",")).surrounded_by(
+        ...     Parser.char("["), Parser.char("]")
+        ... )
+        >>> value.define(array | Parser.digit())
 
         Parameters
         ----------
-        parsers : Iterable[Parser]
-            A sequence of parsers for the alternatives
+        label : str | None
+            label of the parser, the label of its definition by default
 
         Returns
         -------
         Parser
         """
 
-        def chain_parsers(p_a: Parser, p_b: Parser) -> Parser:
-            return p_a.or_else(p_b).set_label(f"{p_a.label}, {p_b.label}")
+        def run(s: Stream, pos: int) -> RawResult:
+            raise ParseError(f"forward parser {parser.label!r} is not defined")
 
-        parser = reduce(chain_parsers, parsers)
-        parser.set_label(f"choice of ({parser.label})")
+        parser: Parser = Parser._from_run(run, label=label)
         return parser
 
     @staticmethod
+    @_recorded
     def just(a: A) -> Parser[A]:
         """
         A parser that always parses successfully and returns the desired value without
@@ -624,36 +1596,60 @@ class Parser(Generic[A]):
             stream unchanged
         """
 
-        def parse_fn(s: Stream):
-            head = s.head()
-            if head is not None:
-                _, loc = head
-            else:
-                loc = s.loc[-1] if len(s.loc) > 0 else Location(0, 0)
-            return ParseSuccess(loc=loc, val=a, rs=s)
+        def run(_s: Stream, pos: int) -> RawResult:
+            return (True, a, pos)
 
-        return Parser(parse_fn, label=f"{a}")
+        return Parser._from_run(run, label=f"{a}")
 
     @staticmethod
-    def string(literal: str) -> Parser[str]:
+    @_recorded
+    def string(literal: str | bytes) -> Parser:
         """
         Parser that parses a string literal
 
         Parameters
         ----------
-        literal : str
-            The string literal
+        literal : str | bytes
+            The string literal, or a bytes literal to parse byte streams
 
         Returns
         -------
-        Parser[str]
+        Parser
         """
-        char_parsers = map(Parser.char, literal)
-        return (
-            Parser.sequence(char_parsers).map("".join).set_label(f"literal {literal}")
+        label = (
+            f"literal {literal}" if isinstance(literal, str) else f"literal {literal!r}"
         )
+        size = len(literal)
+        # The literal as text, for text streams.
+        prefix = literal if isinstance(literal, str) else None
+
+        def run(s: Stream, pos: int) -> RawResult:
+            buf = s.buf
+            # Bytes-like buffers (e.g. `mmap`) lack `startswith`, so the literal is
+            # compared with a slice of its size.
+            if (
+                buf.startswith(prefix, pos)
+                if prefix is not None
+                else buf[pos : pos + size] == literal
+            ):
+                return (True, literal, pos + size)
+            if len(buf) < pos + size:
+                if s.fetch(pos + size):
+                    return run(s, pos)
+                # The stream got all the data left, though less than the literal.
+                buf = s.buf
+            # Fail at the first mismatching character, as a chain of `char` would.
+            end = pos
+            while end < len(buf) and buf[end] == literal[end - pos]:
+                end += 1
+            return _failed(s, end, parser)
+
+        first = frozenset((literal[0],)) if literal else None
+        parser = Parser._from_run(run, label=label, first=first)
+        return parser
 
     @staticmethod
+    @_recorded
     def digit() -> Parser[str]:
         """
         Parser that parses a digit
@@ -662,9 +1658,10 @@ class Parser(Generic[A]):
         -------
         Parser[str]
         """
-        return Parser.satisfy(lambda c: c in string.digits).set_label("digit")
+        return Parser.char_class(DIGITS, label="digit")
 
     @staticmethod
+    @_recorded
     def digit_nonzero() -> Parser[str]:
         """
         Parser that parses a nonzero digit
@@ -673,11 +1670,10 @@ class Parser(Generic[A]):
         -------
         Parser[str]
         """
-        return Parser.satisfy(lambda c: c in string.digits and c != "0").set_label(
-            "digit_nonzero"
-        )
+        return Parser.char_class(DIGITS_NONZERO, label="digit_nonzero")
 
     @staticmethod
+    @_recorded
     def ascii_lowercase() -> Parser[str]:
         """
         Parser that parses a lowercase ASCII character
@@ -686,11 +1682,10 @@ class Parser(Generic[A]):
         -------
         Parser[str]
         """
-        return Parser.satisfy(lambda c: c in string.ascii_lowercase).set_label(
-            "ascii_lowercase"
-        )
+        return Parser.char_class(ASCII_LOWERCASE, label="ascii_lowercase")
 
     @staticmethod
+    @_recorded
     def ascii_uppercase() -> Parser[str]:
         """
         Parser that parses a lowercase ASCII character
@@ -699,11 +1694,10 @@ class Parser(Generic[A]):
         -------
         Parser[str]
         """
-        return Parser.satisfy(lambda c: c in string.ascii_uppercase).set_label(
-            "ascii_uppercase"
-        )
+        return Parser.char_class(ASCII_UPPERCASE, label="ascii_uppercase")
 
     @staticmethod
+    @_recorded
     def ascii() -> Parser[str]:
         """
         Parser that parses an ASCII character
@@ -712,8 +1706,68 @@ class Parser(Generic[A]):
         -------
         Parser[str]
         """
-        return (
-            Parser.ascii_lowercase()
-            .or_else(Parser.ascii_uppercase())
-            .set_label("ascii")
-        )
+        return Parser.char_class(ASCII_LETTERS, label="ascii")
+
+
+class ParseIterator(Generic[A]):
+    """Iterator over the values parsed by `Parser.iter_many`."""
+
+    def __init__(
+        self, parser: Parser[A], stream: Stream, sep: Parser | None, min_count: int
+    ) -> None:
+        label: Parser | Label = Label(parser, " separated by ", sep) if sep else parser
+        match min_count:
+            case 0:
+                label = Label("zero or more ", label)
+            case 1:
+                label = Label("one or more ", label)
+            case _:
+                label = Label(f"at least {min_count} ", label)
+        self._label = label
+        # Outcome of the repetition, once the iteration is over.
+        self.result: ParseResult[int] | None = None
+        self._values: Iterator[A] = self._parse(parser, stream, sep, min_count)
+
+    @property
+    def label(self) -> str:
+        """The label of the repetition"""
+        return str(Label(self._label))
+
+    def __iter__(self) -> ParseIterator[A]:
+        return self
+
+    def __next__(self) -> A:
+        return next(self._values)
+
+    def _parse(
+        self, parser: Parser[A], s: Stream, sep: Parser | None, min_count: int
+    ) -> Iterator[A]:
+        # pylint: disable=protected-access
+        loc = s.location(s.begin)
+        release = isinstance(s, ChunkedStream) and s.memo is None
+        pos = s.begin
+        count = 0
+        while True:
+            start = pos
+            if sep is not None and count > 0:
+                ok, val, end = sep._parse(s, pos)
+                if ok is False and count < min_count or ok is None:
+                    self.result = _failure(s, end, val, Label(self._label))
+                    return
+                if not ok:
+                    break
+                start = end
+            ok, val, end = parser._parse(s, start)
+            if ok is False and count < min_count or ok is None:
+                self.result = _failure(s, end, val, Label(self._label))
+                return
+            # Stop on empty matches instead of looping forever.
+            if not ok or (end == pos and count >= min_count):
+                break
+            count += 1
+            pos = end
+            if release and pos >= RELEASE_THRESHOLD and 2 * pos > len(s.buf):
+                s = s.at(pos).release()  # type: ignore
+                pos = 0
+            yield val
+        self.result = ParseSuccess(loc, count, s.at(pos))
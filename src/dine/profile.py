@@ -0,0 +1,275 @@
+"""Profiling of the parsers run by a parse."""
+
+from __future__ import annotations
+
+import json
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from dine.parser import Parser, RawResult
+
+# Indices of the counters of a parser in `Profiler._counters`.
+_CALLS, _SUCCESSES, _FAILURES, _BACKTRACKS, _SELF, _CONSUMED = range(6)
+
+
+class ParserStats:  # pylint: disable=too-many-instance-attributes
+    """Statistics of the calls of the parsers with a label."""
+
+    def __init__(self, label: str) -> None:
+        self.label: str = label
+        self.calls: int = 0
+        self.successes: int = 0
+        self.failures: int = 0
+        # Failures after looking at part of the input, whose work is thrown away.
+        self.backtracks: int = 0
+        # Times in seconds, with and without the time spent in sub-parsers.
+        self.cumulative_time: float = 0.0
+        self.self_time: float = 0.0
+        # Number of characters parsed by the successful calls.
+        self.consumed: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        The statistics as a dictionary
+
+        Returns
+        -------
+        dict[str, Any]
+        """
+        return {
+            "label": self.label,
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "backtracks": self.backtracks,
+            "cumulative_time": self.cumulative_time,
+            "self_time": self.self_time,
+            "consumed": self.consumed,
+        }
+
+    def __repr__(self):
+        return (
+            f"ParserStats(label={self.label!r},calls={self.calls},"
+            f"successes={self.successes},failures={self.failures},"
+            f"backtracks={self.backtracks},cumulative_time={self.cumulative_time},"
+            f"self_time={self.self_time},consumed={self.consumed})"
+        )
+
+
+class Profiler:
+    """
+    Profile of the parsers run by parses, see `Parser.profiled`.
+
+    For each parser, the profiler counts its calls, successes, failures and
+    backtracks (failures after looking at part of the input), the characters
+    consumed by its successes, and its cumulative time (including its
+    sub-parsers) and self time (excluding them). The times include the overhead
+    of profiling.
+
+    The statistics are reported by label, merging the parsers with the same
+    label, and by stack of parsers in the collapsed stack format of flame graph
+    tools. The time of parsers called within a parser with the same label, e.g.
+    recursively, is only counted once in the cumulative time of the label.
+
+    A profiler is not thread-safe: it must not record several parses at once.
+    """
+
+    def __init__(self) -> None:
+        self._counters: dict[Parser, list[int]] = {}
+        # Calls currently running, as [parser, node, time in sub-parsers, start
+        # time] lists.
+        self._frames: list[list] = []
+        # Tree of the stacks of parsers, whose nodes are [children by parser, self
+        # time] lists.
+        self._root: list = [{}, 0]
+
+    def enter(self, parser: Parser, _pos: int) -> None:
+        """
+        Record the start of a parser call, see `Instrument`
+
+        Parameters
+        ----------
+        parser : Parser
+            the parser called
+        _pos : int
+            offset where the parser starts, unused
+        """
+        frames = self._frames
+        children = (frames[-1][1] if frames else self._root)[0]
+        node = children.get(parser)
+        if node is None:
+            node = children[parser] = [{}, 0]
+        frames.append([parser, node, 0, perf_counter_ns()])
+
+    def exit(self, parser: Parser, pos: int, result: RawResult | None) -> None:
+        """
+        Record the end of a parser call, see `Instrument`
+
+        Parameters
+        ----------
+        parser : Parser
+            the parser called
+        pos : int
+            offset where the parser started
+        result : RawResult | None
+            the result of the parser, or `None` if it raised an exception
+        """
+        stop = perf_counter_ns()
+        frames = self._frames
+        _, node, inner, start = frames.pop()
+        elapsed = stop - start
+        if frames:
+            frames[-1][2] += elapsed
+        node[1] += elapsed - inner
+        counters = self._counters.get(parser)
+        if counters is None:
+            counters = self._counters[parser] = [0] * 6
+        counters[_CALLS] += 1
+        counters[_SELF] += elapsed - inner
+        if result is not None:
+            ok, _, end = result
+            if ok:
+                counters[_SUCCESSES] += 1
+                counters[_CONSUMED] += end - pos
+            else:
+                counters[_FAILURES] += 1
+                if end > pos:
+                    counters[_BACKTRACKS] += 1
+
+    def stats(self) -> list[ParserStats]:
+        """
+        Statistics of the parsers by label
+
+        Returns
+        -------
+        list[ParserStats]
+            the statistics, by decreasing self time
+        """
+        labels = {parser: parser.label for parser in self._counters}
+        by_label: dict[str, ParserStats] = {}
+        for parser, counters in self._counters.items():
+            label = labels[parser]
+            stats = by_label.get(label)
+            if stats is None:
+                stats = by_label[label] = ParserStats(label)
+            stats.calls += counters[_CALLS]
+            stats.successes += counters[_SUCCESSES]
+            stats.failures += counters[_FAILURES]
+            stats.backtracks += counters[_BACKTRACKS]
+            stats.self_time += counters[_SELF] / 1e9
+            stats.consumed += counters[_CONSUMED]
+        for label, time in self._cumulative_times(labels).items():
+            by_label[label].cumulative_time = time / 1e9
+        return sorted(by_label.values(), key=lambda stats: -stats.self_time)
+
+    def _cumulative_times(self, labels: dict[Parser, str]) -> dict[str, int]:
+        """Cumulative times by label, from the tree of the stacks of parsers."""
+        cumulative: dict[str, int] = {}
+        # Number of nodes with each label in the path to the current node.
+        running: dict[str, int] = {}
+        # Path to the current node, as [node, label, total time, children left]
+        # lists. As in `collapsed`, the tree is walked without recursing.
+        path: list[list] = [[self._root, "", 0, iter(self._root[0].items())]]
+        while path:
+            frame = path[-1]
+            child = next(frame[3], None)
+            if child is not None:
+                parser, node = child
+                label = labels[parser]
+                running[label] = running.get(label, 0) + 1
+                path.append([node, label, node[1], iter(node[0].items())])
+                continue
+            path.pop()
+            if path:
+                _, label, total, _ = frame
+                path[-1][2] += total
+                running[label] -= 1
+                if not running[label]:
+                    cumulative[label] = cumulative.get(label, 0) + total
+        return cumulative
+
+    def report(self, limit: int | None = None) -> str:
+        """
+        Table of the statistics of the parsers by label, by decreasing self time
+
+        Parameters
+        ----------
+        limit : int | None
+            maximum number of labels reported, all of them if `None`
+
+        Returns
+        -------
+        str
+        """
+        lines = [
+            f"{'calls':>10} {'successes':>10} {'failures':>10} {'backtracks':>10}"
+            f" {'cumulative':>12} {'self':>12} {'consumed':>10}  label"
+        ]
+        for stats in self.stats()[:limit]:
+            lines.append(
+                f"{stats.calls:>10} {stats.successes:>10} {stats.failures:>10}"
+                f" {stats.backtracks:>10} {stats.cumulative_time:>12.6f}"
+                f" {stats.self_time:>12.6f} {stats.consumed:>10}"
+                f"  {_printable(stats.label)}"
+            )
+        return "\n".join(lines)
+
+    def to_json(self, indent: int | None = None) -> str:
+        """
+        The statistics of the parsers by label as JSON
+
+        Parameters
+        ----------
+        indent : int | None
+            indentation of the JSON document, as in `json.dumps`
+
+        Returns
+        -------
+        str
+            a JSON list of objects with the attributes of `ParserStats`
+        """
+        return json.dumps([stats.as_dict() for stats in self.stats()], indent=indent)
+
+    def collapsed(self) -> str:
+        """
+        Self times of the stacks of parsers, in the collapsed stack format
+
+        Each line holds the labels of a stack of parsers, from the outermost one,
+        separated by ``;``, and the self time of the innermost one in the stack,
+        in microseconds. Flame graph tools (e.g. ``flamegraph.pl`` or speedscope)
+        read this format.
+
+        Returns
+        -------
+        str
+        """
+        labels: dict[Parser, str] = {}
+        lines = []
+        # The tree is walked with a stack rather than recursively, since recursive
+        # grammars may be nested deeper than the recursion limit.
+        todo: list[tuple[list, list[str]]] = [(self._root, [])]
+        while todo:
+            node, path = todo.pop()
+            for parser, child in node[0].items():
+                label = labels.get(parser)
+                if label is None:
+                    label = labels[parser] = _printable(parser.label, ";")
+                child_path = path + [label]
+                if child[1] >= 1000:
+                    lines.append(f"{';'.join(child_path)} {child[1] // 1000}")
+                todo.append((child, child_path))
+        return "\n".join(sorted(lines))
+
+
+def _printable(label: str, special: str = "") -> str:
+    """A label with its unprintable characters, and `special` ones, escaped."""
+    out = []
+    for c in label:
+        if not c.isprintable():
+            out.append(repr(c)[1:-1])
+        elif c in special:
+            out.append(f"\\x{ord(c):02x}")
+        else:
+            out.append(c)
+    return "".join(out)
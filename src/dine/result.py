@@ -1,5 +1,6 @@
-from typing import Generic, TypeVar
+from typing import Any, Generic, Iterable, TypeVar
 
+from dine.label import Label
 from dine.stream import Location, Stream
 
 A = TypeVar("A")
@@ -10,6 +11,8 @@ class ParseResult(Generic[A]):
     Base class for parse result
     """
 
+    __slots__ = ("loc",)
+
     def __init__(self, loc: Location):
         self.loc = loc
 
@@ -19,6 +22,8 @@ class ParseSuccess(ParseResult[A]):
     Result of the parser when it parses successfully
     """
 
+    __slots__ = ("val", "rs")
+
     def __init__(self, loc: Location, val: A, rs: Stream | str):
         super().__init__(loc)
         self.val: A = val
@@ -55,17 +60,41 @@ class ParseFailure(ParseResult):
     Result of the parser when it does not parse successfully
     """
 
-    def __init__(self, loc: Location, label: str, msg: str):
+    __slots__ = ("_label", "msg", "_expected")
+
+    def __init__(
+        self,
+        loc: Location,
+        label: str | Label,
+        msg: str,
+        expected: Iterable[str | Label | Any] = (),
+    ):
         super().__init__(loc)
-        self.label: str = label
+        self._label: str | Label = label
         self.msg: str = msg
+        self._expected: tuple = tuple(expected)
+
+    @property
+    def label(self) -> str:
+        """The label of the parser that failed"""
+        if not isinstance(self._label, str):
+            # Rendered when first read only.
+            self._label = str(self._label)
+        return self._label
+
+    @property
+    def expected(self) -> list[str]:
+        """The labels of the parsers that could have parsed the input at `loc`"""
+        labels = (str(Label(label)) for label in self._expected)
+        return list(dict.fromkeys(labels))
 
     def __repr__(self):
         return (
             "ParseFailure(\n"
             f"    loc={str(self.loc)},\n"
             f"    label={repr(self.label)},\n"
-            f"    msg={repr(self.msg)}))\n"
+            f"    msg={repr(self.msg)},\n"
+            f"    expected={repr(self.expected)}\n"
             ")"
         )
 
@@ -2,6 +2,40 @@
 
 from __future__ import annotations
 
+import codecs
+import mmap
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Protocol,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+
+from dine.label import Label
+
+if TYPE_CHECKING:  # pragma: no cover
+    from dine.memo import MemoTable
+    from dine.parser import Instrument
+
+# Bytes-like buffers a `ByteStream` can parse without copying them.
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+S = TypeVar("S", bound="Stream")
+
+_NEWLINE = re.compile(b"\n")
+
 
 class Location:
     """Location (line and column)."""
@@ -24,23 +58,318 @@ class Location:
         return f"Location(line={self.line},col={self.col})"
 
 
+class LineIndex:
+    """
+    Offsets of the newline characters of a buffer.
+
+    The index behaves like a read-only sequence holding the location of every
+    character of the buffer, but only stores the offsets of the newlines.
+    Locations are computed on demand with a binary search, so the memory used is
+    proportional to the number of lines rather than the number of characters.
+    """
+
+    def __init__(self, buf: str | Buffer = "") -> None:
+        self.size: int = 0
+        self.newlines: array[int] = array("q")
+        # Newlines before `forget`-ed offsets are only counted.
+        self.dropped: int = 0
+        self.last_dropped: int = -1
+        self.extend(buf)
+
+    def extend(self, chunk: str | Buffer) -> None:
+        """
+        Index a chunk of text appended to the buffer
+
+        Parameters
+        ----------
+        chunk : str | Buffer
+            the text, or the bytes, appended to the buffer
+        """
+        base = self.size
+        match chunk:
+            case str():
+                i = chunk.find("\n")
+                while i != -1:
+                    self.newlines.append(base + i)
+                    i = chunk.find("\n", i + 1)
+            case _:
+                # `memoryview` has no `find`, but supports regular expressions.
+                self.newlines.extend(base + m.start() for m in _NEWLINE.finditer(chunk))
+        self.size += len(chunk)
+
+    def forget(self, offset: int) -> None:
+        """
+        Drop the newlines before an offset
+
+        The locations of the characters before `offset` cannot be computed
+        anymore, the locations of the other characters are unchanged.
+
+        Parameters
+        ----------
+        offset : int
+            offset of the first character whose location is still needed
+        """
+        n = bisect_left(self.newlines, offset)
+        if n > 0:
+            self.last_dropped = self.newlines[n - 1]
+            self.dropped += n
+            del self.newlines[:n]
+
+    def location(self, offset: int) -> Location:
+        """
+        Location of the character at a given offset
+
+        Parameters
+        ----------
+        offset : int
+            offset of the character in the buffer
+
+        Returns
+        -------
+        Location
+        """
+        i = bisect_left(self.newlines, offset)
+        line_start = self.newlines[i - 1] if i > 0 else self.last_dropped
+        return Location(self.dropped + i + 1, offset - line_start)
+
+    def offset(self, loc: Location) -> int:
+        """
+        Offset of the character at a given location
+
+        Parameters
+        ----------
+        loc : Location
+            location of the character
+
+        Returns
+        -------
+        int
+        """
+        i = loc.line - 1 - self.dropped
+        line_start = self.newlines[i - 1] if i > 0 else self.last_dropped
+        return line_start + loc.col
+
+    def __len__(self) -> int:
+        # An empty buffer still has the location of its (missing) first character.
+        return max(self.size, 1)
+
+    def __iter__(self) -> Iterator[Location]:
+        return (self.location(i) for i in range(len(self)))
+
+    @overload
+    def __getitem__(self, i: int) -> Location:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[Location]:
+        ...
+
+    def __getitem__(self, i: int | slice) -> Location | list[Location]:
+        match i:
+            case slice():
+                return [self.location(j) for j in range(*i.indices(len(self)))]
+            case _:
+                n = len(self)
+                if i < 0:
+                    i += n
+                if not 0 <= i < n:
+                    raise IndexError("location index out of range")
+                return self.location(i)
+
+
+# Farthest failure of a parser: its offset, and the labels expected there.
+Failure = tuple[int, tuple[Any, ...]]
+
+
+class FarthestFailure:
+    """
+    Farthest offset where a parser failed during a parse, and the labels of the
+    parsers that failed there.
+
+    Primitive parsers record their failures here instead of formatting a message,
+    since most failures are backtracked. The message of a failed parse is only
+    formatted once, from the farthest failure.
+    """
+
+    __slots__ = ("pos", "expected")
+
+    def __init__(self) -> None:
+        self.pos: int = -1
+        # Labels (or parsers) of the expected parsers, ordered and without
+        # duplicates.
+        self.expected: dict[str | Label | Any, None] = {}
+
+    def expect(self, pos: int, label: str | Label | Any) -> None:
+        """
+        Record the failure of a parser
+
+        Parameters
+        ----------
+        pos : int
+            offset of the failure
+        label : str | Label | Any
+            the label of the parser, or the parser itself
+        """
+        if pos > self.pos:
+            self.pos = pos
+            self.expected.clear()
+            self.expected[label] = None
+        elif pos == self.pos:
+            self.expected[label] = None
+
+    def save(self) -> tuple[int, dict]:
+        """Start recording the failures of a parser run, see `restore`."""
+        saved = (self.pos, self.expected)
+        self.pos = -1
+        self.expected = {}
+        return saved
+
+    def restore(self, saved: tuple[int, dict]) -> Failure | None:
+        """
+        Stop recording the failures of a parser run
+
+        The failures recorded since `save` are added to the ones saved.
+
+        Returns
+        -------
+        Failure | None
+            the farthest failure of the run, if any
+        """
+        own = None
+        if self.pos >= 0:
+            own = (self.pos, tuple(self.expected))
+        self.pos, self.expected = saved
+        if own is not None:
+            self.merge(own)
+        return own
+
+    def merge(self, failure: Failure) -> None:
+        """Record a failure returned by `restore`."""
+        pos, labels = failure
+        if pos > self.pos:
+            self.pos = pos
+            self.expected = dict.fromkeys(labels)
+        elif pos == self.pos:
+            self.expected.update(dict.fromkeys(labels))
+
+
 class Stream:
     """
     Stream of characters to parse.
+
+    Streams derived from another stream (e.g. with ``tail`` or ``advance``) are
+    cursors sharing the buffer, the line index and the memoization table (if
+    any) of the original stream.
     """
 
+    __slots__ = ("buf", "begin", "loc", "memo", "failures", "instrument", "plain")
+
     def __init__(self, buf: str, begin: int = 0) -> None:
         self.buf: str = buf
         self.begin: int = begin
-        self.loc: list[Location] = [Location(1, 1)]
-        for i in range(1, len(self.buf)):
-            if self.buf[i - 1] == "\n":
-                line = self.loc[-1].line + 1
-                col = 1
-            else:
-                line = self.loc[-1].line
-                col = self.loc[-1].col + 1
-            self.loc.append(Location(line, col))
+        self.loc: LineIndex = LineIndex(buf)
+        self.memo: MemoTable | None = None
+        self.failures: FarthestFailure = FarthestFailure()
+        self.instrument: Instrument | None = None
+        # Whether the stream has neither a memoization table nor an instrument, so
+        # that parsers run without looking them up, see `Parser._parse`.
+        self.plain: bool = True
+
+    def at(self, offset: int) -> Stream:
+        """
+        The parse stream starting at an offset of the buffer
+
+        Parameters
+        ----------
+        offset : int
+            offset in the buffer
+
+        Returns
+        -------
+        Stream
+            a new stream sharing the buffer of the current stream, starting at
+            `offset`
+        """
+        return self._view(object.__new__(type(self)), offset)
+
+    def _view(self, stream: S, offset: int) -> S:
+        """Make a new stream share the state of this one, starting at `offset`."""
+        stream.buf = self.buf
+        stream.begin = offset
+        stream.loc = self.loc
+        stream.memo = self.memo
+        stream.failures = self.failures
+        stream.instrument = self.instrument
+        stream.plain = self.plain
+        return stream
+
+    def _with_memo(self, memo: MemoTable | None) -> Stream:
+        stream = self.at(self.begin)
+        stream.memo = memo
+        stream.plain = memo is None and stream.instrument is None
+        return stream
+
+    def _with_instrument(self, instrument: Instrument | None) -> Stream:
+        stream = self.at(self.begin)
+        stream.instrument = instrument
+        stream.plain = stream.memo is None and instrument is None
+        return stream
+
+    def _with_failures(self) -> Stream:
+        """The stream with a new record of failures, for a new parse."""
+        stream = self.at(self.begin)
+        stream.failures = FarthestFailure()
+        return stream
+
+    def fetch(self, end: int) -> bool:
+        """
+        Make sure the buffer holds the data up to an offset, if there is any
+
+        Plain streams hold all of their data already. Streams reading their input
+        incrementally load more of it.
+
+        Parameters
+        ----------
+        end : int
+            the offset up to which data is needed
+
+        Returns
+        -------
+        bool
+            whether the buffer holds the data up to `end`
+        """
+        return end <= len(self.buf)
+
+    def location(self, offset: int) -> Location:
+        """
+        Location of the character at an offset of the buffer
+
+        Parameters
+        ----------
+        offset : int
+            offset in the buffer. Offsets past the end of the input are mapped to
+            the location of the last character.
+
+        Returns
+        -------
+        Location
+        """
+        return self.loc[min(offset, len(self.loc) - 1)]
+
+    def offset(self, loc: Location) -> int:
+        """
+        Offset in the buffer of the character at a location
+
+        Parameters
+        ----------
+        loc : Location
+            location of the character
+
+        Returns
+        -------
+        int
+        """
+        return self.loc.offset(loc)
 
     def remain(self) -> str:
         """
@@ -56,6 +385,8 @@ class Stream:
         match other:
             case str(s):
                 return self.remain() == s
+            case bytes(b):
+                return self.remain() == b
             case Stream():
                 if self.buf is other.buf:
                     return self.begin == other.begin
@@ -80,8 +411,8 @@ class Stream:
             next character in the parse stream and its location, or
             `None` if the stream is exhausted
         """
-        if self.begin < len(self.buf):
-            return (self.buf[self.begin], self.loc[self.begin])
+        if self.begin < len(self.buf) or self.fetch(self.begin + 1):
+            return (self.buf[self.begin], self.location(self.begin))
         else:
             return None
 
@@ -95,4 +426,250 @@ class Stream:
             a new stream including the remaining characters after
             the head of the current stream
         """
-        return Stream(self.buf, self.begin + 1)
+        return self.at(self.begin + 1)
+
+    def advance(self, n: int) -> Stream:
+        """
+        The parse stream after skipping some characters
+
+        Parameters
+        ----------
+        n : int
+            number of characters to skip
+
+        Returns
+        -------
+        Stream
+            a new stream sharing the buffer of the current stream, starting
+            `n` characters after the current stream
+        """
+        return self.at(self.begin + n)
+
+
+class ByteStream(Stream):
+    """
+    Stream of bytes to parse.
+
+    The stream parses a bytes-like buffer in place: `bytes`, `bytearray`,
+    `memoryview` or `mmap`. Parsers see single bytes as integers, and the values
+    they return are slices of the buffer, which are only copied as large as the
+    parsed tokens (or not at all for a `memoryview`). Offsets and columns count
+    bytes.
+
+    Use ``Parser.decode`` to turn parsed bytes into text.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, buf: Buffer, begin: int = 0) -> None:
+        super().__init__(buf, begin)  # type: ignore
+
+    @staticmethod
+    def from_path(path: str | os.PathLike) -> ByteStream:
+        """
+        Stream over the memory-mapped content of a file
+
+        The file is mapped read-only, so its content is only loaded by the
+        operating system as it is parsed, and is never copied as a whole.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            the path of the file
+
+        Returns
+        -------
+        ByteStream
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Empty files cannot be mapped.
+                return ByteStream(b"")
+            return ByteStream(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __str__(self) -> str:
+        return repr(bytes(cast(Buffer, self.remain())))
+
+
+class Readable(Protocol):  # pylint: disable=too-few-public-methods
+    """File-like object, in text or binary mode."""
+
+    def read(self, size: int, /) -> Any:  # pragma: no cover
+        """Read at most `size` characters or bytes, or none at the end."""
+
+
+class Receivable(Protocol):  # pylint: disable=too-few-public-methods
+    """Socket-like object."""
+
+    def recv(self, size: int, /) -> bytes:  # pragma: no cover
+        """Receive at most `size` bytes, or none once the socket is closed."""
+
+
+class _ChunkSource:
+    """Buffered data of a `ChunkedStream`, shared by all of its views."""
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        self.chunks: Iterator[str] = chunks
+        self.buf: str = ""
+        # Offset in the whole input of the first buffered character.
+        self.base: int = 0
+        self.index: LineIndex = LineIndex()
+        self.exhausted: bool = False
+
+    def pull(self, end: int) -> None:
+        """Read chunks until `end` characters are buffered, if there are enough."""
+        # Read at least as much as is buffered already, so the cost of copying
+        # the buffer on every read is amortized.
+        target = max(end, 2 * len(self.buf))
+        parts = [self.buf]
+        size = len(self.buf)
+        while size < target:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.exhausted = True
+                break
+            parts.append(chunk)
+            self.index.extend(chunk)
+            size += len(chunk)
+        self.buf = "".join(parts)
+
+
+class ChunkedStream(Stream):
+    """
+    Stream of characters read incrementally from a source.
+
+    More data is read from the source only when a parser looks past the
+    buffered data. Offsets (`begin`, `ParseSuccess.rs`) are relative to the
+    buffered data, while locations are those in the whole input.
+
+    The buffered data before the head of a stream can be dropped with
+    `release`, once the caller will not backtrack before it anymore.
+    """
+
+    __slots__ = ("source",)
+
+    def __init__(self, chunks: Iterable[str | bytes], encoding: str = "utf-8"):
+        """
+        Parameters
+        ----------
+        chunks : Iterable[str | bytes]
+            the chunks of the input. Chunks of bytes are decoded incrementally.
+        encoding : str
+            the encoding of chunks of bytes
+        """
+        self.source: _ChunkSource = _ChunkSource(_decode(chunks, encoding))
+        super().__init__("")
+        self.loc = self.source.index
+
+    @staticmethod
+    def from_file(
+        f: IO | Readable, chunk_size: int = 1 << 16, encoding: str = "utf-8"
+    ) -> ChunkedStream:
+        """
+        Stream reading a file object
+
+        Parameters
+        ----------
+        f : IO | Readable
+            the file object, in text or binary mode
+        chunk_size : int
+            the size of the chunks read from the file
+        encoding : str
+            the encoding of the file, if in binary mode
+
+        Returns
+        -------
+        ChunkedStream
+        """
+        return ChunkedStream(_until_empty(lambda: f.read(chunk_size)), encoding)
+
+    @staticmethod
+    def from_socket(
+        sock: Receivable, chunk_size: int = 1 << 16, encoding: str = "utf-8"
+    ) -> ChunkedStream:
+        """
+        Stream reading a socket until it is closed
+
+        Parameters
+        ----------
+        sock : Receivable
+            the socket
+        chunk_size : int
+            the maximum size of the chunks received from the socket
+        encoding : str
+            the encoding of the data
+
+        Returns
+        -------
+        ChunkedStream
+        """
+        return ChunkedStream(_until_empty(lambda: sock.recv(chunk_size)), encoding)
+
+    def at(self, offset: int) -> ChunkedStream:
+        stream = object.__new__(ChunkedStream)
+        stream.source = self.source
+        return self._view(stream, offset)
+
+    def fetch(self, end: int) -> bool:
+        source = self.source
+        if len(source.buf) < end and not source.exhausted:
+            source.pull(end)
+        self.buf = source.buf
+        return end <= len(self.buf)
+
+    def location(self, offset: int) -> Location:
+        return self.loc[min(self.source.base + offset, len(self.loc) - 1)]
+
+    def offset(self, loc: Location) -> int:
+        return self.loc.offset(loc) - self.source.base
+
+    def remain(self) -> str:
+        """
+
+        Returns
+        -------
+        The remaining of the parse stream. The rest of the input is read from
+        the source.
+
+        """
+        self.fetch(sys.maxsize)
+        return super().remain()
+
+    def release(self) -> ChunkedStream:
+        """
+        Drop the buffered data before the head of the stream
+
+        All the other streams over the same source become invalid.
+
+        Returns
+        -------
+        ChunkedStream
+            the stream starting at the same character as the current stream
+        """
+        source = self.source
+        source.buf = source.buf[self.begin :]
+        source.base += self.begin
+        source.index.forget(source.base)
+        # Failures before the head now have negative offsets.
+        self.failures.pos -= self.begin
+        stream = self.at(0)
+        stream.buf = source.buf
+        return stream
+
+
+def _until_empty(read: Callable[[], Any]) -> Iterator[Any]:
+    while chunk := read():
+        yield chunk
+
+
+def _decode(chunks: Iterable[str | bytes], encoding: str) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        match chunk:
+            case str():
+                yield chunk
+            case _:
+                yield decoder.decode(chunk)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
@@ -0,0 +1,215 @@
+"""Tracing of the parsers run by a parse."""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import IO, TYPE_CHECKING, Any, Literal, NamedTuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from dine.parser import Parser, RawResult
+
+
+class Hook:
+    """
+    Hook notified of the parsers run by a traced parse, see `Parser.traced`.
+
+    Each parser call is notified by `on_enter`, then `on_success` or
+    `on_failure` with its result, then `on_exit`, which is also called if the
+    parser raises an exception. The methods do nothing by default, and are
+    overridden by the hooks.
+    """
+
+    def on_enter(self, parser: Parser, offset: int) -> None:
+        """
+        Called when a parser starts parsing
+
+        Parameters
+        ----------
+        parser : Parser
+            the parser
+        offset : int
+            offset where the parser starts
+        """
+
+    def on_success(self, parser: Parser, offset: int, value: Any, end: int) -> None:
+        """
+        Called when a parser succeeds
+
+        Parameters
+        ----------
+        parser : Parser
+            the parser
+        offset : int
+            offset where the parser started
+        value : Any
+            the parsed value
+        end : int
+            offset after the parsed value
+        """
+
+    def on_failure(
+        self, parser: Parser, offset: int, msg: str | None, end: int
+    ) -> None:
+        """
+        Called when a parser fails
+
+        Parameters
+        ----------
+        parser : Parser
+            the parser
+        offset : int
+            offset where the parser started
+        msg : str | None
+            the failure message, `None` if the input at `end` is unexpected
+        end : int
+            offset where the parser failed
+        """
+
+    def on_exit(self, parser: Parser, offset: int) -> None:
+        """
+        Called when a parser returns or raises an exception
+
+        Parameters
+        ----------
+        parser : Parser
+            the parser
+        offset : int
+            offset where the parser started
+        """
+
+    def enter(self, parser: Parser, pos: int) -> None:
+        """Notify the hook of the start of a parser call, see `Instrument`."""
+        self.on_enter(parser, pos)
+
+    def exit(self, parser: Parser, pos: int, result: RawResult | None) -> None:
+        """Notify the hook of the end of a parser call, see `Instrument`."""
+        if result is not None:
+            ok, val, end = result
+            if ok:
+                self.on_success(parser, pos, val, end)
+            else:
+                self.on_failure(parser, pos, val, end)
+        self.on_exit(parser, pos)
+
+
+EventKind = Literal["enter", "success", "failure", "exit"]
+
+
+class TraceEvent(NamedTuple):
+    """Event of a traced parse, as recorded by the exporters."""
+
+    kind: EventKind
+    # Number of parser calls running around the call of the event.
+    depth: int
+    label: str
+    offset: int
+    # Where a parser succeeded or failed.
+    end: int | None = None
+    msg: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        The event as a dictionary, without the fields that are `None`
+
+        Returns
+        -------
+        dict[str, Any]
+        """
+        return {
+            key: val for key, val in zip(TraceEvent._fields, self) if val is not None
+        }
+
+
+class _Recorder(Hook, ABC):
+    """Hook making events of the parser calls for an exporter."""
+
+    def __init__(self) -> None:
+        self.depth: int = 0
+        self._labels: dict[Parser, str] = {}
+
+    def _label(self, parser: Parser) -> str:
+        label = self._labels.get(parser)
+        if label is None:
+            label = self._labels[parser] = parser.label
+        return label
+
+    @abstractmethod
+    def record(self, event: TraceEvent) -> None:
+        """Record an event."""
+
+    def on_enter(self, parser: Parser, offset: int) -> None:
+        self.record(TraceEvent("enter", self.depth, self._label(parser), offset))
+        self.depth += 1
+
+    def on_success(self, parser: Parser, offset: int, value: Any, end: int) -> None:
+        label = self._label(parser)
+        self.record(TraceEvent("success", self.depth - 1, label, offset, end))
+
+    def on_failure(
+        self, parser: Parser, offset: int, msg: str | None, end: int
+    ) -> None:
+        label = self._label(parser)
+        self.record(TraceEvent("failure", self.depth - 1, label, offset, end, msg))
+
+    def on_exit(self, parser: Parser, offset: int) -> None:
+        self.depth -= 1
+        self.record(TraceEvent("exit", self.depth, self._label(parser), offset))
+
+
+class FileExporter(_Recorder):
+    """
+    Hook writing the events of a traced parse to a file, as they happen.
+
+    Each event is written as a JSON object on its own line, with the fields of
+    `TraceEvent`.
+    """
+
+    def __init__(self, file: IO[str]) -> None:
+        """
+        Parameters
+        ----------
+        file : IO[str]
+            the text file the events are written to
+        """
+        super().__init__()
+        self.file: IO[str] = file
+
+    def record(self, event: TraceEvent) -> None:
+        self.file.write(json.dumps(event.as_dict()) + "\n")
+
+
+class RingBuffer(_Recorder):
+    """
+    Hook keeping the last events of a traced parse.
+
+    The events leading to the end of a parse (e.g. one that raised an exception
+    or had to be interrupted) are kept in bounded memory for post-mortem
+    analysis.
+    """
+
+    def __init__(self, size: int = 1 << 16) -> None:
+        """
+        Parameters
+        ----------
+        size : int
+            the number of events kept
+        """
+        super().__init__()
+        self.events: deque[TraceEvent] = deque(maxlen=size)
+
+    def record(self, event: TraceEvent) -> None:
+        self.events.append(event)
+
+    def dump(self, file: IO[str]) -> None:
+        """
+        Write the events kept to a file, in the format of `FileExporter`
+
+        Parameters
+        ----------
+        file : IO[str]
+            the text file the events are written to
+        """
+        for event in self.events:
+            file.write(json.dumps(event.as_dict()) + "\n")
@@ -0,0 +1,58 @@
+import re
+
+import pytest
+
+from dine.charclass import ASCII_LETTERS, DIGITS, CharClass
+
+
+def test_charclass_membership():
+    assert "5" in DIGITS and "a" not in DIGITS
+    assert "a" in ~DIGITS and "5" not in ~DIGITS
+    assert "Q" in ASCII_LETTERS and "q" in ASCII_LETTERS and "1" not in ASCII_LETTERS
+    assert "c" in CharClass.range("a", "e") and "f" not in CharClass.range("a", "e")
+
+
+@pytest.mark.parametrize(
+    "lhs, rhs",
+    [
+        (CharClass.of("ab"), CharClass.of("bc")),
+        (~CharClass.of("ab"), CharClass.of("bc")),
+        (CharClass.of("ab"), ~CharClass.of("bc")),
+        (~CharClass.of("ab"), ~CharClass.of("bc")),
+    ],
+)
+def test_charclass_union(lhs: CharClass, rhs: CharClass):
+    union = lhs | rhs
+    for c in "abcd":
+        assert (c in union) == (c in lhs or c in rhs)
+
+
+def test_charclass_eq():
+    assert CharClass.of("ab") == CharClass.of("ba")
+    assert CharClass.of("ab") != ~CharClass.of("ab")
+    assert CharClass.of("ab") != "ab"
+    assert hash(CharClass.of("ab")) == hash(CharClass.of("ba"))
+
+
+@pytest.mark.parametrize(
+    "chars",
+    [
+        CharClass(),
+        ~CharClass(),
+        CharClass.of("a-]^\\"),
+        CharClass.range("a", "f") | CharClass.of("xz"),
+        ~DIGITS,
+    ],
+)
+def test_charclass_pattern(chars: CharClass):
+    pattern = re.compile(chars.pattern())
+    for c in "abcdefxyz059-]^\\\n ":
+        assert (pattern.fullmatch(c) is not None) == (c in chars)
+
+
+def test_charclass_span():
+    assert DIGITS.span("ab123cd", 2) == 5
+    assert DIGITS.span("ab123", 2) == 5
+    assert DIGITS.span("ab123", 0) == 0
+    assert (~DIGITS).span("ab123", 0) == 2
+    assert CharClass().span("abc", 1) == 1
@@ -0,0 +1,143 @@
+import random
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from dine.charclass import DIGITS, WHITESPACE
+from dine.codegen import compile_parser, generate
+from dine.parser import Parser
+from dine.result import ParseFailure, ParseSuccess
+from dine.stream import ChunkedStream, Stream
+
+WS = Parser.take_while(WHITESPACE)
+
+
+def token(parser: Parser) -> Parser:
+    return parser.succeeded_by(WS)
+
+
+NUMBER = token(Parser.regex(r"-?\d+(?:\.\d+)?").map(float))
+NAME = token(Parser.satisfy(str.isalpha).many1().map("".join))
+KEYWORD = token(Parser.choice(map(Parser.string, ["let", "in", "if", "then"])))
+OPERATOR = token(Parser.char_class("+-*/"))
+ATOM = Parser.choice([NUMBER, KEYWORD, NAME]) | token(Parser.string("()"))
+EXPR = ATOM.and_then(OPERATOR.and_then(ATOM).many0())
+STATEMENT = Parser.sequence(
+    [
+        token(Parser.string("let")),
+        NAME,
+        token(Parser.char("=")),
+        EXPR,
+        token(Parser.char(";")).optional(default=";"),
+    ]
+)
+PROGRAM = STATEMENT.many1().preceded_by(WS)
+LIST = (
+    token(Parser.take_while(DIGITS, min_count=1))
+    .many0_sep_by(token(Parser.char(",")))
+    .surrounded_by(token(Parser.char("[")), token(Parser.char("]")))
+)
+NESTED = Parser.forward("nested")
+NESTED.define(
+    Parser.choice(
+        [
+            LIST,
+            NESTED.many1().surrounded_by(
+                token(Parser.char("(")), token(Parser.char(")"))
+            ),
+        ]
+    )
+)
+BIND = Parser.digit().bind(lambda d: Parser.char("x").times(int(d)))
+
+ALPHABET = "(()) let in=;+-*/()0123456789.,[]abxyz\n"
+
+
+def texts() -> Iterator[str]:
+    yield "let x = 1 + 2 * y; let y = (3);"
+    yield "let x = 1 + 2 * ; let"
+    yield "[1, 22 ,333]"
+    yield "3xxx"
+    yield "(([1] [2, 3]) ([4]))"
+    yield "(([1] [2, 3]) ([4])"
+    yield ""
+    rng = random.Random(0)
+    for _ in range(100):
+        yield "".join(rng.choice(ALPHABET) for _ in range(rng.randrange(30)))
+
+
+def chunks(text: str, size: int) -> Iterator[str]:
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+def assert_same(result, expected):
+    assert type(result) is type(expected)
+    assert result.loc == expected.loc
+    match expected:
+        case ParseSuccess():
+            assert result.val == expected.val
+            assert result.rs.begin == expected.rs.begin
+        case ParseFailure():
+            assert result == expected
+
+
+@pytest.mark.parametrize("parser", [PROGRAM, EXPR, LIST, NESTED, BIND, ATOM.many0()])
+def test_compiled_same_results(parser: Parser):
+    compiled = compile_parser(parser)
+    assert compiled.label == parser.label
+    for text in texts():
+        assert_same(compiled(text), parser(text))
+        chunked = ChunkedStream(chunks(text, 3))
+        assert_same(compiled(chunked), parser(ChunkedStream(chunks(text, 3))))
+
+
+def test_compiled_bytes():
+    parser = Parser.string(b"ab").or_else(Parser.char_class("cd")).many0()
+    compiled = compile_parser(parser)
+    for text in [b"abcdab", b"abx", b"a", b""]:
+        assert compiled(text) == parser(text)
+
+
+def test_compiled_memoized_stream():
+    compiled = compile_parser(PROGRAM)
+    text = "let x = 1 + 2;"
+    assert compiled.packrat()(text) == PROGRAM(text)
+    doc = compiled.parse_incremental(text).edit(8, 1, "3")
+    assert doc.result == PROGRAM("let x = 3 + 2;")
+
+
+def test_compiled_deep_grammar():
+    parser = Parser.char("a")
+    for i in range(300):
+        parser = parser | Parser.char(chr(ord("b") + i % 20))
+    compiled = compile_parser(parser)
+    for text in ["a", "k", "t", "z"]:
+        assert compiled(text) == parser(text)
+
+
+def test_generate():
+    source, constants = generate(PROGRAM)
+    assert "def parse_0(s, pos):" in source
+    assert "parse = parse_0" in source
+    assert all(name in source for name in constants)
+
+
+def test_compile_cache(tmp_path: Path):
+    compiled = compile_parser(LIST, cache_dir=tmp_path)
+    modules = list(tmp_path.glob("dine_*.py"))
+    assert len(modules) == 1
+    assert compiled("[1,2]") == LIST("[1,2]")
+    # The cached module is loaded with the constants of the new grammar.
+    other = (
+        token(Parser.take_while("abc", min_count=1))
+        .many0_sep_by(token(Parser.char(";")))
+        .surrounded_by(token(Parser.char("(")), token(Parser.char(")")))
+    )
+    compiled = compile_parser(other, cache_dir=tmp_path)
+    assert list(tmp_path.glob("dine_*.py")) == modules
+    assert compiled("(ab; c)") == other("(ab; c)")
+    result = compiled(Stream("(ab; c)"))
+    assert isinstance(result, ParseSuccess)
+    assert result.val == ["ab", "c"]
@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from dine.charclass import DIGITS, WHITESPACE
+from dine.incremental import Edit
+from dine.memo import MemoTable
+from dine.parser import Parser
+from dine.result import ParseFailure, ParseSuccess
+
+WS = Parser.take_while(WHITESPACE)
+NAME = Parser.regex("[a-z]+").succeeded_by(WS)
+NUMBER = Parser.take_while(DIGITS, min_count=1).map(int).succeeded_by(WS)
+STATEMENT = (
+    NAME.succeeded_by(Parser.char("=").succeeded_by(WS))
+    .and_then(NUMBER.many1_sep_by(Parser.char(",").succeeded_by(WS)))
+    .succeeded_by(Parser.char(";").succeeded_by(WS))
+)
+PROGRAM = STATEMENT.many0()
+
+TEXT = "".join(
+    f"{chr(97 + i % 26) * (1 + i // 26)} = {i}, {i * 7};\n" for i in range(50)
+)
+
+
+def test_edit_apply():
+    assert Edit(1, 2, "xyz").apply("abcd") == "axyzd"
+    with pytest.raises(ValueError):
+        Edit(3, 2, "").apply("abcd")
+
+
+def test_incremental_parse():
+    doc = PROGRAM.parse_incremental(TEXT)
+    assert doc.result == PROGRAM(TEXT)
+    offset = TEXT.index("12, 84")
+    edited = doc.edit(offset, 2, "1234")
+    assert edited.text == TEXT[:offset] + "1234" + TEXT[offset + 2 :]
+    assert edited.result == PROGRAM(edited.text)
+    assert isinstance(edited.result, ParseSuccess)
+    assert edited.result.val[12] == ("m", [1234, 84])
+    # The previous parse is unchanged.
+    assert doc.result == PROGRAM(TEXT)
+
+
+def test_incremental_parse_reuses_results():
+    calls = 0
+
+    def count(val: str) -> int:
+        nonlocal calls
+        calls += 1
+        return int(val)
+
+    number = Parser.take_while(DIGITS, min_count=1).map(count).succeeded_by(WS)
+    program = (
+        NAME.succeeded_by(Parser.char("=").succeeded_by(WS))
+        .and_then(number.many1_sep_by(Parser.char(",").succeeded_by(WS)))
+        .succeeded_by(Parser.char(";").succeeded_by(WS))
+        .many0()
+    )
+    doc = program.parse_incremental(TEXT)
+    assert calls == 100
+    calls = 0
+    doc = doc.edit(TEXT.index("12, 84"), 2, "1234")
+    assert calls == 1
+    calls = 0
+    doc = doc.edit(len(doc.text), 0, "x = 1;")
+    assert calls == 1
+    assert doc.result == program(doc.text)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_parse_random_edits(seed: int):
+    rng = random.Random(seed)
+    doc = PROGRAM.parse_incremental(TEXT)
+    for _ in range(10):
+        offset = rng.randrange(len(doc.text) + 1)
+        deleted = rng.randrange(min(4, len(doc.text) - offset) + 1)
+        inserted = "".join(rng.choice("ab1 ,;=\n") for _ in range(rng.randrange(4)))
+        doc = doc.edit(offset, deleted, inserted)
+        expected = PROGRAM(doc.text)
+        assert doc.result.loc == expected.loc
+        match expected:
+            case ParseSuccess():
+                assert doc.result == expected
+            case ParseFailure():
+                assert doc.result == expected
+
+
+@pytest.mark.parametrize(
+    "parser, text, edit",
+    [
+        # Failure at the end of the input.
+        (Parser.regex("ab"), "a", (1, 0, "b")),
+        # Alternatives looking past the end of their match.
+        (Parser.regex("abc|a"), "abd", (2, 1, "c")),
+        (Parser.regex(r"\d+(?:\.\d+)?"), "1.x", (2, 1, "5")),
+        (Parser.regex(r"[a-z]+") & Parser.regex(r"\d*;"), "ab1 ", (3, 1, ";")),
+    ],
+)
+def test_incremental_parse_regex(parser: Parser, text: str, edit: tuple):
+    doc = parser.parse_incremental(text).edit(*edit)
+    assert doc.result == parser(doc.text)
+
+
+def test_memo_table_edited():
+    table = MemoTable()
+    table.put(("p", 0), ((True, "a", 2), 3, None))
+    table.put(("p", 4), ((True, "b", 6), 7, None))
+    table.put(("p", 8), ((False, None, 8), 9, (8, ("c",))))
+    edited = table.edited(4, 2, 5)
+    assert edited.get(("p", 0)) == ((True, "a", 2), 3, None)
+    assert edited.get(("p", 4)) is None
+    assert edited.get(("p", 8)) is None
+    assert edited.get(("p", 11)) == ((False, None, 11), 12, (11, ("c",)))
+    assert table.get(("p", 4)) == ((True, "b", 6), 7, None)
+    # Edits of an edited table move the results of the base through all edits.
+    edited.put(("q", 5), ((True, "d", 7), 8, None))
+    twice = edited.edited(0, 1, 0)
+    assert twice.get(("p", 0)) is None
+    assert twice.get(("q", 4)) == ((True, "d", 6), 7, None)
+    assert twice.get(("p", 10)) == ((False, None, 10), 11, (10, ("c",)))
@@ -0,0 +1,83 @@
+import mmap
+from pathlib import Path
+
+import pytest
+
+from dine import parallel
+from dine.charclass import DIGITS
+from dine.parallel import parse_parallel
+from dine.parser import Parser
+from dine.result import ParseFailure, ParseSuccess
+from dine.stream import Location
+
+NUMBER = Parser.take_while(DIGITS, min_count=1).map(int)
+FIELD = NUMBER | Parser.regex(r'"([^"]*)"', group=1)
+RECORD = FIELD.many1_sep_by(Parser.char(","))
+
+LINES = "\n".join(f'{i},"r{i}",{i * i}' for i in range(200))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        LINES,
+        LINES + "\n",
+        LINES + "\nx",
+        LINES.replace('"r150"', "r150"),
+        LINES.replace('"r3"', "r3"),
+        # A record containing the separator.
+        LINES.replace('"r120"', '"r\n120"'),
+        "",
+        "1",
+    ],
+)
+def test_parse_parallel_same_as_sequential(text: str):
+    expected = RECORD.many1_sep_by(Parser.string("\n"))(text)
+    result = parse_parallel(RECORD, text, chunk_size=256, max_workers=2)
+    assert type(result) is type(expected)
+    assert result.loc == expected.loc
+    match expected:
+        case ParseSuccess():
+            assert isinstance(result, ParseSuccess)
+            assert result.val == expected.val
+            assert result.rs == expected.rs
+        case ParseFailure():
+            assert result == expected
+
+
+def test_parse_parallel_committed_failure():
+    record = (Parser.char("a") & Parser.char("b").commit()) | Parser.char("c")
+    text = "ab\nab\na\nc"
+    expected = record.many1_sep_by(Parser.string("\n"))(text)
+    result = parse_parallel(record, text, chunk_size=1, max_workers=2)
+    assert isinstance(result, ParseFailure)
+    assert result == expected
+    assert result.loc == Location(3, 2)
+
+
+def test_parse_parallel_bytes():
+    data = LINES.encode()
+    record = Parser.regex(rb"[^\n]*").decode()
+    result = parse_parallel(record, data, b"\n", chunk_size=256, max_workers=2)
+    assert isinstance(result, ParseSuccess)
+    assert result.val == LINES.split("\n")
+    assert result.rs == b""
+
+
+def test_parse_parallel_without_fork(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Without fork, the processes are sent the chunks of the input, which are
+    # read from the mapped file rather than pickled with it.
+    monkeypatch.setattr(parallel.multiprocessing, "get_all_start_methods", list)
+    path = tmp_path / "data.txt"
+    path.write_bytes(LINES.encode())
+    record = Parser.regex(rb"[^\n]*").decode()
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        result = parse_parallel(record, m, b"\n", chunk_size=256, max_workers=2)
+        assert isinstance(result, ParseSuccess)
+        assert result.val == LINES.split("\n")
+        assert result.rs == b""
+
+
+def test_parse_parallel_empty_separator():
+    with pytest.raises(ValueError):
+        parse_parallel(RECORD, LINES, "")
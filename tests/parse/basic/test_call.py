@@ -1,7 +1,8 @@
 import pytest
 
 from dine.parser import Parser
-from dine.stream import Stream
+from dine.result import ParseFailure, ParseResult, ParseSuccess
+from dine.stream import Location, Stream
 
 
 @pytest.mark.parametrize(
@@ -17,3 +18,29 @@ from dine.stream import Stream
 )
 def test_call(text: str, parser: Parser):
     assert parser(text) == parser(Stream(text))
+
+
+def test_call_custom_parse_fn():
+    def parse_ab(s: Stream) -> ParseResult[str]:
+        if s.remain().startswith("ab"):
+            return ParseSuccess(s.loc[s.begin], "ab", s.advance(2))
+        return ParseFailure(s.loc[s.begin], "ab", "expected ab")
+
+    parser = Parser(parse_ab, label="custom").many1().and_then(Parser.char("\n"))
+    assert parser("abab\n") == ParseSuccess(
+        Location(1, 1), (["ab", "ab"], "\n"), Stream("abab\n", 5)
+    )
+    failure = Parser(parse_ab, label="custom")("x\nab\nac")
+    assert failure == ParseFailure(Location(1, 1), "custom", "expected ab")
+    failure = Parser.string("x\nab\n").and_then(Parser(parse_ab, label="custom"))
+    assert failure("x\nab\nac").loc == Location(3, 1)
+
+
+def test_parse_fn():
+    def parse_a(s: Stream) -> ParseResult[str]:
+        return Parser.char("a")(s)
+
+    assert Parser(parse_a, label="a").parse_fn is parse_a
+    parser = Parser.char("a").many1()
+    for text in ["aab", "b"]:
+        assert parser.parse_fn(Stream(text)) == parser(text)
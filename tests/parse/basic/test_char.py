@@ -24,3 +24,9 @@ def test_char(
     xresult: ParseResult[A],
 ):
     helper_success_or_failure(text, parser, xresult)
+
+
+@pytest.mark.parametrize("char", ["", "ab"])
+def test_char_not_single(char: str):
+    with pytest.raises(ValueError):
+        Parser.char(char)
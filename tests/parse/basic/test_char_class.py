@@ -0,0 +1,51 @@
+from typing import TypeVar
+
+import pytest
+
+from dine.charclass import DIGITS, CharClass
+from dine.parser import Parser
+from dine.result import ParseFailure, ParseResult
+from dine.stream import Location
+
+from ..util import Failure, Success, helper_success_or_failure
+
+A = TypeVar("A")
+
+
+@pytest.mark.parametrize(
+    "text, parser, xresult",
+    [
+        ("1a", Parser.char_class(DIGITS), Success("1", "a")),
+        ("a1", Parser.char_class(DIGITS), Failure),
+        ("a1", Parser.char_class(~DIGITS), Success("a", "1")),
+        ("", Parser.char_class(DIGITS), Failure),
+        ("b", Parser.char_class("abc"), Success("b", "")),
+        ("123ab", Parser.take_while(DIGITS), Success("123", "ab")),
+        ("ab", Parser.take_while(DIGITS), Success("", "ab")),
+        ("", Parser.take_while(DIGITS), Success("", "")),
+        ("ab", Parser.take_while(DIGITS, min_count=1), Failure),
+        ("12", Parser.take_while(DIGITS, min_count=3), Failure),
+        ("aab", Parser.take_while("a"), Success("aa", "b")),
+        (
+            "x1",
+            Parser.take_while(CharClass.range("a", "z") | DIGITS),
+            Success("x1", ""),
+        ),
+    ],
+)
+def test_char_class(
+    text: str,
+    parser: Parser[A],
+    xresult: ParseResult[A],
+):
+    helper_success_or_failure(text, parser, xresult)
+
+
+def test_take_while_failure():
+    parser = Parser.take_while(DIGITS, min_count=3, label="number")
+    assert parser("12a") == ParseFailure(
+        Location(1, 3), "number", "unexpected character 'a'"
+    )
+    assert parser("12") == ParseFailure(
+        Location(1, 2), "number", "input stream exhausted"
+    )
@@ -3,7 +3,8 @@ from typing import TypeVar
 import pytest
 
 from dine.parser import Parser
-from dine.result import ParseResult
+from dine.result import ParseFailure, ParseResult, ParseSuccess
+from dine.stream import Location
 
 from ..util import Failure, Success, helper_success_or_failure
 
@@ -69,3 +70,46 @@ def test_choice(
     xresult: ParseResult[A],
 ):
     helper_success_or_failure(text, parser, xresult)
+
+
+KEYWORDS = [f"kw{i}x" for i in range(200)] + ["if", "in", "else"]
+
+
+@pytest.mark.parametrize(
+    "text, xval, xrest",
+    [
+        ("kw0x;", "kw0x", ";"),
+        ("kw199x;", "kw199x", ";"),
+        ("in;", "in", ";"),
+        ("else", "else", ""),
+    ],
+)
+def test_choice_keywords(text: str, xval: str, xrest: str):
+    parser = Parser.choice(map(Parser.string, KEYWORDS))
+    result = parser(text)
+    assert isinstance(result, ParseSuccess)
+    assert result.val == xval and result.rs == xrest
+
+
+def test_choice_dispatch_failure():
+    parser = Parser.choice(map(Parser.string, KEYWORDS)).set_label("keyword")
+    assert parser("zz") == ParseFailure(
+        Location(1, 1), "keyword", "unexpected character 'z'"
+    )
+    assert parser("") == ParseFailure(
+        Location(1, 1), "keyword", "input stream exhausted"
+    )
+    assert isinstance(parser("iz"), ParseFailure)
+
+
+def test_choice_mixed_first_sets():
+    parser = Parser.choice([Parser.string("ab"), Parser.regex("[a-z]+")])
+    result = parser("abc")
+    assert isinstance(result, ParseSuccess) and result.val == "ab"
+    result = parser("xyz")
+    assert isinstance(result, ParseSuccess) and result.val == "xyz"
+
+
+def test_choice_empty():
+    with pytest.raises(ValueError):
+        Parser.choice([])
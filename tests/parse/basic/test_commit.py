@@ -0,0 +1,73 @@
+import pytest
+
+from dine.codegen import compile_parser
+from dine.parser import Parser
+from dine.result import ParseFailure, ParseSuccess
+from dine.stream import Location, Stream
+
+A = Parser.char("a")
+B = Parser.char("b")
+C = Parser.char("c")
+COMMA = Parser.char(",")
+AB = A & B.commit()
+
+
+@pytest.mark.parametrize(
+    "text, parser",
+    [
+        ("ac", AB | C),
+        ("ac", Parser.choice([AB, A & C])),
+        ("ac", Parser.choice([AB, Parser.string("ac")])),
+        ("ac", AB.optional()),
+        ("ac", AB.map(str)),
+        ("ac", Parser.sequence([AB])),
+        ("abac", AB.many0()),
+        ("abac", AB.many1()),
+        ("ab,ac", AB.many1_sep_by(COMMA)),
+        ("ab,ac", AB.many0_sep_by(COMMA)),
+        ("abac", AB.repeat(0, 3)),
+        ("abac", AB.times(2)),
+        ("abac", (AB | C).many0()),
+    ],
+)
+def test_committed_failure(text: str, parser: Parser):
+    for p in [parser, parser.packrat(), compile_parser(parser)]:
+        result = p(text)
+        assert isinstance(result, ParseFailure)
+        assert result.loc == Location(1, len(text))
+        assert result.expected == ["char 'b'"]
+
+
+def test_failure_before_commit_backtracks():
+    assert (AB | C)("c") == ParseSuccess(Location(1, 1), "c", Stream("c", 1))
+    assert AB.many0()("abab$").val == [("a", "b"), ("a", "b")]
+    assert AB.optional()("$").val == []
+
+
+def test_committed_separator():
+    parser = A.many1_sep_by(COMMA & C.commit())
+    assert parser("a,ca").val == ["a", "a"]
+    result = parser("a,ca,x")
+    assert isinstance(result, ParseFailure)
+    assert result.loc == Location(1, 6)
+    assert result.expected == ["char 'c'"]
+
+
+def test_commit_in_expression():
+    operand = Parser.digit() | (Parser.char("(") & Parser.char(")").commit())
+    parser = Parser.expression(operand, [])
+    assert parser("1").val == "1"
+    result = parser("(1")
+    assert isinstance(result, ParseFailure)
+    assert result.loc == Location(1, 2)
+
+
+def test_commit_iter_many():
+    items = AB.iter_many("abab$")
+    assert list(items) == [("a", "b"), ("a", "b")]
+    assert isinstance(items.result, ParseSuccess)
+    items = AB.iter_many("abac")
+    assert list(items) == [("a", "b")]
+    assert items.result == ParseFailure(
+        Location(1, 4), items.label, "unexpected character 'c'"
+    )
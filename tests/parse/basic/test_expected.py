@@ -0,0 +1,110 @@
+from dine.codegen import compile_parser
+from dine.incremental import IncrementalParse
+from dine.parser import Parser
+from dine.result import ParseFailure, ParseResult
+from dine.stream import ChunkedStream, Location, Stream
+
+A = Parser.char("a")
+B = Parser.char("b")
+C = Parser.char("c")
+
+
+def test_farthest_failure():
+    parser = (A & B) | C
+    result = parser("ad")
+    assert result == ParseFailure(
+        Location(1, 2), parser.label, "unexpected character 'd'"
+    )
+    assert isinstance(result, ParseFailure)
+    assert result.expected == ["char 'b'"]
+
+
+def test_expected_alternatives():
+    parser = Parser.choice([A & B, C, Parser.string("cd")])
+    result = parser("x")
+    assert isinstance(result, ParseFailure)
+    assert result.loc == Location(1, 1)
+    # None of the alternatives can start with 'x', so all of them are expected.
+    assert result.expected == ["char 'a' and then char 'b'", "char 'c'", "literal cd"]
+
+    result = (A | B).many1()("")
+    assert isinstance(result, ParseFailure)
+    assert result.msg == "input stream exhausted"
+    assert result.expected == ["char 'a'", "char 'b'"]
+
+
+def test_farthest_failure_after_success():
+    # The repetition stops at the second 'a', which fails at its 'b'.
+    parser = (A & B).many0() & C
+    result = parser("abax")
+    assert isinstance(result, ParseFailure)
+    assert result.loc == Location(1, 4)
+    assert result.msg == "unexpected character 'x'"
+    assert result.expected == ["char 'b'"]
+
+
+def test_custom_message_kept():
+    def parse_b(s: Stream) -> ParseResult[str]:
+        return ParseFailure(s.loc[s.begin], "b", "expected b")
+
+    parser = A & Parser(parse_b, label="custom")
+    result = parser("ab")
+    assert result == ParseFailure(Location(1, 2), parser.label, "expected b")
+    # The message of the last failure at the farthest offset is kept.
+    parser = A & (C | Parser(parse_b, label="custom"))
+    result = parser("ab")
+    assert result == ParseFailure(Location(1, 2), parser.label, "expected b")
+    assert isinstance(result, ParseFailure)
+    assert result.expected == ["char 'c'"]
+
+
+def test_expected_follows_labels():
+    digit = Parser.digit()
+    parser = digit & digit
+    digit.set_label("a digit")
+    result = parser("1x")
+    assert isinstance(result, ParseFailure)
+    assert result.expected == ["a digit"]
+
+
+def test_expected_consistent():
+    parser = (A & B).many1_sep_by(Parser.char(",")) & C
+    text = "ab,ab,ax"
+    expected = parser(text)
+    assert isinstance(expected, ParseFailure)
+    assert expected.loc == Location(1, 8)
+    for result in [
+        parser.packrat()(text),
+        compile_parser(parser)(text),
+        parser(ChunkedStream(iter([text[:3], text[3:]]))),
+    ]:
+        assert isinstance(result, ParseFailure)
+        assert result == expected
+        assert result.expected == expected.expected
+
+    # Results reused by an incremental parse still report their failures.
+    doc = IncrementalParse(parser, "ab,ab,ab,ax").edit(0, 3, "")
+    assert doc.result == expected
+    assert isinstance(doc.result, ParseFailure)
+    assert doc.result.expected == expected.expected
+
+
+def test_rest_parsed_with_new_failures():
+    result = (A & B).optional()(Stream("ac"))
+    assert result.rs is not None
+    failure = B(result.rs)
+    assert isinstance(failure, ParseFailure)
+    assert failure.loc == Location(1, 1)
+    assert failure.expected == ["char 'b'"]
+
+
+def test_repr():
+    result = A("b")
+    assert repr(result) == (
+        "ParseFailure(\n"
+        "    loc=(line=1,col=1),\n"
+        "    label=\"char 'a'\",\n"
+        "    msg=\"unexpected character 'b'\",\n"
+        "    expected=[\"char 'a'\"]\n"
+        ")"
+    )
@@ -0,0 +1,119 @@
+import operator
+import pickle
+import sys
+from typing import TypeVar
+
+import pytest
+
+from dine.charclass import WHITESPACE
+from dine.parser import Operator, Parser
+from dine.result import ParseResult, ParseSuccess
+
+from ..util import Failure, Success, helper_success_or_failure
+
+A = TypeVar("A")
+
+WS = Parser.take_while(WHITESPACE)
+
+
+def token(literal: str) -> Parser:
+    return Parser.string(literal).succeeded_by(WS)
+
+
+NUMBER = Parser.regex(r"\d+").map(int).succeeded_by(WS)
+# "**" is tried before "*", which is a prefix of it.
+OPERATORS = [
+    Operator(token("**"), 4, operator.pow, "right"),
+    Operator(token("+"), 1, operator.add),
+    Operator(token("-"), 1, operator.sub),
+    Operator(token("*"), 2, operator.mul),
+    Operator(token("//"), 2, operator.floordiv),
+    Operator(token("-"), 3, operator.neg, "prefix"),
+]
+ARITH = Parser.expression(NUMBER, OPERATORS)
+
+
+@pytest.mark.parametrize(
+    "text, parser, xresult",
+    [
+        ("1", ARITH, Success(1, "")),
+        ("1 + 2 * 3", ARITH, Success(7, "")),
+        ("1 * 2 + 3", ARITH, Success(5, "")),
+        ("10 - 3 - 2", ARITH, Success(5, "")),
+        ("2 ** 3 ** 2", ARITH, Success(512, "")),
+        ("- 2 ** 2", ARITH, Success(-4, "")),
+        ("- 2 * 3 - - 1", ARITH, Success(-5, "")),
+        ("7 // 2 * 3", ARITH, Success(9, "")),
+        # An operator without its operand is left unparsed.
+        ("1 + 2 *", ARITH, Success(3, "*")),
+        ("1 + -$", ARITH, Success(1, "+ -$")),
+        ("", ARITH, Failure),
+        ("-", ARITH, Failure),
+        ("+ 1", ARITH, Failure),
+        # Without operators, the expression is a single operand.
+        ("1 + 2", Parser.expression(NUMBER, []), Success(1, "+ 2")),
+    ],
+)
+def test_expression(
+    text: str,
+    parser: Parser[A],
+    xresult: ParseResult[A],
+):
+    helper_success_or_failure(text, parser, xresult)
+
+
+def test_expression_tree():
+    def node(op: str):
+        return lambda left, right: (op, left, right)
+
+    parser = Parser.expression(
+        Parser.char_class("abcd"),
+        [
+            Operator(Parser.char("="), 0, node("="), "right"),
+            Operator(Parser.char("+"), 1, node("+")),
+            Operator(Parser.char("*"), 2, node("*")),
+        ],
+    )
+    result = parser("a=b=c+d*a+b")
+    assert isinstance(result, ParseSuccess)
+    assert result.val == (
+        "=",
+        "a",
+        ("=", "b", ("+", ("+", "c", ("*", "d", "a")), "b")),
+    )
+
+
+def test_expression_nested():
+    def expr() -> Parser:
+        return nested
+
+    def parse_fn(s):
+        return expr()(s)
+
+    operand = NUMBER | Parser(parse_fn, label="ref").surrounded_by(
+        token("("), token(")")
+    )
+    nested = Parser.expression(operand, OPERATORS)
+    assert nested("(1 + 2) * (3 - (4 - 5))").val == 12
+
+
+def test_expression_beyond_recursion_limit():
+    n = 10 * sys.getrecursionlimit()
+    for assoc in ["left", "right"]:
+        parser = Parser.expression(
+            Parser.char("a").map(lambda _: 1),
+            [Operator(Parser.char("+"), 1, operator.add, assoc)],  # type: ignore
+        )
+        result = parser("+".join("a" * n))
+        assert isinstance(result, ParseSuccess)
+        assert result.val == n
+
+
+def test_expression_pickle():
+    parser = pickle.loads(pickle.dumps(ARITH))
+    assert parser("1 + 2 * - 3 ** 2").val == ARITH("1 + 2 * - 3 ** 2").val == -17
+
+
+def test_expression_invalid_associativity():
+    with pytest.raises(ValueError):
+        Parser.expression(NUMBER, [Operator(token("+"), 1, operator.add, "none")])
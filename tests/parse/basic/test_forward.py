@@ -0,0 +1,78 @@
+import pickle
+from typing import TypeVar
+
+import pytest
+
+from dine.errors import ParseError
+from dine.parser import Parser
+from dine.result import ParseResult, ParseSuccess
+
+from ..util import Failure, Success, helper_success_or_failure
+
+A = TypeVar("A")
+
+# VALUE := '[' VALUE (',' VALUE)* ']' | DIGIT
+VALUE = Parser.forward("value")
+ARRAY = VALUE.many1_sep_by(Parser.char(",")).surrounded_by(
+    Parser.char("["), Parser.char("]")
+)
+VALUE.define(ARRAY | Parser.digit())
+
+
+@pytest.mark.parametrize(
+    "text, parser, xresult",
+    [
+        ("1", VALUE, Success("1", "")),
+        ("[1,2]$", VALUE, Success(["1", "2"], "$")),
+        ("[1,[2,[3]],4]", VALUE, Success(["1", ["2", ["3"]], "4"], "")),
+        ("[[[[5]]]]", ARRAY, Success([[[["5"]]]], "")),
+        ("[1,[2]", VALUE, Failure),
+        ("[]", VALUE, Failure),
+        ("$", VALUE, Failure),
+    ],
+)
+def test_forward(
+    text: str,
+    parser: Parser[A],
+    xresult: ParseResult[A],
+):
+    helper_success_or_failure(text, parser, xresult)
+
+
+def test_forward_label():
+    assert VALUE.label == "value"
+    parser = Parser.forward()
+    parser.define(Parser.char("a"))
+    assert parser.label == "char 'a'"
+
+
+def test_forward_to_forward():
+    first = Parser.forward()
+    second = Parser.forward()
+    first.define(second)
+    second.define(Parser.char("a").many1())
+    assert first("aa$").val == ["a", "a"]
+
+
+def test_forward_undefined():
+    parser = Parser.forward("rule")
+    with pytest.raises(ParseError):
+        parser("a")
+
+
+def test_forward_defined_twice():
+    parser = Parser.forward()
+    parser.define(Parser.char("a"))
+    with pytest.raises(ValueError):
+        parser.define(Parser.char("b"))
+    with pytest.raises(TypeError):
+        Parser.char("a").define(Parser.char("b"))
+
+
+def test_forward_pickle():
+    for parser in [VALUE, ARRAY]:
+        copy = pickle.loads(pickle.dumps(parser))
+        result = copy("[1,[2,[3]],4]")
+        assert isinstance(result, ParseSuccess)
+        assert result.val == ["1", ["2", ["3"]], "4"]
+    assert pickle.loads(pickle.dumps(VALUE)).label == "value"
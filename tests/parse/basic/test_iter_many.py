@@ -0,0 +1,77 @@
+from typing import Any
+
+import pytest
+
+from dine.charclass import DIGITS
+from dine.parser import RELEASE_THRESHOLD, Parser
+from dine.result import ParseFailure, ParseSuccess
+from dine.stream import ChunkedStream, Location
+
+NUMBER = Parser.take_while(DIGITS, min_count=1).map(int)
+COMMA = Parser.char(",")
+
+
+@pytest.mark.parametrize("text", ["", "1", "12,3", "12,3,", "1,2;x", "x"])
+def test_iter_many_same_as_many(text: str):
+    cases: list[tuple[dict[str, Any], Parser]] = [
+        ({}, NUMBER.many0()),
+        ({"min_count": 1}, NUMBER.many1()),
+        ({"sep": COMMA, "min_count": 1}, NUMBER.many1_sep_by(COMMA)),
+    ]
+    for kwargs, parser in cases:
+        it = NUMBER.iter_many(text, **kwargs)
+        vals = list(it)
+        expected = parser(text)
+        match expected:
+            case ParseSuccess():
+                assert vals == expected.val
+                assert it.result == ParseSuccess(expected.loc, len(vals), expected.rs)
+            case ParseFailure():
+                assert vals == []
+                assert it.result == ParseFailure(expected.loc, it.label, expected.msg)
+
+
+def test_iter_many_is_lazy():
+    it = NUMBER.succeeded_by(COMMA).iter_many("1,2,x")
+    assert it.result is None
+    assert next(it) == 1
+    assert it.result is None
+    assert list(it) == [2]
+    assert it.result == ParseSuccess(Location(1, 1), 2, "x")
+
+
+def test_iter_many_labels():
+    assert NUMBER.iter_many("").label == f"zero or more {NUMBER.label}"
+    it = NUMBER.iter_many("1,x", sep=COMMA, min_count=2)
+    assert it.label == f"at least 2 {NUMBER.label} separated by char ','"
+    assert list(it) == [1]
+    assert it.result == ParseFailure(
+        Location(1, 3), it.label, "unexpected character 'x'"
+    )
+
+
+def test_iter_many_separator_min_count():
+    a = Parser.char("a")
+    it = a.iter_many("a,a;", sep=COMMA, min_count=3)
+    assert list(it) == ["a", "a"]
+    assert it.result == ParseFailure(
+        Location(1, 4), it.label, "unexpected character ';'"
+    )
+
+
+def test_iter_many_releases_chunked_stream():
+    line = "12345,67890\n"
+    count = 4 * RELEASE_THRESHOLD // len(line)
+    stream = ChunkedStream(line for _ in range(count))
+    record = NUMBER.succeeded_by(COMMA).and_then(NUMBER).succeeded_by(Parser.char("\n"))
+    it = record.iter_many(stream)
+    total = 0
+    for a, b in it:
+        total += a + b
+        assert len(stream.source.buf) <= 2 * RELEASE_THRESHOLD + 2 * len(line)
+    assert total == count * (12345 + 67890)
+    assert isinstance(it.result, ParseSuccess)
+    assert it.result.val == count
+    assert it.result.rs == ""
+    assert it.result.loc == Location(1, 1)
+    assert it.result.rs.location(it.result.rs.begin) == Location(count, len(line))
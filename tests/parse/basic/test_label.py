@@ -0,0 +1,59 @@
+import pickle
+import sys
+
+from dine.label import Label
+from dine.parser import Parser
+from dine.result import ParseFailure
+from dine.stream import Location
+
+A = Parser.char("a")
+B = Parser.char("b")
+
+
+def test_combinator_labels():
+    assert (A & B).label == "char 'a' and then char 'b'"
+    assert (A | B).label == "char 'a' or else char 'b'"
+    assert A.many1_sep_by(B).label == "one or more char 'a' separated by char 'b'"
+    assert A.many0_sep_by(B).label == "zero or more char 'a' separated by char 'b'"
+    assert A.times(2).label == "(char 'a') 2 times"
+    assert A.repeat(1, 2).label == "between 1 and 2 char 'a'"
+    assert Parser.sequence([A, B]).label == "sequence of (char 'a', char 'b')"
+    assert Parser.choice([A, B, A]).label == "choice of (char 'a', char 'b', char 'a')"
+    assert A.map(str.upper).label == "char 'a'"
+
+
+def test_label_rendered_on_failure():
+    parser = Parser.sequence([A, B])
+    result = parser("ac")
+    assert isinstance(result, ParseFailure)
+    assert result == ParseFailure(
+        Location(1, 2), "sequence of (char 'a', char 'b')", "unexpected character 'c'"
+    )
+
+
+def test_label_follows_sub_parsers():
+    a = Parser.char("a")
+    parser = a.many0()
+    a.set_label("letter a")
+    assert parser.label == "zero or more letter a"
+    parser.set_label("as")
+    assert parser.label == "as"
+
+
+def test_label_deep_grammar():
+    parser = A
+    for _ in range(10 * sys.getrecursionlimit()):
+        parser = parser.optional()
+    assert parser.label.endswith("optional optional char 'a'")
+
+
+def test_label_recursive_grammar():
+    value = Parser.forward()
+    value.define((value.surrounded_by(A, B)) | Parser.char("x"))
+    assert value.label == "char 'a' and then ... and then char 'b' or else char 'x'"
+    copy = pickle.loads(pickle.dumps(value))
+    assert copy.label == value.label
+
+
+def test_label_repr():
+    assert repr(Label("one of ", A)) == "Label(\"one of char 'a'\")"
@@ -1,9 +1,10 @@
+import sys
 from typing import TypeVar
 
 import pytest
 
 from dine.parser import Parser
-from dine.result import ParseResult
+from dine.result import ParseResult, ParseSuccess
 
 from ..util import Success, helper_success_or_failure
 
@@ -52,3 +53,22 @@ def test_many0(
     xresult: ParseResult[A],
 ):
     helper_success_or_failure(text, parser, xresult)
+
+
+def test_many0_beyond_recursion_limit():
+    n = 10 * sys.getrecursionlimit()
+    result = Parser.char("a").many0()("a" * n + "b")
+    assert isinstance(result, ParseSuccess)
+    assert len(result.val) == n and result.rs == "b"
+
+
+def test_many0_exhausted():
+    result = Parser.char("a").many0()("")
+    assert isinstance(result, ParseSuccess)
+    assert result.val == [] and result.rs == ""
+
+
+def test_many0_stops_on_empty_match():
+    result = Parser.just(1).many0()("abc")
+    assert isinstance(result, ParseSuccess)
+    assert result.val == [] and result.rs == "abc"
@@ -1,9 +1,10 @@
+import sys
 from typing import TypeVar
 
 import pytest
 
 from dine.parser import Parser
-from dine.result import ParseResult
+from dine.result import ParseResult, ParseSuccess
 
 from ..util import Success, helper_success_or_failure
 
@@ -57,3 +58,11 @@ def test_many1_sep_by(
     xresult: ParseResult[A],
 ):
     helper_success_or_failure(text, parser, xresult)
+
+
+def test_many1_sep_by_beyond_recursion_limit():
+    n = 10 * sys.getrecursionlimit()
+    parser = Parser.char("a").many1_sep_by(Parser.char(","))
+    result = parser(",".join("a" * n) + ",b")
+    assert isinstance(result, ParseSuccess)
+    assert len(result.val) == n and result.rs == ",b"
@@ -0,0 +1,81 @@
+from typing import TypeVar
+
+import pytest
+
+from dine.memo import MemoStats, MemoTable
+from dine.parser import Parser
+from dine.result import ParseResult, ParseSuccess
+from dine.stream import Stream
+
+from ..util import Failure, Success, helper_success_or_failure
+
+A = TypeVar("A")
+
+PREFIX = Parser.string("ab").many1().map("".join)
+PACKRAT_PARSER = (
+    PREFIX.and_then(Parser.char("x"))
+    .or_else(PREFIX.and_then(Parser.char("y")))
+    .map(lambda pair: pair[0] + pair[1])
+    .packrat()
+)
+
+
+@pytest.mark.parametrize(
+    "text, parser, xresult",
+    [
+        ("ababx$", PACKRAT_PARSER, Success("ababx", "$")),
+        ("ababy$", PACKRAT_PARSER, Success("ababy", "$")),
+        ("ababz$", PACKRAT_PARSER, Failure),
+    ],
+)
+def test_packrat(
+    text: str,
+    parser: Parser[A],
+    xresult: ParseResult[A],
+):
+    helper_success_or_failure(text, parser, xresult)
+
+
+def test_packrat_reuses_results():
+    calls = 0
+
+    def count(val: str) -> str:
+        nonlocal calls
+        calls += 1
+        return val
+
+    prefix = Parser.string("ab").many1().map(count)
+    stats: list[MemoStats] = []
+    parser = (
+        prefix.and_then(Parser.char("x"))
+        .or_else(prefix.and_then(Parser.char("y")))
+        .packrat(on_stats=stats.append)
+    )
+    result = parser("ababy")
+    assert isinstance(result, ParseSuccess)
+    assert calls == 1
+    assert len(stats) == 1 and stats[0].hits >= 1
+    assert result.rs.memo is None
+
+
+def test_packrat_cache_is_per_call():
+    parser = Parser.char("a").packrat()
+    s = Stream("aa")
+    assert parser(s).rs == "a"
+    assert parser(s).rs == "a"
+    assert s.memo is None
+
+
+def test_memo_table_eviction():
+    memo = MemoTable(max_size=2)
+    memo.put("a", 1)
+    memo.put("b", 2)
+    assert memo.get("a") == 1
+    memo.put("c", 3)
+    assert memo.get("b") is None
+    assert memo.get("a") == 1 and memo.get("c") == 3
+    assert len(memo) == 2
+    assert memo.stats.evictions == 1
+    assert memo.stats.hit_rate == 0.75
+    with pytest.raises(ValueError):
+        MemoTable(max_size=0)
@@ -0,0 +1,62 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from dine.charclass import DIGITS, WHITESPACE
+from dine.parser import Parser
+from dine.result import ParseResult
+from dine.stream import Stream
+
+
+def to_int(digits: str) -> int:
+    return int(digits)
+
+
+def parse_any(s: Stream) -> ParseResult[str]:
+    return Parser.regex(r"\w+")(s)
+
+
+WS = Parser.take_while(WHITESPACE)
+NUMBER = Parser.take_while(DIGITS, min_count=1).map(to_int).set_label("number")
+ITEMS = (
+    Parser.choice(map(Parser.string, ["null", "true"]))
+    | NUMBER
+    | Parser(parse_any, label="word")
+).many1_sep_by(Parser.char(",").surrounded_by(WS, WS))
+GRAMMAR = ITEMS.surrounded_by(Parser.char("["), Parser.char("]")).packrat(max_size=64)
+
+TEXTS = ["[1, true,null ,abc]", "[1,,2]", "[]", "[1 2]"]
+
+
+def parse_text(args: tuple[Parser, str]) -> ParseResult:
+    parser, text = args
+    return parser(text)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_pickle_roundtrip(text: str):
+    parser = pickle.loads(pickle.dumps(GRAMMAR))
+    assert parser is not GRAMMAR
+    assert parser.label == GRAMMAR.label
+    assert parser(text) == GRAMMAR(text)
+
+
+def test_pickle_keeps_labels():
+    parser = pickle.loads(pickle.dumps(NUMBER))
+    assert parser.label == "number"
+    assert parser("x").label == "number"
+
+
+def test_pickle_unrecorded_parser():
+    parser = Parser.char("a").bind(lambda a: Parser.char(a))
+    with pytest.raises(Exception):
+        pickle.dumps(parser)
+
+
+def test_pickle_process_pool():
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(2, mp_context=context) as executor:
+        results = list(executor.map(parse_text, [(GRAMMAR, text) for text in TEXTS]))
+    assert results == [GRAMMAR(text) for text in TEXTS]
@@ -0,0 +1,74 @@
+import re
+from typing import TypeVar
+
+import pytest
+
+from dine.codegen import compile_parser
+from dine.parser import Parser
+from dine.result import ParseFailure, ParseResult, ParseSuccess
+from dine.stream import Location, Stream
+
+from ..util import Failure, Success, helper_success_or_failure
+
+A = TypeVar("A")
+
+
+@pytest.mark.parametrize(
+    "text, parser, xresult",
+    [
+        # Stream("abc123") --> P([a-z]+)
+        # ==> Success("abc", Stream("123"))
+        ("abc123", Parser.regex("[a-z]+"), Success("abc", "123")),
+        # Stream("123abc") --> P([a-z]+)
+        # ==> ParseFailure()
+        ("123abc", Parser.regex("[a-z]+"), Failure),
+        # The match is anchored at the head of the stream
+        ("1a", Parser.regex("[a-z]"), Failure),
+        ("ABC", Parser.regex("[a-z]+", re.IGNORECASE), Success("ABC", "")),
+        ("x=42;", Parser.regex(r"(\w+)=(\d+)", group=2), Success("42", ";")),
+        (
+            "x=42;",
+            Parser.regex(re.compile(r"(?P<k>\w+)=(?P<v>\d+)"), group=("k", "v")),
+            Success(("x", "42"), ";"),
+        ),
+        ("x=42;", Parser.regex(r"(\w+)=", group=(1,)), Success(("x",), "42;")),
+        ("", Parser.regex("a*"), Success("", "")),
+    ],
+)
+def test_regex(
+    text: str,
+    parser: Parser[A],
+    xresult: ParseResult[A],
+):
+    helper_success_or_failure(text, parser, xresult)
+
+
+@pytest.mark.parametrize(
+    "group, val", [(1, "x"), ((1,), ("x",)), ((2, 1), ("42", "x"))]
+)
+def test_regex_groups_compiled(group: int | tuple[int, ...], val: object):
+    parser = Parser.regex(r"(\w+)=(\d+)", group=group)
+    expected = ParseSuccess(Location(1, 1), val, Stream("x=42;", 4))
+    assert parser("x=42;") == expected
+    assert compile_parser(parser)("x=42;") == expected
+
+
+def test_regex_after_other_parsers():
+    parser = Parser.char("\n").and_then(Parser.regex(r"\d+"))
+    result = Parser.string("ab").and_then(parser)("ab\n12c")
+    assert result.val == ("ab", ("\n", "12")) and result.rs == "c"
+    assert Parser.regex(r"\d+")(Stream("ab\n12c", 3)).loc == Location(2, 1)
+
+
+def test_regex_failure():
+    assert Parser.regex(r"\d+", label="number")("ab\ncd") == ParseFailure(
+        Location(1, 1), "number", "unexpected character 'a'"
+    )
+    assert Parser.regex(r"\d+")("") == ParseFailure(
+        Location(1, 1), r"regex \d+", "input stream exhausted"
+    )
+
+
+def test_regex_bytes():
+    result = Parser.regex(rb"(\d+)-", group=1).decode()(memoryview(b"42-x"))
+    assert result.val == "42" and result.rs == b"x"
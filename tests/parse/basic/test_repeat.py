@@ -0,0 +1,52 @@
+from typing import TypeVar
+
+import pytest
+
+from dine.parser import Parser
+from dine.result import ParseResult
+
+from ..util import Failure, Success, helper_success_or_failure
+
+A = TypeVar("A")
+
+
+@pytest.mark.parametrize(
+    "text, parser, xresult",
+    [
+        ("aaaa", Parser.char("a").repeat(2, 3), Success(["a"] * 3, "a")),
+        ("aab", Parser.char("a").repeat(2, 3), Success(["a"] * 2, "b")),
+        ("ab", Parser.char("a").repeat(2, 3), Failure),
+        ("b", Parser.char("a").repeat(0, 3), Success([], "b")),
+        ("aaaaab", Parser.char("a").repeat(2), Success(["a"] * 5, "b")),
+        ("a", Parser.char("a").repeat(2), Failure),
+        ("aa", Parser.char("a").repeat(0, 0), Success([], "aa")),
+        # Empty matches are repeated up to the minimum count only.
+        ("", Parser.just(1).repeat(2), Success([1, 1], "")),
+        ("", Parser.just(1).repeat(0, 5), Success([], "")),
+    ],
+)
+def test_repeat(
+    text: str,
+    parser: Parser[A],
+    xresult: ParseResult[A],
+):
+    helper_success_or_failure(text, parser, xresult)
+
+
+def test_repeat_stops_at_max_count():
+    seen = []
+
+    def predicate(c: str) -> bool:
+        seen.append(c)
+        return c == "a"
+
+    parser = Parser.satisfy(predicate).repeat(1, 3)
+    assert parser("a" * 100).val == ["a"] * 3
+    assert len(seen) == 3
+
+
+def test_repeat_invalid_counts():
+    with pytest.raises(ValueError):
+        Parser.char("a").repeat(-1)
+    with pytest.raises(ValueError):
+        Parser.char("a").repeat(3, 2)
@@ -1,9 +1,10 @@
+import sys
 from typing import TypeVar
 
 import pytest
 
 from dine.parser import Parser
-from dine.result import ParseResult
+from dine.result import ParseResult, ParseSuccess
 
 from ..util import Failure, Success, helper_success_or_failure
 
@@ -62,3 +63,15 @@ def test_sequence(
     xresult: ParseResult[A],
 ):
     helper_success_or_failure(text, parser, xresult)
+
+
+def test_sequence_long():
+    n = 10 * sys.getrecursionlimit()
+    result = Parser.sequence([Parser.char("a")] * n)("a" * n + "b")
+    assert isinstance(result, ParseSuccess)
+    assert len(result.val) == n and result.rs == "b"
+
+
+def test_sequence_label():
+    parser = Parser.sequence([Parser.char("a"), Parser.digit()])
+    assert parser.label == "sequence of (char 'a', digit)"
@@ -3,7 +3,8 @@ from typing import TypeVar
 import pytest
 
 from dine.parser import Parser
-from dine.result import ParseResult
+from dine.result import ParseFailure, ParseResult, ParseSuccess
+from dine.stream import Location
 
 from ..util import Failure, Success, helper_success_or_failure
 
@@ -27,3 +28,28 @@ def test_string(
     xresult: ParseResult[A],
 ):
     helper_success_or_failure(text, parser, xresult)
+
+
+@pytest.mark.parametrize(
+    "text, literal, xloc, xmsg",
+    [
+        ("hello", "help", Location(1, 4), "unexpected character 'l'"),
+        ("ab\nxd", "ab\ncd", Location(2, 1), "unexpected character 'x'"),
+        ("hel", "hello", Location(1, 3), "input stream exhausted"),
+    ],
+)
+def test_string_failure_location(text: str, literal: str, xloc: Location, xmsg: str):
+    result = Parser.string(literal)(text)
+    assert result == ParseFailure(xloc, f"literal {literal}", xmsg)
+
+
+@pytest.mark.parametrize(
+    "buf", [b"hello world", bytearray(b"hello world"), memoryview(b"hello world")]
+)
+def test_string_bytes(buf):
+    result = Parser.string(b"hello")(buf)
+    assert isinstance(result, ParseSuccess)
+    assert result.val == b"hello" and result.rs == b" world"
+    assert Parser.string(b"help")(buf) == ParseFailure(
+        Location(1, 4), "literal b'help'", "unexpected byte b'l'"
+    )
@@ -45,3 +45,7 @@ def test_times(
     xresult: ParseResult[A],
 ):
     helper_success_or_failure(text, parser, xresult)
+
+
+def test_times_zero():
+    assert Parser.char("a").times(0)("aa").val == []
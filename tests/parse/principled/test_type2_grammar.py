@@ -40,3 +40,31 @@ def test_type2_grammar(input_text: str, xresult: ParseResult):
     )
 
     helper_success_or_failure(input_text, S_parser, xresult)
+
+
+@pytest.mark.parametrize(
+    "input_text, xresult",
+    [
+        ("ab", Success("ab", "")),
+        ("abc", Success("ab", "c")),
+        ("aabb", Success("aabb", "")),
+        ("aaabbbc", Success("aaabbb", "c")),
+        ("c", Failure),
+        ("aab", Failure),
+        ("aaabb", Failure),
+    ],
+)
+def test_type2_grammar_forward(input_text: str, xresult: ParseResult):
+    """
+    Parse the same grammar rule with a recursive parser, which is only built once:
+        S := 'a' S? 'b'
+    """
+
+    S_parser = Parser.forward("S")
+    S_parser.define(
+        Parser.sequence(
+            [Parser.char("a"), S_parser.optional(default=""), Parser.char("b")]
+        ).map(lambda seq: seq[0] + "".join(seq[1]) + seq[2])
+    )
+
+    helper_success_or_failure(input_text, S_parser, xresult)
@@ -24,3 +24,4 @@ def helper_success_or_failure(text: str, parser: Parser[A], xresult: ParseResult
                     assert False
         case _:
             assert isinstance(result, ParseFailure)
+            assert isinstance(xresult, ParseFailure)
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from dine.codegen import compile_parser
+from dine.errors import ParseError
+from dine.parser import Parser
+from dine.profile import Profiler
+
+A = Parser.char("a")
+B = Parser.char("b")
+
+
+def test_counts():
+    profiler = Profiler()
+    parser = (A & B) | A
+    assert parser.profiled(profiler)("ac") == parser("ac")
+    stats = {stats.label: stats for stats in profiler.stats()}
+    assert [stats["char 'a'"].calls, stats["char 'a'"].successes] == [2, 2]
+    assert [stats["char 'b'"].calls, stats["char 'b'"].failures] == [1, 1]
+    # The sequence fails after parsing 'a'.
+    sequence = stats["char 'a' and then char 'b'"]
+    assert [sequence.failures, sequence.backtracks, sequence.consumed] == [1, 1, 0]
+    choice = stats[parser.label]
+    assert [choice.calls, choice.successes, choice.consumed] == [1, 1, 1]
+    assert choice.cumulative_time >= sequence.cumulative_time + choice.self_time
+    assert choice.cumulative_time == pytest.approx(
+        sum(stats.self_time for stats in profiler.stats())
+    )
+
+    # Calls add up over the parses.
+    parser.profiled(profiler)("ab")
+    assert {stats.label: stats for stats in profiler.stats()}[parser.label].calls == 2
+
+
+def test_recursive_cumulative_time():
+    nested = Parser.forward("nested")
+    nested.define((A & nested).map(lambda v: v[1]) | B)
+    profiler = Profiler()
+    parser = nested.profiled(profiler)
+    assert parser("a" * 100 + "b").val == "b"
+    stats = {stats.label: stats for stats in profiler.stats()}
+    assert stats["nested"].calls == 101
+    assert stats["nested"].cumulative_time == pytest.approx(
+        sum(stats.self_time for stats in profiler.stats())
+    )
+
+
+def test_reports():
+    profiler = Profiler()
+    parser = Parser.char(";").many0()
+    parser.profiled(profiler)(";;")
+    lines = profiler.report().splitlines()
+    assert lines[0].split() == [
+        "calls",
+        "successes",
+        "failures",
+        "backtracks",
+        "cumulative",
+        "self",
+        "consumed",
+        "label",
+    ]
+    assert len(lines) == 3
+    assert len(profiler.report(limit=1).splitlines()) == 2
+    assert {stats["label"] for stats in json.loads(profiler.to_json())} == {
+        "char ';'",
+        "zero or more char ';'",
+    }
+    for line in profiler.collapsed().splitlines():
+        stack, time = line.rsplit(" ", 1)
+        assert int(time) >= 0
+        assert stack.split(";")[0] == "zero or more char '\\x3b'"
+
+
+def test_not_instrumented_outside_profiled_parses():
+    profiler = Profiler()
+    parser = A.many1()
+    assert parser.profiled(profiler)("aa") == parser("aa")
+    # Parsers within the profiled one are recorded, the others are not.
+    (B & parser.profiled(profiler))("baa")
+    stats = {stats.label: stats for stats in profiler.stats()}
+    assert stats["char 'a'"].calls == 6
+    assert "char 'b'" not in stats
+
+    with pytest.raises(ParseError):
+        Parser.forward().profiled(Profiler())("a")
+
+    # Nor are the parsers of other parses running meanwhile.
+    profiler = Profiler()
+    A.map(lambda _: B("b").val).profiled(profiler)("a")
+    assert [stats.label for stats in profiler.stats()] == ["char 'a'"]
+
+
+def test_compiled_parser_profiled():
+    parser = compile_parser((A & B).many1())
+    profiler = Profiler()
+    assert parser.profiled(profiler)("abab") == parser("abab")
+    stats = {stats.label: stats for stats in profiler.stats()}
+    assert stats["char 'b'"].calls == 2
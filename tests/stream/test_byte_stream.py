@@ -0,0 +1,90 @@
+import mmap
+from pathlib import Path
+
+import pytest
+
+from dine.charclass import DIGITS, WHITESPACE
+from dine.parser import Parser
+from dine.result import ParseFailure, ParseSuccess
+from dine.stream import ByteStream, Location
+
+DATA = b"x = 12;\nname = 'abc';\n\nlist = 1,2,3;\n"
+
+STATEMENT = (
+    Parser.regex(rb"[a-z]+")
+    .decode()
+    .succeeded_by(Parser.string(b" = "))
+    .and_then(
+        Parser.take_while(DIGITS, min_count=1).map(int).many1_sep_by(Parser.char(","))
+        | Parser.until(lambda c: c == ord(";")).decode()
+    )
+    .succeeded_by(Parser.char(";"))
+    .succeeded_by(Parser.take_while(WHITESPACE))
+)
+PROGRAM = STATEMENT.many1().map(dict)
+EXPECTED = {"x": [12], "name": "'abc'", "list": [1, 2, 3]}
+
+
+@pytest.mark.parametrize("buf", [DATA, bytearray(DATA), memoryview(DATA)], ids=type)
+def test_byte_stream_buffers(buf):
+    result = PROGRAM(buf)
+    assert isinstance(result, ParseSuccess)
+    assert result.val == EXPECTED
+    assert result.rs == b""
+
+
+def test_byte_stream_from_path(tmp_path: Path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(DATA)
+    stream = ByteStream.from_path(path)
+    assert isinstance(stream.buf, mmap.mmap)
+    result = PROGRAM(stream)
+    assert isinstance(result, ParseSuccess)
+    assert result.val == EXPECTED
+
+
+def test_byte_stream_from_empty_path(tmp_path: Path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    result = Parser.char("a")(ByteStream.from_path(path))
+    assert result == ParseFailure(Location(1, 1), "char 'a'", "input stream exhausted")
+
+
+def test_byte_stream_locations():
+    stream = ByteStream(DATA, begin=DATA.index(b"list"))
+    result = Parser.string(b"list = 1,2,x")(stream)
+    assert result == ParseFailure(
+        Location(4, 12), "literal b'list = 1,2,x'", "unexpected byte b'3'"
+    )
+    # Columns count bytes, not characters.
+    result = Parser.regex(rb"\S+\s").many0()("é\nàb c".encode())
+    assert isinstance(result, ParseSuccess)
+    assert result.rs.location(result.rs.begin) == Location(2, 5)
+
+
+def test_byte_stream_values_are_slices():
+    buf = memoryview(b"abc123")
+    result = Parser.take_while("abc")(buf)
+    assert isinstance(result, ParseSuccess)
+    assert isinstance(result.val, memoryview)
+    assert result.val.obj is buf.obj
+    assert result.rs == b"123"
+
+
+def test_byte_stream_single_bytes():
+    assert Parser.char_class("ab").many0()(b"abc").val == [ord("a"), ord("b")]
+    assert Parser.satisfy(lambda c: c < 128)(b"\xff") == ParseFailure(
+        Location(1, 1), "satisfy", "unexpected byte b'\\xff'"
+    )
+
+
+def test_byte_stream_choice_dispatch():
+    parser = Parser.choice([Parser.string(b"ab"), Parser.string(b"cd"), Parser.digit()])
+    assert parser.many0()(b"cd1ab").val == [b"cd", ord("1"), b"ab"]
+    assert parser(b"x") == ParseFailure(
+        Location(1, 1), parser.label, "unexpected byte b'x'"
+    )
+
+
+def test_byte_stream_str():
+    assert str(ByteStream(b"abc", begin=1)) == "b'bc'"
@@ -0,0 +1,142 @@
+import io
+from typing import Iterator
+
+import pytest
+
+from dine.charclass import DIGITS
+from dine.codegen import compile_parser
+from dine.parser import REGEX_LOOKAHEAD, Parser
+from dine.result import ParseFailure, ParseSuccess
+from dine.stream import ChunkedStream, Location, Stream
+
+TEXT = "x = 12;\nname = 'abc';\n\nlist = 1,2,3;\n"
+
+STATEMENT = (
+    Parser.regex("[a-z]+")
+    .succeeded_by(Parser.string(" = "))
+    .and_then(
+        Parser.take_while(DIGITS, min_count=1).many1_sep_by(Parser.char(","))
+        | Parser.until(lambda c: c == ";")
+    )
+    .succeeded_by(Parser.char(";"))
+    .succeeded_by(Parser.char_class("\n").many0())
+)
+PROGRAM = STATEMENT.many1()
+
+
+def chunks(text: str, size: int) -> Iterator[str]:
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 100])
+@pytest.mark.parametrize(
+    "text", [TEXT, TEXT + "oops", TEXT.replace("12", "1x"), TEXT[:-5]]
+)
+def test_chunked_stream_same_results(text: str, size: int):
+    expected = PROGRAM(text)
+    result = PROGRAM(ChunkedStream(chunks(text, size)))
+    assert type(result) is type(expected)
+    assert result.loc == expected.loc
+    match result:
+        case ParseSuccess():
+            assert isinstance(expected, ParseSuccess)
+            assert result.val == expected.val and result.rs == expected.rs
+        case ParseFailure():
+            assert isinstance(expected, ParseFailure)
+            assert result.msg == expected.msg
+
+
+def test_chunked_stream_reads_lazily():
+    pulled = []
+
+    def source() -> Iterator[str]:
+        for chunk in ["ab", "cd", "ef", "gh"]:
+            pulled.append(chunk)
+            yield chunk
+
+    result = Parser.string("abc")(ChunkedStream(source()))
+    assert isinstance(result, ParseSuccess)
+    assert pulled == ["ab", "cd"]
+    assert result.rs == "defgh"
+    assert pulled == ["ab", "cd", "ef", "gh"]
+
+
+def test_chunked_stream_ends_inside_literal():
+    parser = Parser.string("abc")
+    result = parser(ChunkedStream(iter(["a", "b"])))
+    assert result == parser("ab")
+    assert result.loc == Location(1, 2) and result.msg == "input stream exhausted"
+
+
+@pytest.mark.parametrize(
+    "text", ['"' + "x" * 5000 + '"rest', '"' + "x" * 5000], ids=["closed", "open"]
+)
+def test_chunked_stream_long_regex_match(text: str):
+    parser = Parser.regex(r'"([^"]*)"', group=1)
+    for p in [parser, compile_parser(parser)]:
+        expected = p(text)
+        result = p(ChunkedStream(chunks(text, 1000)))
+        assert type(result) is type(expected)
+        assert result.loc == expected.loc
+        match result:
+            case ParseSuccess():
+                assert isinstance(expected, ParseSuccess)
+                assert result.val == expected.val and result.rs == expected.rs
+            case ParseFailure():
+                assert isinstance(expected, ParseFailure)
+                assert result.msg == expected.msg
+
+
+def test_chunked_stream_simple_regex_fails_lazily():
+    pulled = []
+
+    def source() -> Iterator[str]:
+        for chunk in chunks("ab" * 10000, 1000):
+            pulled.append(chunk)
+            yield chunk
+
+    assert isinstance(Parser.regex("[0-9]+")(ChunkedStream(source())), ParseFailure)
+    assert len(pulled) < 10
+
+
+def test_chunked_stream_release():
+    text = TEXT * 500
+    s = ChunkedStream(chunks(text, 4))
+    locs = []
+    while True:
+        result = STATEMENT(s)
+        if not isinstance(result, ParseSuccess):
+            break
+        locs.append(result.loc)
+        s = result.rs.release()
+        assert len(s.buf) <= 2 * REGEX_LOOKAHEAD + len(TEXT)
+    expected = []
+    s2 = Stream(text)
+    while isinstance(result := STATEMENT(s2), ParseSuccess):
+        expected.append(result.loc)
+        s2 = result.rs
+    assert locs == expected
+    assert s.head() is None
+
+
+def test_chunked_stream_from_file():
+    assert PROGRAM(ChunkedStream.from_file(io.StringIO(TEXT), 5)).rs == ""
+    data = "é = 'ü';\n".encode()
+    s = ChunkedStream.from_file(io.BytesIO(data), 1)
+    assert s.remain() == "é = 'ü';\n"
+    assert Parser.string("é =")(s).loc == Location(1, 1)
+
+
+def test_chunked_stream_from_socket():
+    class FakeSocket:
+        def __init__(self, data: bytes):
+            self.data = data
+
+        def recv(self, size: int) -> bytes:
+            chunk, self.data = self.data[:size], self.data[size:]
+            return chunk
+
+    s = ChunkedStream.from_socket(FakeSocket(TEXT.encode()), 3)
+    result = PROGRAM(s)
+    assert isinstance(result, ParseSuccess) and result.val == PROGRAM(TEXT).val
@@ -2,7 +2,7 @@ from typing import Tuple
 
 import pytest
 
-from dine.stream import Location, Stream
+from dine.stream import FarthestFailure, LineIndex, Location, Stream
 
 
 @pytest.mark.parametrize(
@@ -26,3 +26,51 @@ def test_stream_eq():
     assert Stream("hello") == "hello"
     assert Stream("hello") != "hi"
     assert Stream("42") != 42
+
+
+@pytest.mark.parametrize("input_text", ["", "abc", "\n", "ab\n\ncd\nefg", "\n\n\n"])
+def test_line_index(input_text: str):
+    expected = [Location(1, 1)]
+    for c in input_text[:-1]:
+        if c == "\n":
+            expected.append(Location(expected[-1].line + 1, 1))
+        else:
+            expected.append(Location(expected[-1].line, expected[-1].col + 1))
+    index = LineIndex(input_text)
+    assert list(index) == expected
+    assert index[-1] == expected[-1]
+    assert index[1:3] == expected[1:3]
+    assert len(index.newlines) == input_text.count("\n")
+    with pytest.raises(IndexError):
+        index[len(expected)]  # pylint: disable=pointless-statement
+
+
+def test_stream_views_share_index():
+    s = Stream("ab\ncd")
+    t = s.tail().advance(2)
+    assert t == "cd"
+    assert t.buf is s.buf and t.loc is s.loc
+    assert t.head() == ("c", Location(2, 1))
+    assert s == "ab\ncd"
+
+
+def test_line_index_offset():
+    text = "ab\n\ncd\nefg"
+    index = LineIndex(text)
+    for i in range(len(text)):
+        assert index.offset(index[i]) == i
+
+
+def test_farthest_failure():
+    failures = FarthestFailure()
+    failures.expect(1, "a")
+    failures.expect(0, "b")
+    failures.expect(1, "c")
+    failures.expect(1, "a")
+    assert (failures.pos, list(failures.expected)) == (1, ["a", "c"])
+    saved = failures.save()
+    failures.expect(0, "d")
+    assert failures.restore(saved) == (0, ("d",))
+    assert (failures.pos, list(failures.expected)) == (1, ["a", "c"])
+    failures.merge((2, ("e",)))
+    assert (failures.pos, list(failures.expected)) == (2, ["e"])
@@ -0,0 +1,127 @@
+import io
+import json
+
+import pytest
+
+from dine.errors import ParseError
+from dine.parser import Parser
+from dine.profile import Profiler
+from dine.trace import FileExporter, Hook, RingBuffer, TraceEvent
+
+A = Parser.char("a")
+B = Parser.char("b")
+
+
+class Calls(Hook):
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def on_enter(self, parser, offset):
+        self.calls.append(("enter", parser, offset))
+
+    def on_success(self, parser, offset, value, end):
+        self.calls.append(("success", parser, offset, value, end))
+
+    def on_failure(self, parser, offset, msg, end):
+        self.calls.append(("failure", parser, offset, msg, end))
+
+    def on_exit(self, parser, offset):
+        self.calls.append(("exit", parser, offset))
+
+
+def test_hook():
+    hook = Calls()
+    sequence = A & B
+    parser = sequence | A
+    assert parser.traced(hook)("ac") == parser("ac")
+    assert hook.calls == [
+        ("enter", parser, 0),
+        ("enter", sequence, 0),
+        ("enter", A, 0),
+        ("success", A, 0, "a", 1),
+        ("exit", A, 0),
+        ("enter", B, 1),
+        ("failure", B, 1, None, 1),
+        ("exit", B, 1),
+        ("failure", sequence, 0, None, 1),
+        ("exit", sequence, 0),
+        ("enter", A, 0),
+        ("success", A, 0, "a", 1),
+        ("exit", A, 0),
+        ("success", parser, 0, "a", 1),
+        ("exit", parser, 0),
+    ]
+
+
+def test_hooks_in_order():
+    first, second = Calls(), Calls()
+    A.traced(first, second)("a")
+    assert first.calls == second.calls
+    assert [call[0] for call in first.calls] == ["enter", "success", "exit"]
+    with pytest.raises(ValueError):
+        A.traced()
+
+
+def test_exception():
+    hook = Calls()
+    undefined = Parser.forward()
+    with pytest.raises(ParseError):
+        (A & undefined).traced(hook)("ab")
+    assert hook.calls[-3:] == [
+        ("enter", undefined, 1),
+        ("exit", undefined, 1),
+        ("exit", hook.calls[0][1], 0),
+    ]
+
+
+def test_file_exporter():
+    file = io.StringIO()
+    A.many0().traced(FileExporter(file))("a")
+    events = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert events[:3] == [
+        {"kind": "enter", "depth": 0, "label": "zero or more char 'a'", "offset": 0},
+        {"kind": "enter", "depth": 1, "label": "char 'a'", "offset": 0},
+        {"kind": "success", "depth": 1, "label": "char 'a'", "offset": 0, "end": 1},
+    ]
+    assert events[-1] == {
+        "kind": "exit",
+        "depth": 0,
+        "label": "zero or more char 'a'",
+        "offset": 0,
+    }
+    assert len(events) == 9
+
+
+def test_ring_buffer():
+    events = RingBuffer(3)
+    A.many0().traced(events)("aaa")
+    assert list(events.events) == [
+        TraceEvent("exit", 1, "char 'a'", 3),
+        TraceEvent("success", 0, "zero or more char 'a'", 0, 3),
+        TraceEvent("exit", 0, "zero or more char 'a'", 0),
+    ]
+    file = io.StringIO()
+    events.dump(file)
+    assert json.loads(file.getvalue().splitlines()[1]) == {
+        "kind": "success",
+        "depth": 0,
+        "label": "zero or more char 'a'",
+        "offset": 0,
+        "end": 3,
+    }
+
+
+def test_nested_instruments():
+    hook = Calls()
+    profiler = Profiler()
+    (A & B.profiled(profiler)).traced(hook)("ab")
+    assert [stats.label for stats in profiler.stats()] == ["char 'b'"]
+    # The tracer sees the parsers within the profiled one as well.
+    assert ("success", B, 1, "b", 2) in hook.calls
+
+
+def test_not_traced_after():
+    hook = Calls()
+    A.traced(hook)("a")
+    A("a")
+    assert len(hook.calls) == 3